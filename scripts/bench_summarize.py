@@ -0,0 +1,169 @@
+"""
+Benchmark FormAnalytics aggregation: the vectorized `_aggregate_forms` against the
+row-at-a-time `aggregate_rows` it replaced, on a synthetic battalion-year of form responses.
+
+    PYTHONPATH=src python scripts/bench_summarize.py --weeks 52 --tanks 14 --reports 2
+"""
+import argparse
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+import pandas as pd
+
+from spearhead.services.analytics import FormAnalytics
+
+PLATOONS = ["Kfir", "Mahatz", "Sufa"]
+ZIVUD = ["שרשרת גרירה", "שאקל 25 טון", "שאקל 5 טון", "מעיל רוח", "מטען ניתוק זחל", "נונל", "אלונקה", "פטיש"]
+AMMO = ["ברוסי מאג", "ברוסי 05", "חלול", "חצב", "כלנית", "חץ", "רימוני רסס", "רימוני עשן"]
+MEANS = ["מכשיר קשר", "אוזניות", "אנטנה", "מטען", "סוללה", "משיב"]
+ISSUES = ["מאג", "05", "משקפת", "מצפן", "NFC", "אולר", "בורוסייט", "מבן", "CF"]
+
+
+def synthetic_forms(weeks: int, tanks: int, reports: int, seed: int = 7) -> pd.DataFrame:
+    """
+    A get_forms()-shaped frame: every tank of every platoon reports `reports` times a week.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for week in range(1, weeks + 1):
+        week_label = f"2026-W{week:02d}"
+        for platoon in PLATOONS:
+            for tank in range(tanks):
+                for _ in range(reports):
+                    fields = {
+                        "צ טנק": f"{platoon[0]}{tank:02d}",
+                        "שם המטק": rng.choice(["כהן", "לוי", "מזרחי", ""]),
+                        "חותמת זמן": f"2026-01-01T10:{tank:02d}:00",
+                    }
+                    for item in ZIVUD:
+                        fields[f"דוח זיווד [{item}]"] = rng.choice(["קיים", "קיים", "קיים", "חוסר", "בלאי", None])
+                    for item in AMMO:
+                        fields[item] = rng.choice([rng.randint(0, 60), str(rng.randint(0, 60)), "", None, True])
+                    for item in MEANS:
+                        fields[f"סטטוס ציוד קשר [{item}]"] = rng.choice(["תקין", "תקין", "אין", "חוסר"])
+                    for item in ISSUES:
+                        fields[f"{item} - מה הצ"] = rng.choice(["תקין", "תקין", "תקין", "שבור", "חסר בורג", ""])
+                    fields["פערי צלמים"] = rng.choice(["", "", "", "חסר צלם כוונת"])
+                    rows.append(
+                        {
+                            "id": len(rows) + 1,
+                            "import_id": 1,
+                            "row_index": len(rows),
+                            "platoon": platoon,
+                            "tank_id": fields["צ טנק"],
+                            "timestamp": fields["חותמת זמן"],
+                            "week_label": week_label,
+                            "fields_json": json.dumps(fields, ensure_ascii=False),
+                        }
+                    )
+    return pd.DataFrame(rows)
+
+
+def aggregate_rows(analytics: FormAnalytics, df: pd.DataFrame, platoon_override: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    The row-at-a-time loop `FormAnalytics._aggregate_forms` replaced: its parity reference
+    (tests/test_analytics.py) and the baseline timed here.
+    """
+    platoon_data: Dict[str, Dict] = defaultdict(
+        lambda: {
+            "tank_ids": set(),
+            "zivud_gaps": defaultdict(int),
+            "ammo_totals": defaultdict(float),
+            "means_gaps": defaultdict(int),
+            "issues": [],
+        }
+    )
+
+    for _, row in df.iterrows():
+        platoon_raw = platoon_override or row.get("platoon") or "unknown"
+        platoon = analytics._display_platoon(platoon_raw)
+        tank_id = analytics._clean_str(row.get("tank_id")) or "unknown"
+        week_label = row.get("week_label")
+        try:
+            fields = json.loads(row.get("fields_json", "{}"))
+        except Exception:
+            continue
+
+        data = platoon_data[platoon]
+        data["tank_ids"].add(tank_id)
+        commander = analytics._commander_name(fields)
+
+        for field_name, value in fields.items():
+            match = analytics.mapper.match_header(field_name)
+            if not match:
+                continue
+            if not match.item:
+                continue
+
+            if match.family == "zivud":
+                if analytics._is_gap(value):
+                    data["zivud_gaps"][match.item] += 1
+            elif match.family == "ammo":
+                num = analytics._as_number(value)
+                if num is not None:
+                    data["ammo_totals"][match.item] += num
+            elif match.family == "means":
+                if analytics._is_gap(value):
+                    data["means_gaps"][match.item] += 1
+            elif match.family == "issues":
+                if analytics._is_issue(value):
+                    data["issues"].append(
+                        {
+                            "item": match.item,
+                            "detail": str(value),
+                            "tank_id": tank_id,
+                            "week": week_label,
+                            "commander": commander,
+                        }
+                    )
+            elif match.family == "parsim":
+                text = analytics._clean_str(value)
+                if text:
+                    data["issues"].append(
+                        {
+                            "item": analytics._PARSIM_ITEM,
+                            "detail": text,
+                            "tank_id": tank_id,
+                            "week": week_label,
+                            "commander": commander,
+                        }
+                    )
+    return platoon_data
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--tanks", type=int, default=14, help="tanks per platoon")
+    parser.add_argument("--reports", type=int, default=2, help="reports per tank per week")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_forms(args.weeks, args.tanks, args.reports)
+    analytics = FormAnalytics(repository=None)
+    if json.dumps(analytics._aggregate_forms(df), default=sorted, ensure_ascii=False) != json.dumps(
+        aggregate_rows(analytics, df), default=sorted, ensure_ascii=False
+    ):
+        raise SystemExit("vectorized aggregation diverges from the row loop")
+
+    rows_s = _best_of(lambda: aggregate_rows(analytics, df), args.repeat)
+    vec_s = _best_of(lambda: analytics._aggregate_forms(df), args.repeat)
+    print(f"rows={len(df)} fields/row={len(json.loads(df['fields_json'][0]))}")
+    print(f"iterrows:   {rows_s:8.3f}s")
+    print(f"vectorized: {vec_s:8.3f}s  ({rows_s / vec_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ _db_instance: Optional[Database] = None
 _v1_store_instance: Optional[ResponseStore] = None
 _v1_query_instance: Optional[ResponseQueryServiceV2] = None
 _v1_ingest_instance: Optional[ResponseIngestionServiceV2] = None
+_sheets_provider_instance: Optional["GoogleSheetsProvider"] = None
 
 # Shared session store (in-memory)
 oauth_store = OAuthSessionStore(ttl_seconds=86400)
@@ -67,15 +68,19 @@ def get_sync_service() -> Generator["SyncService", None, None]:
 
     from spearhead.sync.google_sheets import GoogleSheetsProvider, SyncService
 
-    provider = GoogleSheetsProvider(
-        service_account_file=settings.google.service_account_file,
-        api_key=settings.google.api_key,
-        max_retries=settings.google.max_retries,
-        backoff_seconds=settings.google.backoff_seconds,
-    )
+    # Long-lived so its pooled HTTP sessions survive across sync requests.
+    global _sheets_provider_instance
+    if _sheets_provider_instance is None:
+        _sheets_provider_instance = GoogleSheetsProvider(
+            service_account_file=settings.google.service_account_file,
+            api_key=settings.google.api_key,
+            max_retries=settings.google.max_retries,
+            backoff_seconds=settings.google.backoff_seconds,
+            pool_size=max(settings.google.sync_concurrency, 1),
+        )
     yield SyncService(
         import_service=import_service,
-        provider=provider,
+        provider=_sheets_provider_instance,
         file_ids=settings.google.file_ids,
         cache_dir=settings.google.cache_dir,
     )
@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
@@ -11,7 +12,9 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from spearhead.api.middleware import add_request_id, enforce_body_size, log_requests
 from spearhead.api.routers import legacy, system, v1
 from spearhead.config import settings
+from spearhead.data.storage import close_all_connections
 from spearhead.exceptions import DataSourceError
+from spearhead.services.intelligence import shutdown_scoring_pools
 
 logging.basicConfig(level=getattr(logging, settings.logging.level.upper(), logging.INFO))
 logger = logging.getLogger("spearhead.api")
@@ -59,12 +62,21 @@ def _mount_frontend(app: FastAPI) -> None:
         return FileResponse(dist_path / "index.html")
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # The battalion view's scoring processes belong to this app; stop them before the DB.
+    shutdown_scoring_pools()
+    # Pooled SQLite connections live per thread; close them so WAL is checkpointed cleanly.
+    close_all_connections()
+
+
 def create_app(db_path: Optional[Path] = None) -> FastAPI:
     if db_path:
         settings.paths.db_path = db_path
         _reset_cached_dependencies()
 
-    app = FastAPI(title="Spearhead API", version=settings.app.version)
+    app = FastAPI(title="Spearhead API", version=settings.app.version, lifespan=_lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
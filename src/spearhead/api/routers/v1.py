@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+import json
+import zlib
+from typing import Any, Callable, Iterable, Iterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
 
 from spearhead.api.deps import (
     get_current_user,
@@ -10,11 +17,15 @@ from spearhead.api.deps import (
     get_v1_query_service,
     require_auth,
 )
+from spearhead.config import settings
 from spearhead.domain.models import User
 from spearhead.v1 import EventValidationError, FormEventV2, ResponseIngestionServiceV2, ResponseQueryServiceV2
+from spearhead.v1.paging import InvalidPageRequest
 
 router = APIRouter(prefix="/v1", tags=["v1"])
 
+_event_list = TypeAdapter(list[FormEventV2])
+
 
 def _normalize_platoon_key(name: Optional[str]) -> Optional[str]:
     if not name:
@@ -49,6 +60,55 @@ def _resolve_scope(user: User, requested_platoon: Optional[str]) -> Optional[str
     return req_scope
 
 
+def _etag(request: Request, svc: ResponseQueryServiceV2, scoped_platoon: Optional[str]) -> str:
+    """
+    Strong validator: store data generation + what selects the payload (path, query, access scope)
+    + the service's config fingerprint (code version, field mapping, tokens, query paths).
+    """
+    selector = "|".join(
+        [
+            request.url.path,
+            repr(sorted(request.query_params.multi_items())),
+            scoped_platoon or "",
+            svc.config_fingerprint,
+        ]
+    )
+    digest = hashlib.sha256(selector.encode("utf-8")).hexdigest()[:16]
+    return f'"{svc.data_generation()}-{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _conditional(
+    request: Request,
+    svc: ResponseQueryServiceV2,
+    scoped_platoon: Optional[str],
+    compute: Callable[[], Any],
+) -> Response:
+    """
+    Answers 304 without computing the payload when the client already holds the current version.
+    """
+    etag = _etag(request, svc, scoped_platoon)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    try:
+        payload = compute()
+    except InvalidPageRequest as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return JSONResponse(jsonable_encoder(payload), headers=headers)
+
+
+def _paged(cursor: Optional[str], page_size: Optional[int], sort: Optional[str], filter_: Optional[str]) -> bool:
+    # Any paging parameter switches a grid endpoint from the full payload to keyset pages.
+    return any(value is not None for value in (cursor, page_size, sort, filter_))
+
+
 @router.post("/ingestion/forms/events")
 def ingest_form_event(
     event: FormEventV2,
@@ -62,18 +122,59 @@ def ingest_form_event(
         raise HTTPException(status_code=422, detail={"message": str(exc), "unmapped_fields": exc.unmapped_fields})
 
 
+def _decode_body(body: bytes, content_encoding: Optional[str]) -> bytes:
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding == "identity":
+        return body
+    if encoding != "gzip":
+        raise HTTPException(status_code=415, detail=f"Unsupported Content-Encoding: {encoding}")
+
+    # The size middleware only sees the compressed length; cap the inflated size as well.
+    limit_bytes = settings.security.max_upload_mb * 1024 * 1024
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = inflater.decompress(body, limit_bytes)
+    except zlib.error as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid gzip body: {exc}")
+    if inflater.unconsumed_tail:
+        raise HTTPException(status_code=413, detail=f"Max upload size is {settings.security.max_upload_mb}MB")
+    return data
+
+
+@router.post("/ingestion/forms/events:batch")
+async def ingest_form_events_batch(
+    request: Request,
+    svc: ResponseIngestionServiceV2 = Depends(get_v1_ingestion_service),
+    _auth=Depends(require_auth),
+):
+    body = _decode_body(await request.body(), request.headers.get("content-encoding"))
+    try:
+        events = _event_list.validate_json(body)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False, include_input=False))
+    if len(events) > settings.v1.max_batch_events:
+        raise HTTPException(status_code=413, detail=f"Max batch size is {settings.v1.max_batch_events} events")
+
+    reports = await run_in_threadpool(svc.ingest_batch, events)
+    return [report.model_dump() for report in reports]
+
+
 @router.get("/metrics/overview")
 def metrics_overview(
+    request: Request,
     week: Optional[str] = Query(None, alias="week"),
     svc: ResponseQueryServiceV2 = Depends(get_v1_query_service),
     user: User = Depends(get_current_user),
 ):
     scoped_platoon = _resolve_scope(user, None)
-    return svc.overview(week_id=week, platoon_key=scoped_platoon)
+    return _conditional(
+        request, svc, scoped_platoon, lambda: svc.overview(week_id=week, platoon_key=scoped_platoon)
+    )
 
 
 @router.get("/metrics/platoons/{platoon}")
 def metrics_platoon(
+    request: Request,
     platoon: str,
     week: Optional[str] = Query(None, alias="week"),
     svc: ResponseQueryServiceV2 = Depends(get_v1_query_service),
@@ -82,66 +183,196 @@ def metrics_platoon(
     scoped_platoon = _resolve_scope(user, platoon)
     if not scoped_platoon:
         raise HTTPException(status_code=400, detail="platoon is required")
-    return svc.platoon_metrics(platoon_key=scoped_platoon, week_id=week)
+    return _conditional(
+        request, svc, scoped_platoon, lambda: svc.platoon_metrics(platoon_key=scoped_platoon, week_id=week)
+    )
 
 
 @router.get("/metrics/tanks")
 def metrics_tanks(
+    request: Request,
     platoon: Optional[str] = Query(None),
     week: Optional[str] = Query(None, alias="week"),
+    cursor: Optional[str] = Query(None),
+    page_size: Optional[int] = Query(None, ge=1, le=500),
+    sort: Optional[str] = Query(None),
+    filter_: Optional[str] = Query(None, alias="filter"),
     svc: ResponseQueryServiceV2 = Depends(get_v1_query_service),
     user: User = Depends(get_current_user),
 ):
     scoped_platoon = _resolve_scope(user, platoon)
+    if _paged(cursor, page_size, sort, filter_):
+        # Paged mode may span the whole battalion.
+        return _conditional(
+            request,
+            svc,
+            scoped_platoon,
+            lambda: svc.tank_page(
+                platoon_key=scoped_platoon,
+                week_id=week,
+                sort=sort,
+                filter_text=filter_,
+                cursor=cursor,
+                page_size=page_size or 50,
+            ),
+        )
     if not scoped_platoon:
         raise HTTPException(status_code=400, detail="platoon is required")
-    return svc.tank_metrics(platoon_key=scoped_platoon, week_id=week)
+    return _conditional(
+        request, svc, scoped_platoon, lambda: svc.tank_metrics(platoon_key=scoped_platoon, week_id=week)
+    )
 
 
 @router.get("/queries/gaps")
 def query_gaps(
+    request: Request,
     week: Optional[str] = Query(None, alias="week"),
     platoon: Optional[str] = Query(None),
     group_by: str = Query("item", pattern="^(item|tank|family)$"),
     limit: int = Query(100, ge=1, le=300),
+    cursor: Optional[str] = Query(None),
+    page_size: Optional[int] = Query(None, ge=1, le=500),
+    sort: Optional[str] = Query(None),
+    filter_: Optional[str] = Query(None, alias="filter"),
     svc: ResponseQueryServiceV2 = Depends(get_v1_query_service),
     user: User = Depends(get_current_user),
 ):
     scoped_platoon = _resolve_scope(user, platoon)
-    return svc.gaps(week_id=week, platoon_key=scoped_platoon, group_by=group_by, limit=limit)
+    if _paged(cursor, page_size, sort, filter_):
+        return _conditional(
+            request,
+            svc,
+            scoped_platoon,
+            lambda: svc.gaps_page(
+                week_id=week,
+                platoon_key=scoped_platoon,
+                group_by=group_by,
+                sort=sort,
+                filter_text=filter_,
+                cursor=cursor,
+                page_size=page_size or limit,
+            ),
+        )
+    return _conditional(
+        request,
+        svc,
+        scoped_platoon,
+        lambda: svc.gaps(week_id=week, platoon_key=scoped_platoon, group_by=group_by, limit=limit),
+    )
 
 
 @router.get("/queries/trends")
 def query_trends(
+    request: Request,
     metric: str = Query("total_gaps", pattern="^(reports|total_gaps|gap_rate|distinct_tanks)$"),
     window_weeks: int = Query(8, ge=1, le=26),
     platoon: Optional[str] = Query(None),
+    family: Optional[str] = Query(None),
     svc: ResponseQueryServiceV2 = Depends(get_v1_query_service),
     user: User = Depends(get_current_user),
 ):
     scoped_platoon = _resolve_scope(user, platoon)
-    return svc.trends(metric=metric, window_weeks=window_weeks, platoon_key=scoped_platoon)
+    return _conditional(
+        request,
+        svc,
+        scoped_platoon,
+        lambda: svc.trends(metric=metric, window_weeks=window_weeks, platoon_key=scoped_platoon, family=family),
+    )
 
 
 @router.get("/queries/search")
 def query_search(
+    request: Request,
     q: str = Query(..., min_length=2),
     week: Optional[str] = Query(None, alias="week"),
     platoon: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    all_weeks: bool = Query(False),
+    cursor: Optional[str] = Query(None),
+    page_size: Optional[int] = Query(None, ge=1, le=200),
+    sort: Optional[str] = Query(None),
+    filter_: Optional[str] = Query(None, alias="filter"),
     svc: ResponseQueryServiceV2 = Depends(get_v1_query_service),
     user: User = Depends(get_current_user),
 ):
     scoped_platoon = _resolve_scope(user, platoon)
-    return svc.search(q=q, week_id=week, platoon_key=scoped_platoon, limit=limit)
+    if _paged(cursor, page_size, sort, filter_):
+        return _conditional(
+            request,
+            svc,
+            scoped_platoon,
+            lambda: svc.search_page(
+                q=q,
+                week_id=week,
+                platoon_key=scoped_platoon,
+                sort=sort,
+                filter_text=filter_,
+                cursor=cursor,
+                page_size=page_size or limit,
+                all_weeks=all_weeks,
+            ),
+        )
+    return _conditional(
+        request,
+        svc,
+        scoped_platoon,
+        lambda: svc.search(q=q, week_id=week, platoon_key=scoped_platoon, limit=limit, all_weeks=all_weeks),
+    )
 
 
 @router.get("/metadata/weeks")
 def metadata_weeks(
+    request: Request,
+    platoon: Optional[str] = Query(None),
+    svc: ResponseQueryServiceV2 = Depends(get_v1_query_service),
+    user: User = Depends(get_current_user),
+):
+    scoped_platoon = _resolve_scope(user, platoon)
+    return _conditional(
+        request, svc, scoped_platoon, lambda: {"weeks": svc.list_weeks(platoon_key=scoped_platoon)}
+    )
+
+
+def _ndjson(rows: Iterable[dict[str, Any]], flush_bytes: int = 64 * 1024) -> Iterator[bytes]:
+    buffer: list[bytes] = []
+    size = 0
+    for row in rows:
+        line = (json.dumps(row, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        buffer.append(line)
+        size += len(line)
+        if size >= flush_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@router.get("/exports/responses.ndjson")
+def export_responses_ndjson(
+    request: Request,
+    from_week: Optional[str] = Query(None),
+    to_week: Optional[str] = Query(None),
     platoon: Optional[str] = Query(None),
     svc: ResponseQueryServiceV2 = Depends(get_v1_query_service),
     user: User = Depends(get_current_user),
 ):
+    """
+    One JSON line per normalized response, streamed from a store cursor.
+    Gzip-compressed when the client accepts it.
+    """
     scoped_platoon = _resolve_scope(user, platoon)
-    weeks = svc.list_weeks(platoon_key=scoped_platoon)
-    return {"weeks": weeks}
+    body = _ndjson(svc.export_rows(from_week=from_week, to_week=to_week, platoon_key=scoped_platoon))
+    headers = {"Vary": "Accept-Encoding", "Content-Disposition": 'attachment; filename="responses.ndjson"'}
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        body = _gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
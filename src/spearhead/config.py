@@ -17,6 +17,20 @@ class PathSettings(BaseSettings):
     db_path: Path = Path("./data/spearhead.db")
 
 
+class StorageSettings(BaseSettings):
+    """
+    SQLite connection tuning shared by every Database on the same file.
+    """
+    pool_connections: bool = True  # reuse one connection per thread instead of connecting per call
+    journal_mode: str = "WAL"  # readers no longer block on the single writer
+    synchronous: str = "NORMAL"  # safe with WAL; fsync only at checkpoints
+    busy_timeout_ms: int = 5000
+    mmap_size_mb: int = 256
+    cache_size_mb: int = 64
+    cached_statements: int = 256
+    insert_chunk_rows: int = 2000  # rows per executemany when bulk-inserting imported sheets
+
+
 class ImportSettings(BaseSettings):
     # Configurable import keys; can be used later for Google Sheets IDs.
     platoon_loadout_label: str = "platoon_loadout"
@@ -47,6 +61,30 @@ class GoogleSettings(BaseSettings):
     cache_dir: Path = Path("./data/sync_cache")
     max_retries: int = 3
     backoff_seconds: float = 1.0
+    sync_concurrency: int = 4  # form-response sheets downloaded in parallel per sync
+    download_timeout_seconds: float = 300.0  # per sheet, measured from download start; 0 disables
+    connect_timeout_seconds: float = 10.0  # per request; a stalled socket read times out after download_timeout_seconds
+
+class V1Settings(BaseSettings):
+    """
+    Runtime knobs for the responses-only v1 read models.
+    """
+    incremental_snapshots: bool = True  # fold each ingested response into snapshots instead of recomputing the week
+    max_batch_events: int = 1000  # cap for POST /v1/ingestion/forms/events:batch
+    dedupe_filter_capacity: int = 100_000  # recent event ids kept in the in-process membership filter
+    dedupe_filter_error_rate: float = 0.01  # false-positive rate; positives fall back to an indexed lookup
+    facts_queries: bool = True  # aggregate from normalized_field_facts_v2 instead of decoding fields_json
+    reconcile_workers: int = 1  # >1 fans reconcile weeks out over a process pool
+    week_cache_mb: int = 0  # >0 keeps recent weeks decoded in-process (columnar) for gaps/search/snapshots
+
+
+class IntelligenceSettings(BaseSettings):
+    """
+    Legacy readiness scoring (IntelligenceService).
+    """
+    scoring_workers: int = 0  # battalion view scoring processes; 0 = CPUs available to the container, 1 = in-process
+    parallel_min_rows: int = 2000  # below this many rows pool overhead outweighs the gain
+
 
 class ThresholdSettings(BaseSettings):
     erosion_alert: float = 0.5
@@ -86,6 +124,7 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_nested_delimiter="__", env_file=".env", extra="ignore")
     app: AppSettings = AppSettings()
     paths: PathSettings = PathSettings()
+    storage: StorageSettings = StorageSettings()
     imports: ImportSettings = ImportSettings()
     status_tokens: StatusTokens = StatusTokens()
     google: GoogleSettings = GoogleSettings()
@@ -93,6 +132,8 @@ class Settings(BaseSettings):
     security: SecuritySettings = SecuritySettings()
     logging: LoggingSettings = LoggingSettings()
     ai: AISettings = AISettings()
+    v1: V1Settings = V1Settings()
+    intelligence: IntelligenceSettings = IntelligenceSettings()
 
     @classmethod
     def load(cls, config_path: Optional[Path] = None) -> "Settings":
@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Any, Dict, Optional, Tuple
+from typing import List, Any, Dict, Iterator, Optional, Tuple
 
 from openpyxl import load_workbook
 
@@ -32,19 +32,41 @@ class FormResponsesAdapter:
         source_id: Optional[str] = None,
         platoon: Optional[str] = None,
     ) -> Tuple[List[FormResponseRow], SchemaSnapshot]:
+        records, snapshot = cls.iter_with_schema(file_path, mapper=mapper, source_id=source_id, platoon=platoon)
+        records = list(records)
+        logger.info(f"DEBUG: Parsed {len(records)} records from {file_path.name}")
+        return records, snapshot
+
+    @classmethod
+    def iter_with_schema(
+        cls,
+        file_path: Path,
+        mapper: Optional[FieldMapper] = None,
+        source_id: Optional[str] = None,
+        platoon: Optional[str] = None,
+    ) -> Tuple[Iterator[FormResponseRow], SchemaSnapshot]:
+        """
+        Streaming variant of load_with_schema: the workbook is opened read-only and rows
+        are yielded lazily, so memory stays flat regardless of sheet size.
+        Headers are validated up front (DataSourceError is raised here, not on iteration).
+        The workbook is closed once the iterator is exhausted or closed.
+        """
         mapper = mapper or FieldMapper()
-        wb = load_workbook(file_path, data_only=True)
-        ws = wb.active
-        rows = list(ws.iter_rows(values_only=True))
-        if not rows:
-            empty_snapshot = mapper.snapshot([])
-            raise DataSourceError(cls._format_missing_required(mapper, ["tank_id", "timestamp"]))
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header_row = next(rows, None)
+            if header_row is None:
+                raise DataSourceError(cls._format_missing_required(mapper, ["tank_id", "timestamp"]))
 
-        headers = [cls._safe_str(h) for h in rows[0]]
-        snapshot = mapper.snapshot(headers)
+            headers = [cls._safe_str(h) for h in header_row]
+            snapshot = mapper.snapshot(headers)
 
-        if snapshot.missing_required:
-            raise DataSourceError(cls._format_missing_required(mapper, snapshot.missing_required))
+            if snapshot.missing_required:
+                raise DataSourceError(cls._format_missing_required(mapper, snapshot.missing_required))
+        except Exception:
+            wb.close()
+            raise
 
         if snapshot.unmapped:
             logger.warning(
@@ -58,27 +80,37 @@ class FormResponsesAdapter:
         logger.info(f"DEBUG: Inferred Platoon: '{platoon}' (Source ID: {source_id})")
         logger.info(f"DEBUG: Mapped Headers: {[m.to_dict() for m in snapshot.mapped]}")
 
-        records: List[FormResponseRow] = []
+        return cls._iter_rows(wb, rows, headers, mapper, file_path, platoon), snapshot
 
-        for idx, row in enumerate(rows[1:], start=2):
-            if all(cell is None or str(cell).strip() == "" for cell in row):
-                continue
+    @classmethod
+    def _iter_rows(
+        cls,
+        wb: Any,
+        rows: Iterator[tuple],
+        headers: List[Optional[str]],
+        mapper: FieldMapper,
+        file_path: Path,
+        platoon: Optional[str],
+    ) -> Iterator[FormResponseRow]:
+        try:
+            for idx, row in enumerate(rows, start=2):
+                if all(cell is None or str(cell).strip() == "" for cell in row):
+                    continue
 
-            row_dict: Dict[str, Any] = {}
-            for h, v in zip(headers, row):
-                if h:
-                    row_dict[h] = v
+                row_dict: Dict[str, Any] = {}
+                for h, v in zip(headers, row):
+                    if h:
+                        row_dict[h] = v
 
-            tank_id = mapper.extract_tank_id(row_dict)
-            timestamp_val = mapper.extract_by_aliases(row_dict, mapper.config.form.timestamp.aliases)
-            timestamp = cls._parse_timestamp(timestamp_val)
-            week_label = cls._week_label(timestamp)
+                tank_id = mapper.extract_tank_id(row_dict)
+                timestamp_val = mapper.extract_by_aliases(row_dict, mapper.config.form.timestamp.aliases)
+                timestamp = cls._parse_timestamp(timestamp_val)
+                week_label = cls._week_label(timestamp)
 
-            if idx <= 6: # Debug first 5 rows
-                logger.info(f"DEBUG Row {idx}: TankID='{tank_id}', TS_Val='{timestamp_val}', TS_Parsed='{timestamp}', Week='{week_label}'")
+                if idx <= 6: # Debug first 5 rows
+                    logger.info(f"DEBUG Row {idx}: TankID='{tank_id}', TS_Val='{timestamp_val}', TS_Parsed='{timestamp}', Week='{week_label}'")
 
-            records.append(
-                FormResponseRow(
+                yield FormResponseRow(
                     source_file=file_path,
                     platoon=platoon,
                     row_index=idx,
@@ -87,10 +119,8 @@ class FormResponsesAdapter:
                     week_label=week_label,
                     fields=row_dict,
                 )
-            )
-
-        logger.info(f"DEBUG: Parsed {len(records)} records from {file_path.name}")
-        return records, snapshot
+        finally:
+            wb.close()
 
     @staticmethod
     def _safe_str(value: Any) -> Optional[str]:
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Optional, Sequence, Any
+from typing import Iterator, List, Optional, Sequence, Any
 
 from openpyxl import load_workbook
 
@@ -20,24 +20,35 @@ class PlatoonLoadoutAdapter:
 
     @classmethod
     def load(cls, file_path: Path) -> List[TabularRecord]:
-        wb = load_workbook(file_path, data_only=True)
-        ws = wb.active
-        rows = list(ws.iter_rows(values_only=True))
-        if len(rows) < 3:
-            return []
+        return list(cls.iter_records(file_path))
 
-        section_row = rows[0]
-        header_row = rows[1]
+    @classmethod
+    def iter_records(cls, file_path: Path) -> Iterator[TabularRecord]:
+        """
+        Yields records lazily from a read-only workbook; memory stays flat regardless of sheet size.
+        """
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            section_row = next(rows, None)
+            header_row = next(rows, None)
+            if section_row is None or header_row is None:
+                return
+            yield from cls._iter_sections(file_path, section_row, header_row, rows)
+        finally:
+            wb.close()
 
+    @classmethod
+    def _iter_sections(
+        cls, file_path: Path, section_row: Sequence[Any], header_row: Sequence[Any], rows: Iterator[tuple]
+    ) -> Iterator[TabularRecord]:
         ammo_start = cls._find_section_start(section_row, "תחמושת")
         platoon_name = file_path.stem
 
         zivud_headers = header_row[:ammo_start] if ammo_start else header_row
         ammo_headers: Sequence[Any] = header_row[ammo_start:] if ammo_start is not None else []
 
-        records: List[TabularRecord] = []
-
-        for idx, row in enumerate(rows[2:], start=3):
+        for idx, row in enumerate(rows, start=3):
             # Stop only when the row is entirely empty
             if all(cell is None or str(cell).strip() == "" for cell in row):
                 continue
@@ -45,38 +56,32 @@ class PlatoonLoadoutAdapter:
             # Left section (zivud)
             item = cls._safe_str(row[0]) if len(row) > 0 else None
             if item:
-                records.extend(
-                    cls._collect_row(
-                        file_path=file_path,
-                        section=cls.SECTION_ZIVUD,
-                        platoon=platoon_name,
-                        row_index=idx,
-                        item=item,
-                        headers=zivud_headers,
-                        row=row,
-                        offset=0,
-                    )
+                yield from cls._collect_row(
+                    file_path=file_path,
+                    section=cls.SECTION_ZIVUD,
+                    platoon=platoon_name,
+                    row_index=idx,
+                    item=item,
+                    headers=zivud_headers,
+                    row=row,
+                    offset=0,
                 )
 
             # Right section (ammo)
             if ammo_headers:
                 ammo_item = cls._safe_str(row[ammo_start]) if ammo_start is not None and ammo_start < len(row) else None
                 if ammo_item:
-                    records.extend(
-                        cls._collect_row(
-                            file_path=file_path,
-                            section=cls.SECTION_AMMO,
-                            platoon=platoon_name,
-                            row_index=idx,
-                            item=ammo_item,
-                            headers=ammo_headers,
-                            row=row,
-                            offset=ammo_start,
-                        )
+                    yield from cls._collect_row(
+                        file_path=file_path,
+                        section=cls.SECTION_AMMO,
+                        platoon=platoon_name,
+                        row_index=idx,
+                        item=ammo_item,
+                        headers=ammo_headers,
+                        row=row,
+                        offset=ammo_start,
                     )
 
-        return records
-
     @staticmethod
     def _find_section_start(row: Sequence[Any], label: str) -> Optional[int]:
         for i, v in enumerate(row):
@@ -1,9 +1,12 @@
 import logging
 import re
+import threading
 import unicodedata
+from collections import OrderedDict, namedtuple
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from spearhead.config_fields import FieldConfig, field_config, FamilyConfig
 
@@ -64,6 +67,77 @@ class _HeaderRule:
         return self.default_item
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_MISS = object()
+
+
+class _HeaderIndex:
+    """
+    All header rules of one config version compiled into a single anchored alternation
+    (one named group per rule, in rule order, so the first matching rule still wins),
+    plus a bounded LRU memo of raw header -> HeaderMatch.
+    """
+
+    def __init__(self, version: Optional[str], rules: List[_HeaderRule], maxsize: int = 4096):
+        self.version = version
+        self.rules = rules
+        alternatives = [f"(?P<r{i}>{rule.regex.pattern.removeprefix('^')})" for i, rule in enumerate(rules)]
+        self.combined = re.compile("^(?:" + "|".join(alternatives) + ")", flags=re.IGNORECASE) if rules else None
+        self.maxsize = maxsize
+        self._memo: "OrderedDict[str, Optional[HeaderMatch]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def rule_for(self, normalized_header: str) -> Optional[_HeaderRule]:
+        if self.combined is None:
+            return None
+        m = self.combined.match(normalized_header)
+        if not m:
+            return None
+        # The rule's own group closes last, so it is the reported last group.
+        return self.rules[int(m.lastgroup[1:])]
+
+    def get(self, header: str) -> Any:
+        with self._lock:
+            found = self._memo.get(header, _MISS)
+            if found is _MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._memo.move_to_end(header)
+            return found
+
+    def put(self, header: str, match: Optional[HeaderMatch]) -> None:
+        with self._lock:
+            self._memo[header] = match
+            self._memo.move_to_end(header)
+            while len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._memo))
+
+
+# One index per (config object, config version): mappers are created per request/service,
+# so the memo must outlive any single FieldMapper instance.
+_indexes: Dict[Tuple[int, Optional[str]], Tuple[FieldConfig, _HeaderIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+@lru_cache(maxsize=16384)
+def _normalize_text(text: str) -> str:
+    normalized = unicodedata.normalize("NFKD", text)
+    normalized = "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
+    normalized = normalized.lower()
+    normalized = re.sub(r"[^\w\s]", " ", normalized, flags=re.UNICODE)
+    normalized = normalized.replace("_", " ")
+    normalized = re.sub(r"\s+", " ", normalized)
+    return normalized.strip()
+
+
 class FieldMapper:
     """
     Config-driven resolver for headers and row-level fields.
@@ -72,7 +146,8 @@ class FieldMapper:
 
     def __init__(self, config: FieldConfig = field_config):
         self.config = config
-        self.rules: List[_HeaderRule] = self._build_rules()
+        self._index = self._shared_index()
+        self.rules: List[_HeaderRule] = self._index.rules
         self._tank_aliases = {self.normalize(a) for a in self.config.form.tank_id.aliases}
         self._timestamp_aliases = {self.normalize(a) for a in self.config.form.timestamp.aliases}
         self._commander_aliases = {self.normalize(a) for a in self.config.form.commander.aliases}
@@ -81,13 +156,23 @@ class FieldMapper:
     def normalize(text: Optional[str]) -> str:
         if text is None:
             return ""
-        normalized = unicodedata.normalize("NFKD", str(text))
-        normalized = "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
-        normalized = normalized.lower()
-        normalized = re.sub(r"[^\w\s]", " ", normalized, flags=re.UNICODE)
-        normalized = normalized.replace("_", " ")
-        normalized = re.sub(r"\s+", " ", normalized)
-        return normalized.strip()
+        return _normalize_text(str(text))
+
+    def _shared_index(self) -> _HeaderIndex:
+        version = getattr(self.config, "version", None)
+        key = (id(self.config), version)
+        with _indexes_lock:
+            entry = _indexes.get(key)
+            if entry is None:
+                entry = (self.config, _HeaderIndex(version, self._build_rules()))
+                _indexes[key] = entry
+            return entry[1]
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Hit/miss counters of the shared header memo (functools-style).
+        """
+        return self._index.info()
 
     def clean_item(self, text: Optional[str]) -> str:
         if text is None:
@@ -128,14 +213,24 @@ class FieldMapper:
         )
 
     def match_header(self, header: str) -> Optional[HeaderMatch]:
+        if self._index.version != getattr(self.config, "version", None):
+            self._index = self._shared_index()
+            self.rules = self._index.rules
+
+        cached = self._index.get(header)
+        if cached is not _MISS:
+            return cached
+
         normalized = self.normalize(header)
-        for rule in self.rules:
+        rule = self._index.rule_for(normalized)
+        match = None
+        if rule is not None:
             item_raw = rule.match(normalized)
-            if item_raw is None:
-                continue
-            item = self.clean_item(item_raw if rule.capture else (rule.default_item or header))
-            return HeaderMatch(raw=header, normalized=normalized, family=rule.family, item=item)
-        return None
+            if item_raw is not None:
+                item = self.clean_item(item_raw if rule.capture else (rule.default_item or header))
+                match = HeaderMatch(raw=header, normalized=normalized, family=rule.family, item=item)
+        self._index.put(header, match)
+        return match
 
     def infer_platoon(self, file_path: Path, source_id: Optional[str] = None) -> Optional[str]:
         if source_id:
@@ -2,7 +2,7 @@ from hashlib import md5
 import json
 import logging
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Optional
 
 from spearhead.data.adapters import (
     PlatoonLoadoutAdapter,
@@ -20,7 +20,8 @@ logger = logging.getLogger(__name__)
 class ImportService:
     """
     Ingests source files (local for now) into the SQLite store.
-    Idempotent per (import_key) derived from source type + file hash.
+    Idempotent per (import_key) derived from source type + file hash; the hash is
+    checked before any parsing, so unchanged files cost one read of their bytes.
     """
 
     def __init__(self, db_path: Optional[Path] = None):
@@ -29,34 +30,56 @@ class ImportService:
         self._schema_dir = Path(settings.paths.input_dir) / "schema_snapshots"
 
     def import_platoon_loadout(self, file_path: Path) -> int:
-        records = PlatoonLoadoutAdapter.load(file_path)
-        import_id, is_new = self._register_import(file_path, settings.imports.platoon_loadout_label)
-        if not is_new:
-            return 0
-        return self.db.insert_tabular_records(import_id, records)
+        return self._import_tabular(file_path, settings.imports.platoon_loadout_label, PlatoonLoadoutAdapter.iter_records)
 
     def import_battalion_summary(self, file_path: Path) -> int:
-        records = BattalionSummaryAdapter.load(file_path)
-        import_id, is_new = self._register_import(file_path, settings.imports.battalion_summary_label)
-        if not is_new:
+        return self._import_tabular(
+            file_path, settings.imports.battalion_summary_label, BattalionSummaryAdapter.iter_records
+        )
+
+    def _import_tabular(self, file_path: Path, source_type: str, iter_records) -> int:
+        file_hash = self._hash_file(file_path)
+        if self._already_imported(source_type, file_hash):
             return 0
-        return self.db.insert_tabular_records(import_id, records)
+        records = iter_records(file_path)
+        # Registered in the same transaction as its rows: a failed parse or insert
+        # leaves no import behind, so the next attempt is not skipped as a duplicate.
+        with self.db.transaction() as conn:
+            import_id, is_new = self._register_import(file_path, source_type, file_hash=file_hash, conn=conn)
+            if not is_new:
+                return 0
+            return self.db.insert_tabular_records(import_id, records, conn=conn)
 
     def import_form_responses(self, file_path: Path, source_id: Optional[str] = None, platoon: Optional[str] = None) -> int:
-        responses, schema = FormResponsesAdapter.load_with_schema(file_path, source_id=source_id, platoon=platoon)
-        import_id, is_new = self._register_import(file_path, settings.imports.form_responses_label)
-        if not is_new:
+        source_type = settings.imports.form_responses_label
+        file_hash = self._hash_file(file_path)
+        if self._already_imported(source_type, file_hash):
             return 0
-        logger.info(f"DEBUG: Inserting {len(responses)} records into DB (import_id={import_id})")
-        inserted = self.db.insert_form_responses(import_id, responses)
+
+        # Headers are validated here, before the import is registered.
+        responses, schema = FormResponsesAdapter.iter_with_schema(file_path, source_id=source_id, platoon=platoon)
+        try:
+            with self.db.transaction() as conn:
+                import_id, is_new = self._register_import(file_path, source_type, file_hash=file_hash, conn=conn)
+                if not is_new:
+                    return 0
+                inserted = self.db.insert_form_responses(import_id, responses, conn=conn)
+        finally:
+            responses.close()
+        logger.info(f"DEBUG: Inserted {inserted} records into DB (import_id={import_id})")
         if schema:
             self._store_schema_snapshot(import_id, settings.imports.form_responses_label, schema)
         return inserted
 
-    def _register_import(self, file_path: Path, source_type: str) -> tuple[int, bool]:
-        file_hash = self._hash_file(file_path)
+    def _register_import(
+        self, file_path: Path, source_type: str, file_hash: Optional[str] = None, conn=None
+    ) -> tuple[int, bool]:
+        file_hash = file_hash or self._hash_file(file_path)
         import_key = f"{source_type}:{file_hash}"
-        return self.db.upsert_import(import_key, file_path, source_type)
+        return self.db.upsert_import(import_key, file_path, source_type, conn=conn)
+
+    def _already_imported(self, source_type: str, file_hash: str) -> bool:
+        return self.db.find_import(f"{source_type}:{file_hash}") is not None
 
     def _store_schema_snapshot(self, import_id: int, source_type: str, snapshot: SchemaSnapshot) -> None:
         payload = snapshot.to_dict()
@@ -1,4 +1,4 @@
-from typing import List, Optional, Protocol, TypeVar, Generic
+from typing import Any, Dict, List, Optional, Protocol, TypeVar, Generic
 from pydantic import BaseModel
 import pandas as pd
 from spearhead.data.storage import Database
@@ -21,9 +21,10 @@ class BaseRepository:
         If scope is None or 'battalion' or 'all', no filter is applied (subject to authorization layer).
         If scope is a specific platoon name, filters the DataFrame.
         """
-        if not scope or scope in ("battalion", "all", ""):
+        valid_values = self._scope_values(scope)
+        if valid_values is None:
             return df
-        
+
         if column not in df.columns:
             # Try case-insensitive lookup for robustness
             alt = {c.lower(): c for c in df.columns}.get(column.lower())
@@ -32,6 +33,18 @@ class BaseRepository:
             else:
                 return pd.DataFrame(columns=df.columns)
 
+        # Normalize column for comparison
+        col_norm = df[column].fillna("").astype(str).str.strip().str.lower()
+        
+        return df[col_norm.isin(valid_values)]
+
+    def _scope_values(self, scope: Optional[str]) -> Optional[set]:
+        """
+        Lowercased raw platoon values that belong to `scope`, or None when the scope is unrestricted.
+        """
+        if not scope or scope in ("battalion", "all", ""):
+            return None
+
         # Normalize scope to canonical English key (e.g. "כפיר" -> "Kfir")
         target_scope = self._normalize_platoon(scope)
         
@@ -44,11 +57,18 @@ class BaseRepository:
         
         # Also include the raw input just in case
         valid_values.add(str(scope).strip().lower())
+        return valid_values
 
-        # Normalize column for comparison
-        col_norm = df[column].fillna("").astype(str).str.strip().str.lower()
-        
-        return df[col_norm.isin(valid_values)]
+    def _scope_predicate(self, scope: Optional[str], column: str = "platoon") -> tuple[str, list]:
+        """
+        SQL twin of apply_scope: `lower(trim(column)) IN (...)` over the alias-expanded scope.
+        Returns ("", []) when no filter applies.
+        """
+        valid_values = self._scope_values(scope)
+        if valid_values is None:
+            return "", []
+        values = sorted(valid_values)
+        return f"lower(trim({column})) IN ({', '.join('?' * len(values))})", values
 
     @property
     def _alias_map(self) -> dict:
@@ -106,30 +126,28 @@ class FormRepository(BaseRepository):
         Fetch form responses with optional filtering.
         Enforces tenant isolation via 'platoon' arg.
         """
-        # 1. Fetch Raw Data
-        # Optimization: In a real SQL DB, we would filter in the WHERE clause.
-        # Here we use pandas over the full table (SQLite/Parquet abstraction).
+        # Week filter and tenant isolation (security scope) are both pushed into SQL,
+        # served by the (week_label, lower(trim(platoon))) indexes.
+        clauses, params = self._filters(week=week, platoon=platoon)
         try:
-            df = self.db.read_table(self.table)
-        except Exception as e:
+            with self.db._connect() as conn:
+                return pd.read_sql_query(f"SELECT * FROM {self.table}{clauses} ORDER BY id", conn, params=params)
+        except Exception:
             # Table might not exist yet
             return pd.DataFrame()
 
-        if df.empty:
-            return df
-
-        # 2. Apply Logical Filters (Date/Week)
+    def _filters(self, week: Optional[str] = None, platoon: Optional[str] = None) -> tuple[str, list]:
+        where: List[str] = []
+        params: List[Any] = []
         if week:
-            week_cols = {c.lower(): c for c in df.columns}
-            target_week_col = week_cols.get("week_label") or week_cols.get("week")
-            if target_week_col:
-                df = df[df[target_week_col] == week]
-
-        # 3. Apply Tenant Isolation (Security Scope)
+            where.append("week_label = ?")
+            params.append(week)
         # Persisted column name is lowercase 'platoon'
-        df = self.apply_scope(df, scope=platoon, column="platoon")
-        
-        return df
+        scope_sql, scope_params = self._scope_predicate(platoon, column="platoon")
+        if scope_sql:
+            where.append(scope_sql)
+            params.extend(scope_params)
+        return (" WHERE " + " AND ".join(where) if where else ""), params
 
     def get_latest_sync_metadata(self) -> dict:
         """Return metadata about the last sync operation."""
@@ -137,22 +155,125 @@ class FormRepository(BaseRepository):
 
     def get_latest_week(self) -> Optional[str]:
         """Fetch the most recent week label from the data."""
-        df = self.get_forms()
-        if not df.empty and "week_label" in df.columns:
-            # Drop nulls and sort
-            weeks = df["week_label"].dropna().unique()
-            if len(weeks) > 0:
-                return sorted(weeks)[-1]
-        return None
-
-    def get_unique_values(self, column: str, week: Optional[str] = None) -> List[str]:
+        try:
+            with self.db._connect() as conn:
+                row = conn.execute(f"SELECT MAX(week_label) FROM {self.table}").fetchone()
+        except Exception:
+            return None
+        return row[0] if row else None
+
+    def get_unique_values(self, column: str, week: Optional[str] = None, platoon: Optional[str] = None) -> List[str]:
         """Get distinct values for a column (e.g., 'platoon', 'week_label')."""
-        df = self.get_forms(week=week)
-        if df.empty or column not in df.columns:
+        try:
+            with self.db._connect() as conn:
+                columns = {r[1] for r in conn.execute(f"PRAGMA table_info({self.table})")}
+                if column not in columns:
+                    return []
+                clauses, params = self._filters(week=week, platoon=platoon)
+                clauses += (" AND " if clauses else " WHERE ") + f'"{column}" IS NOT NULL'
+                rows = conn.execute(f'SELECT DISTINCT "{column}" FROM {self.table}{clauses}', params).fetchall()
+        except Exception:
             return []
-        
-        values = df[column].dropna().unique().tolist()
-        return sorted([str(v) for v in values])
+        return sorted([str(r[0]) for r in rows])
+
+    def get_week_stamps(self, platoon: Optional[str] = None) -> Dict[str, str]:
+        """
+        {week_label: "count:max_id"} for the scope, in week order. A stamp changes whenever
+        rows are added to or removed from that week, so it validates cached derivations.
+        """
+        clauses, params = self._filters(platoon=platoon)
+        clauses += (" AND " if clauses else " WHERE ") + "week_label IS NOT NULL"
+        try:
+            with self.db._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT week_label, COUNT(*), MAX(id) FROM {self.table}{clauses} GROUP BY week_label ORDER BY week_label",
+                    params,
+                ).fetchall()
+        except Exception:
+            return {}
+        return {week: self._stamp(count, max_id) for week, count, max_id in rows}
+
+    def get_coverage_rollup(self, platoon: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Per-(platoon, week) form count, distinct tanks and latest timestamp for the scope,
+        ordered by first appearance. Blank platoons fold into "unknown"; rows without a week
+        come back with week_label None so they still count toward last_seen. Within a group
+        the latest timestamp is the MAX of the stored ISO strings, skipping unparseable ones.
+        """
+        clauses, params = self._filters(platoon=platoon)
+        try:
+            with self.db._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT COALESCE(NULLIF(platoon, ''), 'unknown'), NULLIF(week_label, ''),
+                           COUNT(*), COUNT(DISTINCT NULLIF(tank_id, '')),
+                           MAX(CASE WHEN julianday(timestamp) IS NOT NULL THEN timestamp END)
+                    FROM {self.table}{clauses}
+                    GROUP BY 1, 2 ORDER BY MIN(id)
+                    """,
+                    params,
+                ).fetchall()
+        except Exception:
+            return []
+        return [
+            {"platoon": p, "week_label": week, "forms": forms, "distinct_tanks": tanks, "last_timestamp": ts}
+            for p, week, forms, tanks, ts in rows
+        ]
+
+    def get_week_stamps_for_scopes(self, scopes: List[Optional[str]]) -> Dict[Optional[str], Dict[str, str]]:
+        """
+        get_week_stamps for several scopes from one GROUP BY over the table, combined per
+        scope in memory (used by the battalion view instead of one query per platoon).
+        """
+        try:
+            with self.db._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT lower(trim(platoon)), week_label, COUNT(*), MAX(id) FROM {self.table}
+                    WHERE week_label IS NOT NULL GROUP BY 1, 2
+                    """
+                ).fetchall()
+        except Exception:
+            rows = []
+        result: Dict[Optional[str], Dict[str, str]] = {}
+        for scope in scopes:
+            values = self._scope_values(scope)
+            totals: Dict[str, List[int]] = {}
+            for value, week, count, max_id in rows:
+                if values is None or (value or "") in values:
+                    total = totals.setdefault(week, [0, 0])
+                    total[0] += count
+                    total[1] = max(total[1], max_id)
+            result[scope] = {week: self._stamp(*totals[week]) for week in sorted(totals)}
+        return result
+
+    def get_tank_ids_for_scopes(self, scopes: List[Optional[str]]) -> Dict[Optional[str], set]:
+        """
+        Distinct tank ids ever reported per scope, from one DISTINCT query.
+        """
+        try:
+            with self.db._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT DISTINCT lower(trim(platoon)), tank_id FROM {self.table} WHERE tank_id IS NOT NULL"
+                ).fetchall()
+        except Exception:
+            rows = []
+        result: Dict[Optional[str], set] = {}
+        for scope in scopes:
+            values = self._scope_values(scope)
+            result[scope] = {str(tank) for value, tank in rows if values is None or (value or "") in values}
+        return result
+
+    @staticmethod
+    def _stamp(count: int, max_id: int) -> str:
+        return f"{count}:{max_id}"
+
+    def scope_key(self, platoon: Optional[str] = None) -> str:
+        """
+        Stable identity of a tenant scope: scopes that select the same rows share a key.
+        """
+        values = self._scope_values(platoon)
+        return "*" if values is None else "|".join(sorted(values))
 
 class TabularRepository(BaseRepository):
     """
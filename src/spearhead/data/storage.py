@@ -1,13 +1,173 @@
 import json
+import os
 import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime, UTC
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 import pandas as pd
 
+from spearhead.config import StorageSettings, settings
 from spearhead.data.dto import TabularRecord, FormResponseRow
 
 
+class _ThreadConnection:
+    """Holder so per-thread connections can be tracked weakly (sqlite3.Connection is not weak-referenceable)."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+class _ManagedConnection(sqlite3.Connection):
+    """
+    Connection whose `with` block and commit() defer to an open ConnectionManager.transaction(),
+    so store calls that reach the shared thread connection join that transaction
+    instead of committing it early.
+    """
+
+    managed_transaction = False
+
+    def commit(self) -> None:
+        if not self.managed_transaction:
+            super().commit()
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.managed_transaction:
+            return False  # the enclosing transaction() commits or rolls back
+        return super().__exit__(exc_type, exc, tb)
+
+
+class ConnectionManager:
+    """
+    Owns the SQLite connections for one database file.
+    Each thread reuses a single tuned connection; `open()` hands out a dedicated one
+    for long-running readers. Callers keep using `with conn:` for commit/rollback,
+    which does not close the connection.
+
+    A thread-local connection is shared by every store call on that thread. Inside
+    `transaction()` its `with` blocks and commit() are deferred, so nested calls join
+    the transaction; passing the connection explicitly as `conn=` is still preferred.
+    """
+
+    def __init__(self, db_path: Path, options: Optional[StorageSettings] = None):
+        self.db_path = Path(db_path)
+        self.options = options or settings.storage
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._holders: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+
+    def open(self) -> sqlite3.Connection:
+        """
+        New connection with the configured pragmas; the caller must close it.
+        """
+        opts = self.options
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            timeout=opts.busy_timeout_ms / 1000,
+            cached_statements=opts.cached_statements,
+            check_same_thread=False,  # only close_all() crosses threads
+            factory=_ManagedConnection,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(opts.busy_timeout_ms)}")
+        if opts.journal_mode:
+            conn.execute(f"PRAGMA journal_mode = {opts.journal_mode}")
+        if opts.synchronous:
+            conn.execute(f"PRAGMA synchronous = {opts.synchronous}")
+        conn.execute(f"PRAGMA mmap_size = {int(opts.mmap_size_mb) * 1024 * 1024}")
+        # Negative cache_size is in KiB.
+        conn.execute(f"PRAGMA cache_size = {-int(opts.cache_size_mb) * 1024}")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        if not self.options.pool_connections:
+            return self.open()
+        if self._pid != os.getpid():
+            # Forked child: never touch the parent's connections.
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = _ThreadConnection(self.open())
+            self._local.holder = holder
+            with self._lock:
+                self._holders.add(holder)
+        return holder.conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        One write transaction on this thread's connection. Reentrant: a nested call joins
+        the active transaction, and only the outermost block commits or rolls back.
+        """
+        active = getattr(self._local, "transaction", None)
+        if active is not None:
+            yield active
+            return
+        conn = self.connection()
+        conn.managed_transaction = True
+        self._local.transaction = conn
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            sqlite3.Connection.commit(conn)
+        finally:
+            conn.managed_transaction = False
+            self._local.transaction = None
+            if not self.options.pool_connections:
+                conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            holders = list(self._holders)
+            self._holders = weakref.WeakSet()
+            self._local = threading.local()
+        for holder in holders:
+            try:
+                holder.conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_managers: dict[Path, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: Path) -> ConnectionManager:
+    """
+    Process-wide manager per database file, so every Database/repository on the
+    same path shares the per-thread connections.
+    """
+    key = Path(db_path).resolve()
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(key)
+            _managers[key] = manager
+        return manager
+
+
+def close_all_connections() -> None:
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close_all()
+
+
 class Database:
     """
     Thin wrapper over sqlite3 for IronView data persistence.
@@ -17,10 +177,17 @@ class Database:
     def __init__(self, db_path: Path):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connections = get_connection_manager(self.db_path)
         self._ensure_schema()
 
     def _connect(self):
-        return sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+        return self.connections.connection()
+
+    def open_connection(self) -> sqlite3.Connection:
+        """
+        Dedicated (non-shared) connection for long-lived readers such as streaming exports.
+        """
+        return self.connections.open()
 
     def _ensure_schema(self):
         with self._connect() as conn:
@@ -86,6 +253,33 @@ class Database:
                 cur.execute("ALTER TABLE form_responses ADD COLUMN week_label TEXT;")
             if "platoon" not in existing_cols:
                 cur.execute("ALTER TABLE form_responses ADD COLUMN platoon TEXT;")
+            # FormRepository filters on the normalized platoon expression, so index that, not the raw column.
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_form_responses_week_platoon "
+                "ON form_responses (week_label, lower(trim(platoon)));"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_form_responses_platoon ON form_responses (lower(trim(platoon)));"
+            )
+            # Covers the coverage rollup, so its GROUP BY never reads the fields_json pages.
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_form_responses_coverage "
+                "ON form_responses (platoon, week_label, tank_id, timestamp);"
+            )
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tank_score_cache (
+                    scope_key TEXT NOT NULL,
+                    week_label TEXT NOT NULL,
+                    config_hash TEXT NOT NULL,
+                    source_stamp TEXT NOT NULL,
+                    scores_json TEXT NOT NULL,
+                    created_at TEXT,
+                    PRIMARY KEY (scope_key, week_label, config_hash)
+                );
+                """
+            )
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_tank_score_cache_week ON tank_score_cache (week_label);")
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS ai_insights (
@@ -100,30 +294,51 @@ class Database:
             )
             conn.commit()
 
-    def upsert_import(self, import_key: str, source_file: Path, source_type: str) -> tuple[int, bool]:
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
         """
-        Idempotent insert: returns (import_id, created_flag).
+        One write transaction on this thread's connection; pass the yielded connection
+        as `conn=` to the store calls that must commit or roll back together. Reentrant,
+        and `_connect()` reads or writes inside it join rather than commit it.
         """
+        with self.connections.transaction() as conn:
+            yield conn
+
+    def find_import(self, import_key: str) -> Optional[int]:
         with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT id FROM imports WHERE import_key = ?", (import_key,))
-            row = cur.fetchone()
-            if row:
-                return row[0], False
-            cur.execute(
-                "INSERT INTO imports (import_key, source_file, source_type, created_at) VALUES (?, ?, ?, ?)",
-                (
-                    import_key,
-                    str(source_file),
-                    source_type,
-                    datetime.now(UTC).isoformat(),
-                ),
-            )
-            conn.commit()
-            return cur.lastrowid, True
+            row = conn.execute("SELECT id FROM imports WHERE import_key = ?", (import_key,)).fetchone()
+        return row[0] if row else None
 
-    def insert_tabular_records(self, import_id: int, records: Iterable[TabularRecord]) -> int:
-        to_insert = [
+    def upsert_import(
+        self, import_key: str, source_file: Path, source_type: str, conn: Optional[sqlite3.Connection] = None
+    ) -> tuple[int, bool]:
+        """
+        Idempotent insert: returns (import_id, created_flag). With `conn`, the row is
+        written in the caller's transaction and commits (or rolls back) with its data.
+        """
+        if conn is None:
+            with self.transaction() as conn:
+                return self.upsert_import(import_key, source_file, source_type, conn=conn)
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM imports WHERE import_key = ?", (import_key,))
+        row = cur.fetchone()
+        if row:
+            return row[0], False
+        cur.execute(
+            "INSERT INTO imports (import_key, source_file, source_type, created_at) VALUES (?, ?, ?, ?)",
+            (
+                import_key,
+                str(source_file),
+                source_type,
+                datetime.now(UTC).isoformat(),
+            ),
+        )
+        return cur.lastrowid, True
+
+    def insert_tabular_records(
+        self, import_id: int, records: Iterable[TabularRecord], conn: Optional[sqlite3.Connection] = None
+    ) -> int:
+        rows = (
             (
                 import_id,
                 r.section,
@@ -135,61 +350,128 @@ class Database:
                 r.platoon,
             )
             for r in records
-        ]
-        if not to_insert:
-            return 0
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.executemany(
-                """
-                INSERT INTO tabular_records
-                    (import_id, section, item, column_name, value_text, value_num, row_index, platoon)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                to_insert,
-            )
-            conn.commit()
-            return cur.rowcount
-
-    def insert_form_responses(self, import_id: int, responses: Iterable[FormResponseRow]) -> int:
-        to_insert = []
-        for r in responses:
-            ts = r.timestamp.isoformat() if r.timestamp else None
-            week_label = r.week_label
-            # Ensure JSON-serializable payload
-            serializable_fields = {}
-            for k, v in r.fields.items():
-                if isinstance(v, (str, int, float, bool)) or v is None:
-                    serializable_fields[k] = v
-                elif hasattr(v, "isoformat"):
-                    serializable_fields[k] = v.isoformat()
-                else:
-                    serializable_fields[k] = str(v)
-            to_insert.append(
-                (
+        )
+        return self._insert_chunked(
+            """
+            INSERT INTO tabular_records
+                (import_id, section, item, column_name, value_text, value_num, row_index, platoon)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+            conn=conn,
+        )
+
+    def insert_form_responses(
+        self, import_id: int, responses: Iterable[FormResponseRow], conn: Optional[sqlite3.Connection] = None
+    ) -> int:
+        weeks: set = set()
+
+        def rows() -> Iterator[tuple]:
+            for r in responses:
+                weeks.add(r.week_label)
+                ts = r.timestamp.isoformat() if r.timestamp else None
+                # Ensure JSON-serializable payload
+                serializable_fields = {}
+                for k, v in r.fields.items():
+                    if isinstance(v, (str, int, float, bool)) or v is None:
+                        serializable_fields[k] = v
+                    elif hasattr(v, "isoformat"):
+                        serializable_fields[k] = v.isoformat()
+                    else:
+                        serializable_fields[k] = str(v)
+                yield (
                     import_id,
                     r.row_index,
                     r.platoon,
                     r.tank_id,
                     ts,
-                    week_label,
+                    r.week_label,
                     json.dumps(serializable_fields, ensure_ascii=False),
                 )
-            )
-        if not to_insert:
-            return 0
+
+        return self._insert_chunked(
+            """
+            INSERT INTO form_responses
+                (import_id, row_index, platoon, tank_id, timestamp, week_label, fields_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows(),
+            before_commit=lambda cur: self.invalidate_tank_scores(weeks, cur=cur),
+            conn=conn,
+        )
+
+    def _insert_chunked(
+        self,
+        sql: str,
+        rows: Iterable[tuple[Any, ...]],
+        before_commit: Optional[Callable[[sqlite3.Cursor], None]] = None,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> int:
+        """
+        executemany over `rows` in bounded chunks inside one transaction, so a lazily
+        parsed sheet is never materialized in full. All-or-nothing like a single insert;
+        `before_commit` runs in the same transaction. With `conn`, the caller's
+        transaction is used and left open.
+        """
+        if conn is None:
+            with self.transaction() as conn:
+                return self._insert_chunked(sql, rows, before_commit, conn=conn)
+        size = max(settings.storage.insert_chunk_rows, 1)
+        iterator = iter(rows)
+        inserted = 0
+        cur = conn.cursor()
+        while chunk := list(islice(iterator, size)):
+            cur.executemany(sql, chunk)
+            inserted += cur.rowcount
+        if before_commit:
+            before_commit(cur)
+        return inserted
+
+    def get_tank_scores(self, scope_key: str, config_hash: str, stamps: dict[str, str]) -> dict[str, str]:
+        """
+        Cached scores_json per week for the given {week_label: source_stamp}; entries whose
+        stamp no longer matches the underlying rows are treated as misses.
+        """
+        if not stamps:
+            return {}
+        weeks = list(stamps)
         with self._connect() as conn:
-            cur = conn.cursor()
-            cur.executemany(
+            rows = conn.execute(
+                f"""
+                SELECT week_label, source_stamp, scores_json FROM tank_score_cache
+                WHERE scope_key = ? AND config_hash = ? AND week_label IN ({", ".join("?" * len(weeks))})
+                """,
+                [scope_key, config_hash, *weeks],
+            ).fetchall()
+        return {week: payload for week, stamp, payload in rows if stamps.get(week) == stamp}
+
+    def put_tank_scores(self, scope_key: str, config_hash: str, week_label: str, stamp: str, scores_json: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
                 """
-                INSERT INTO form_responses
-                    (import_id, row_index, platoon, tank_id, timestamp, week_label, fields_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT OR REPLACE INTO tank_score_cache
+                    (scope_key, week_label, config_hash, source_stamp, scores_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                to_insert,
+                (scope_key, week_label, config_hash, stamp, scores_json, datetime.now(UTC).isoformat()),
             )
-            conn.commit()
-            return cur.rowcount
+
+    def invalidate_tank_scores(self, weeks: Optional[Iterable[Optional[str]]] = None, cur=None) -> int:
+        """
+        Drops cached tank scores for `weeks` (all weeks when None). Called whenever
+        form responses land; pass `cur` to run inside the caller's transaction.
+        """
+        if weeks is None:
+            sql, params = "DELETE FROM tank_score_cache", []
+        else:
+            params = [w for w in weeks if w is not None]
+            if not params:
+                return 0
+            sql = f"DELETE FROM tank_score_cache WHERE week_label IN ({', '.join('?' * len(params))})"
+        if cur is not None:
+            return cur.execute(sql, params).rowcount
+        with self._connect() as conn:
+            return conn.execute(sql, params).rowcount
 
     def get_ai_insight(self, cache_key: str) -> Optional[dict]:
         with self._connect() as conn:
@@ -2,6 +2,7 @@ import pandas as pd
 from typing import List, Dict, Any
 from datetime import datetime
 from spearhead.domain.models import VehicleReport, ReadinessStatus, BattalionData
+from spearhead.logic.tokens import TokenClassifier
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,10 @@ class KfirAdapter:
         "fault_desc": ["מה הבלאי", "תאר את תקלת הטנ\"א", "תקלת טנא"],
     }
 
+    # "חסר" can be part of a string; "0"/"לא" only count standalone.
+    LOGISTICS_GAPS = TokenClassifier(["חסר", "לא תקין"], exact_gap_tokens=["0", "לא"])
+    MISSING_OR_FAULTY = TokenClassifier(["חסר", "תקול"])
+
     @classmethod
     def load(cls, file_path: str) -> BattalionData:
         logger.info(f"KfirAdapter: Loading {file_path}")
@@ -124,19 +129,10 @@ class KfirAdapter:
             val_str = str(val)
             # Logic: If column name contains "דוח זיווד" and value implies missing
             if "דוח זיווד" in col_name:
-                # Check for specific "missing" indicators accurately
-                # "0" should be standalone or explicit boolean false. 
-                # "לא" should be standalone.
-                # "חסר" can be part of string.
                 v_lower = val_str.lower()
-                is_gap = False
-                
-                if "חסר" in v_lower or "לא תקין" in v_lower:
-                    is_gap = True
-                elif val_str.strip() == "0" or val_str.strip() == "לא":
-                    is_gap = True
-                elif "x" in v_lower and len(v_lower) < 5: # e.g. "X" mark
-                    is_gap = True
+                is_gap = cls.LOGISTICS_GAPS.is_gap(val_str) or (
+                    "x" in v_lower and len(v_lower) < 5  # e.g. "X" mark
+                )
                 
                 if is_gap:
                     # Extract item
@@ -144,7 +140,7 @@ class KfirAdapter:
                     logistics.append(item_raw)
 
             # Also catch generic "missing" tokens in other columns (like Logistics Status)
-            if "חסר" in val_str or "תקול" in val_str:
+            if cls.MISSING_OR_FAULTY.is_gap(val_str):
                  if ":" in col_name:
                      logistics.append(col_name.split(":")[0])
 
@@ -1,24 +1,24 @@
-import re
 from typing import List, Dict, Any
 from spearhead.data.dto import GapReport, FormResponseRow
+from spearhead.logic.tokens import TokenClassifier
 
 class GapAnalyzer:
     """
     Analyzes form responses to detect operational gaps.
     """
     
-    # Regex patterns for negative indicators
-    MISSING_PATTERNS = [
-        r"חסר", r"אין", r"נגמר", r"לא קיים", r"0", r"^0$"
+    # Tokens for negative indicators (substring matches)
+    MISSING_TOKENS = [
+        "חסר", "אין", "נגמר", "לא קיים", "0"
     ]
     
-    WEAR_PATTERNS = [
-        r"בלאי", r"תקול", r"שבור", r"קרוע", r"פג תוקף"
+    WEAR_TOKENS = [
+        "בלאי", "תקול", "שבור", "קרוע", "פג תוקף"
     ]
 
     def __init__(self):
-        self.missing_re = re.compile("|".join(self.MISSING_PATTERNS), re.IGNORECASE)
-        self.wear_re = re.compile("|".join(self.WEAR_PATTERNS), re.IGNORECASE)
+        self.missing = TokenClassifier(self.MISSING_TOKENS)
+        self.wear = TokenClassifier(self.WEAR_TOKENS)
 
     def analyze_row(self, row: FormResponseRow) -> List[GapReport]:
         """
@@ -31,9 +31,9 @@ class GapAnalyzer:
                 continue
 
             gap_type = None
-            if self.missing_re.search(val_str):
+            if self.missing.is_gap(val_str):
                 gap_type = "MISSING"
-            elif self.wear_re.search(val_str):
+            elif self.wear.is_gap(val_str):
                 gap_type = "WEAR"
 
             if gap_type:
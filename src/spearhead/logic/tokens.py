@@ -0,0 +1,140 @@
+"""
+Shared gap/ok status-token classifier.
+
+Every service used to re-scan its own token tuple against every field value.
+A TokenClassifier compiles its tokens into one alternation regex, memoizes the
+verdict per distinct text, and offers array variants that classify each unique
+value of a column once.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from spearhead.config import settings
+from spearhead.config_fields import field_config
+
+_NUMERIC = (int, float, np.number)
+
+
+def _compile(tokens: Iterable[str]) -> Optional[re.Pattern[str]]:
+    # Longest first so overlapping tokens resolve to the most specific alternative.
+    unique = sorted({t for t in tokens if t}, key=len, reverse=True)
+    if not unique:
+        return None
+    return re.compile("|".join(re.escape(t) for t in unique), re.IGNORECASE)
+
+
+class TokenClassifier:
+    """
+    Substring token matcher for status cells ("קיים", "חוסר", ...).
+
+    - gap: text contains any gap token, or equals one of `exact_gap_tokens`.
+    - ok: text contains any ok token.
+    - issue: a non-empty-ish cell that is not ok.
+    Matching is case-insensitive. With `classify_numbers=False` numeric cells
+    (quantities) are never gaps or issues.
+    """
+
+    def __init__(
+        self,
+        gap_tokens: Iterable[str],
+        ok_tokens: Iterable[str] = (),
+        *,
+        exact_gap_tokens: Iterable[str] = (),
+        classify_numbers: bool = True,
+        memo_size: int = 4096,
+    ):
+        self.gap_tokens = tuple(dict.fromkeys(gap_tokens))
+        self.ok_tokens = tuple(dict.fromkeys(ok_tokens))
+        self.exact_gap_tokens = frozenset(t.strip().lower() for t in exact_gap_tokens)
+        self.classify_numbers = classify_numbers
+        self._gap_re = _compile(self.gap_tokens)
+        self._ok_re = _compile(self.ok_tokens)
+        self._flags = lru_cache(maxsize=memo_size)(self._classify_text)
+
+    def _classify_text(self, text: str) -> tuple[bool, bool]:
+        stripped = text.strip()
+        if not stripped:
+            return False, False
+        gap = bool(self._gap_re and self._gap_re.search(stripped)) or (
+            stripped.lower() in self.exact_gap_tokens
+        )
+        ok = bool(self._ok_re and self._ok_re.search(stripped))
+        return gap, ok
+
+    def _text(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return value
+        if not self.classify_numbers and isinstance(value, _NUMERIC):
+            return None
+        return str(value)
+
+    # ---- scalar API ----
+    def is_gap(self, value: Any) -> bool:
+        text = self._text(value)
+        return text is not None and self._flags(text)[0]
+
+    def is_ok(self, value: Any) -> bool:
+        text = self._text(value)
+        return text is not None and self._flags(text)[1]
+
+    def is_issue(self, value: Any) -> bool:
+        text = self._text(value)
+        return text is not None and not self._flags(text)[1]
+
+    # ---- batch API ----
+    def gap_mask(self, values: Any) -> np.ndarray:
+        return self._mask(values, self.is_gap)
+
+    def ok_mask(self, values: Any) -> np.ndarray:
+        return self._mask(values, self.is_ok)
+
+    def issue_mask(self, values: Any) -> np.ndarray:
+        return self._mask(values, self.is_issue)
+
+    @staticmethod
+    def _mask(values: Any, predicate: Callable[[Any], bool]) -> np.ndarray:
+        """
+        Classifies each distinct value once; missing values (None/NaN) are False.
+        """
+        if not isinstance(values, (pd.Series, pd.Index, np.ndarray)):
+            values = np.asarray(list(values), dtype=object)
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        mask = np.zeros(len(codes), dtype=bool)
+        if len(uniques):
+            lookup = np.fromiter((predicate(u) for u in uniques), dtype=bool, count=len(uniques))
+            present = codes >= 0
+            mask[present] = lookup[codes[present]]
+        return mask
+
+    def cache_info(self):
+        return self._flags.cache_info()
+
+
+def status_classifier(
+    extra_gap_tokens: Iterable[str] = (),
+    extra_ok_tokens: Iterable[str] = (),
+    *,
+    classify_numbers: bool = True,
+) -> TokenClassifier:
+    """
+    Classifier over settings.status_tokens + field_config tokens plus call-site extras.
+    Instances are shared per resolved token set, so the memo is shared too.
+    """
+    gap = tuple(
+        dict.fromkeys([*settings.status_tokens.gap_tokens, *field_config.gap_tokens, *extra_gap_tokens])
+    )
+    ok = tuple(dict.fromkeys([*settings.status_tokens.ok_tokens, *field_config.ok_tokens, *extra_ok_tokens]))
+    return _shared_classifier(gap, ok, classify_numbers)
+
+
+@lru_cache(maxsize=32)
+def _shared_classifier(gap: tuple[str, ...], ok: tuple[str, ...], classify_numbers: bool) -> TokenClassifier:
+    return TokenClassifier(gap, ok, classify_numbers=classify_numbers)
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import json
+from pathlib import Path
+from typing import List, Optional
+
 import typer
 import uvicorn
 
 from spearhead.config import settings
+from spearhead.data.storage import Database
+from spearhead.v1.backfill import backfill_xlsx
 from spearhead.v1.reconcile import main as reconcile_main
 
 cli = typer.Typer(help="Spearhead CLI (responses-only runtime)")
@@ -32,9 +38,40 @@ def serve(
 
 
 @cli.command()
-def reconcile() -> None:
+def reconcile(
+    workers: int = typer.Option(
+        settings.v1.reconcile_workers, help="Processes for per-week aggregation (1 = in-process)"
+    ),
+    full: bool = typer.Option(False, "--full", help="Rebuild facts and every week, not just changed weeks"),
+) -> None:
     """Rebuild v1 read-model snapshots from normalized responses."""
-    raise SystemExit(reconcile_main())
+    raise SystemExit(reconcile_main(workers=workers, full=full))
+
+
+@cli.command("ingest-xlsx")
+def ingest_xlsx(
+    files: List[Path] = typer.Argument(..., exists=True, dir_okay=False, help="Google Forms XLSX exports"),
+    batch_size: int = typer.Option(settings.v1.max_batch_events, help="Events per write transaction"),
+    checkpoint: Optional[Path] = typer.Option(None, help="Checkpoint file (default: next to the database)"),
+    resume: bool = typer.Option(False, "--resume", help="Skip rows already committed per the checkpoint"),
+    source_id: Optional[str] = typer.Option(None, help="Override source_id (default: each file's name)"),
+) -> None:
+    """Backfill historical form responses from XLSX files into the v1 store."""
+    checkpoint = checkpoint or settings.paths.db_path.with_name("ingest_xlsx.checkpoint.json")
+    result = backfill_xlsx(
+        Database(settings.paths.db_path),
+        files,
+        batch_size=batch_size,
+        checkpoint_path=checkpoint,
+        resume=resume,
+        source_id=source_id,
+        progress=lambda p: typer.echo(
+            f"{p['file']} row {p['row']}: {p['rows']} rows ({p['created']} new, "
+            f"{p['duplicates']} dup, {p['errors']} err) {p['rows_per_sec']} rows/s",
+            err=True,
+        ),
+    )
+    typer.echo(json.dumps(result, ensure_ascii=False))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,12 @@
-from typing import List, Optional, Dict
+from typing import Any, Iterable, List, Mapping, Optional, Dict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
 from datetime import datetime, UTC
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
 
 from spearhead.data.dto import (
     PlatoonIntelligence, 
@@ -9,7 +16,8 @@ from spearhead.data.dto import (
     TrendPoint,
 )
 from spearhead.data.repositories import FormRepository
-from spearhead.logic.scoring import ScoringEngine
+from spearhead.logic.scoring import ScoringConfig, ScoringEngine
+from spearhead.logic.tokens import status_classifier
 from spearhead.data.field_mapper import FieldMapper
 from spearhead.config import settings
 import json
@@ -19,11 +27,19 @@ class IntelligenceService:
     """
     Orchestrates data retrieval and scoring logic to produce high-level intelligence insights.
     Enforces strict tenant isolation.
+
+    Tank scores of weeks other than the requested one are read from a persisted cache keyed
+    by (scope, week, scoring-config hash) and validated against the week's row stamp, so
+    trend/delta history is not re-scored on every request.
     """
+    TREND_WINDOW = 8
+
     def __init__(self, repository: FormRepository, scoring_engine: ScoringEngine):
         self.repo = repository
         self.engine = scoring_engine
         self.mapper = FieldMapper()
+        self.tokens = status_classifier(["חסר", "אין", "תקול", "בלאי", "0"], ["תקין", "יש", "מלא"])
+        self.config_hash = self._scoring_fingerprint()
 
     def get_platoon_intelligence(
         self, 
@@ -33,31 +49,55 @@ class IntelligenceService:
         """
         Generates intelligence report for a single platoon.
         """
-        # Fetch all history for platoon for trend/delta calculations
-        df_all = self.repo.get_forms(platoon=platoon)
+        # Week stamps stand in for the platoon's full history in trend/delta calculations
+        stamps = self.repo.get_week_stamps(platoon=platoon)
         target_week = week or self.repo.get_latest_week() or "Unknown"
-        df_current = df_all[df_all["week_label"] == target_week] if not df_all.empty else pd.DataFrame()
-        display_platoon = self._display_platoon(platoon)
+        df_current = self.repo.get_forms(week=target_week, platoon=platoon) if target_week in stamps else pd.DataFrame()
 
         # If no data, return empty structure
         if df_current.empty:
-            return PlatoonIntelligence(
-                platoon=display_platoon, 
-                week=target_week, 
-                readiness_score=0.0, 
-                tank_scores=[], 
-                critical_tanks_count=0,
-                breakdown={"zivud": 0.0, "ammo": 0.0, "comms": 0.0, "completeness": 0.0},
-                deltas={"overall": None},
-                coverage={"reports_this_week": 0, "expected": 0, "missing_reports": 0},
-                top_gaps_platoon=[],
-                top_gaps_battalion_level=[]
-            )
+            return self._empty_platoon(platoon, target_week)
 
         # Compute tank scores for current week
         tank_scores = self._score_dataframe(df_current)
-        # Compute trends/deltas using history
-        tank_scores = self._attach_trends_and_deltas(tank_scores, df_all)
+        # Compute trends/deltas using history (cached per week)
+        history_stamps = self._history_stamps(target_week, stamps)
+        history, missing = self._cached_week_scores(platoon, history_stamps)
+        for w, stamp in missing.items():
+            history[w] = self._score_dataframe(self.repo.get_forms(week=w, platoon=platoon))
+            self._store_week_scores(platoon, w, stamp, history[w])
+        expected_tanks = len(self.repo.get_unique_values("tank_id", platoon=platoon))
+        return self._assemble_platoon(platoon, target_week, df_current, tank_scores, list(stamps), history, expected_tanks)
+
+    def _empty_platoon(self, platoon: str, target_week: str) -> PlatoonIntelligence:
+        return PlatoonIntelligence(
+            platoon=self._display_platoon(platoon), 
+            week=target_week, 
+            readiness_score=0.0, 
+            tank_scores=[], 
+            critical_tanks_count=0,
+            breakdown={"zivud": 0.0, "ammo": 0.0, "comms": 0.0, "completeness": 0.0},
+            deltas={"overall": None},
+            coverage={"reports_this_week": 0, "expected": 0, "missing_reports": 0},
+            top_gaps_platoon=[],
+            top_gaps_battalion_level=[]
+        )
+
+    def _assemble_platoon(
+        self,
+        platoon: str,
+        target_week: str,
+        df_current: pd.DataFrame,
+        tank_scores: List[TankScore],
+        weeks: List[str],
+        history: Dict[str, List[TankScore]],
+        expected_tanks: int,
+    ) -> PlatoonIntelligence:
+        display_platoon = self._display_platoon(platoon)
+        trend_weeks = weeks[-self.TREND_WINDOW:]
+        prev_week = self._previous_week(target_week, weeks)
+        history = {**history, target_week: tank_scores}
+        tank_scores = self._attach_trends_and_deltas(tank_scores, trend_weeks, history)
 
         # Aggregates
         platoon_score = self.engine.calculate_platoon_score(tank_scores)
@@ -68,17 +108,14 @@ class IntelligenceService:
             for k in family_keys
         }
         # Overall delta from previous week
-        prev_week = self._previous_week(target_week, df_all)
         prev_platoon_score = None
         if prev_week:
-            prev_df = df_all[df_all["week_label"] == prev_week]
-            prev_scores = self._score_dataframe(prev_df)
+            prev_scores = history.get(prev_week, [])
             prev_platoon_score = self.engine.calculate_platoon_score(prev_scores) if prev_scores else None
         deltas = {"overall": round(platoon_score - prev_platoon_score, 1) if prev_platoon_score is not None else None}
 
         # Coverage
         reports_this_week = len(df_current)
-        expected_tanks = len(df_all["tank_id"].dropna().unique())
         distinct_current = len(df_current["tank_id"].dropna().unique())
         coverage = {
             "reports_this_week": reports_this_week,
@@ -113,9 +150,14 @@ class IntelligenceService:
             top_gaps_platoon=top_gaps_platoon,
         )
 
-    def get_battalion_intelligence(self, week: Optional[str] = None) -> BattalionIntelligence:
+    def get_battalion_intelligence(self, week: Optional[str] = None, workers: Optional[int] = None) -> BattalionIntelligence:
         """
         Aggregates intelligence for all platoons.
+
+        Single pass: the target week (and any history week missing from the score cache)
+        is read once for the whole battalion and partitioned by platoon in memory; the
+        partitions are scored concurrently in a process pool. Output matches calling
+        get_platoon_intelligence per platoon.
         """
         # Fetch all platoons
         all_platoons = self.repo.get_unique_values("platoon", week=week)
@@ -125,8 +167,41 @@ class IntelligenceService:
         
         target_week = week or self.repo.get_latest_week() or "Unknown"
 
+        stamps_by_platoon = self.repo.get_week_stamps_for_scopes(all_platoons)
+        tanks_by_platoon = self.repo.get_tank_ids_for_scopes(all_platoons)
+        df_week = self.repo.get_forms(week=target_week)
+        current = {p: self.repo.apply_scope(df_week, scope=p, column="platoon") for p in all_platoons}
+
+        # Partitions to score: every platoon's target week plus its cache misses.
+        histories: Dict[str, Dict[str, List[TankScore]]] = {}
+        missing: Dict[tuple, str] = {}
         for p in all_platoons:
-            intel = self.get_platoon_intelligence(p, week=target_week)
+            if current[p].empty:
+                continue
+            histories[p], misses = self._cached_week_scores(p, self._history_stamps(target_week, stamps_by_platoon[p]))
+            missing.update({(p, w): stamp for w, stamp in misses.items()})
+        week_frames = {w: self.repo.get_forms(week=w) for w in sorted({w for _, w in missing})}
+        partitions: Dict[tuple, pd.DataFrame] = {(p, target_week): current[p] for p in histories}
+        for p, w in missing:
+            partitions[(p, w)] = self.repo.apply_scope(week_frames[w], scope=p, column="platoon")
+        scored = self._score_partitions(partitions, workers=workers)
+        for (p, w), stamp in missing.items():
+            histories[p][w] = scored[(p, w)]
+            self._store_week_scores(p, w, stamp, scored[(p, w)])
+
+        for p in all_platoons:
+            if p in histories:
+                intel = self._assemble_platoon(
+                    p,
+                    target_week,
+                    current[p],
+                    scored[(p, target_week)],
+                    list(stamps_by_platoon[p]),
+                    histories[p],
+                    len(tanks_by_platoon[p]),
+                )
+            else:
+                intel = self._empty_platoon(p, target_week)
             display_name = intel.platoon
             platoon_intels[display_name] = intel
             comparison[display_name] = intel.readiness_score
@@ -177,22 +252,23 @@ class IntelligenceService:
         return standard
 
     def _is_gap(self, text: str) -> bool:
-        # Re-use logic or import? For speed, duplicating basic tokens
-        tokens = ["חסר", "אין", "תקול", "בלאי", "0"]
-        return any(t in text for t in tokens)
+        return self.tokens.is_gap(text)
 
     def _is_issue(self, text: str) -> bool:
-         # Anything not 'takin'
-         ok_tokens = ["תקין", "יש", "מלא"]
-         if any(t in text for t in ok_tokens): return False
-         return True
+        # Anything not 'takin'
+        return self.tokens.is_issue(text)
 
     def _score_dataframe(self, df: pd.DataFrame) -> List[TankScore]:
         """
         Scores all rows (tanks) in the provided dataframe.
         """
+        if df.empty:
+            return []
+        return self._score_records(df[["tank_id", "fields_json"]].to_dict("records"))
+
+    def _score_records(self, rows: Iterable[Mapping[str, Any]]) -> List[TankScore]:
         tank_scores: List[TankScore] = []
-        for _, row in df.iterrows():
+        for row in rows:
             tank_id = row.get("tank_id")
             if not tank_id:
                 continue
@@ -200,7 +276,7 @@ class IntelligenceService:
             tank_scores.append(score)
         return tank_scores
 
-    def _score_row(self, row: pd.Series) -> TankScore:
+    def _score_row(self, row: Mapping[str, Any]) -> TankScore:
         tank_id = row.get("tank_id")
         try:
             fields = json.loads(row.get("fields_json", "{}"))
@@ -261,17 +337,74 @@ class IntelligenceService:
         }
         return score
 
-    def _attach_trends_and_deltas(self, tank_scores: List[TankScore], df_all: pd.DataFrame, window: int = 8) -> List[TankScore]:
-        if df_all.empty:
+    def _scoring_fingerprint(self) -> str:
+        """
+        Hash of everything that shapes a TankScore; changing any of it retires cached scores.
+        """
+        config = asdict(self.engine.config)
+        config["critical_keywords"] = sorted(config["critical_keywords"])
+        payload = {
+            "config": config,
+            "standards": self.engine.standards,
+            "fields": self.mapper.config.model_dump(mode="json"),
+            "tokens": [self.tokens.gap_tokens, self.tokens.ok_tokens, sorted(self.tokens.exact_gap_tokens)],
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def _history_stamps(self, target_week: str, stamps: Dict[str, str]) -> Dict[str, str]:
+        """
+        Stamps of the weeks whose scores trends/deltas need: the trend window plus the
+        previous week, minus the target week (always scored fresh).
+        """
+        weeks = list(stamps)
+        needed = {*weeks[-self.TREND_WINDOW:], self._previous_week(target_week, weeks)}
+        return {w: stamps[w] for w in weeks if w in needed and w != target_week}
+
+    def _cached_week_scores(
+        self, platoon: str, stamps: Dict[str, str]
+    ) -> tuple[Dict[str, List[TankScore]], Dict[str, str]]:
+        """
+        (TankScores per cached week, {week: stamp} of the weeks that miss) for the scope;
+        an entry only hits while the week's stamp still matches.
+        """
+        cached = self.repo.db.get_tank_scores(self.repo.scope_key(platoon), self.config_hash, stamps)
+        hits = {w: [TankScore(**item) for item in json.loads(payload)] for w, payload in cached.items()}
+        return hits, {w: stamp for w, stamp in stamps.items() if w not in cached}
+
+    def _store_week_scores(self, platoon: str, week: str, stamp: str, scores: List[TankScore]) -> None:
+        payload = json.dumps([asdict(s) for s in scores], ensure_ascii=False, default=str)
+        self.repo.db.put_tank_scores(self.repo.scope_key(platoon), self.config_hash, week, stamp, payload)
+
+    def _score_partitions(self, partitions: Dict[tuple, pd.DataFrame], workers: Optional[int] = None) -> Dict[tuple, List[TankScore]]:
+        """
+        Scores each partition, in a process pool when there is enough work to pay for it.
+        """
+        records = {
+            key: df[["tank_id", "fields_json"]].to_dict("records") if not df.empty else []
+            for key, df in partitions.items()
+        }
+        workers = settings.intelligence.scoring_workers if workers is None else workers
+        workers = workers or _available_cpus()
+        total_rows = sum(len(r) for r in records.values())
+        if workers <= 1 or len(records) <= 1 or total_rows < settings.intelligence.parallel_min_rows:
+            return {key: self._score_records(rows) for key, rows in records.items()}
+        pool = _scoring_pool(min(workers, len(records)))
+        futures = {
+            key: pool.submit(_score_partition, self.config_hash, self.engine.config, self.engine.standards, rows)
+            for key, rows in records.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+    def _attach_trends_and_deltas(
+        self, tank_scores: List[TankScore], weeks: List[str], history_by_week: Dict[str, List[TankScore]]
+    ) -> List[TankScore]:
+        if not weeks:
             return tank_scores
-        # Gather weeks sorted ascending
-        weeks = sorted([w for w in df_all.get("week_label", []).dropna().unique()])
-        weeks = weeks[-window:] if window else weeks
         # Precompute scores per week per tank
         week_tank_scores: Dict[str, Dict[str, float]] = {}
         for w in weeks:
-            df_week = df_all[df_all["week_label"] == w]
-            for score in self._score_dataframe(df_week):
+            for score in history_by_week.get(w, []):
                 week_tank_scores.setdefault(score.tank_id, {})[w] = score.score
 
         for score in tank_scores:
@@ -285,10 +418,10 @@ class IntelligenceService:
                 score.deltas = {"overall": None}
         return tank_scores
 
-    def _previous_week(self, target_week: str, df_all: pd.DataFrame) -> Optional[str]:
-        if df_all.empty or "week_label" not in df_all.columns:
+    def _previous_week(self, target_week: str, weeks: List[str]) -> Optional[str]:
+        weeks = sorted(weeks)
+        if not weeks:
             return None
-        weeks = sorted([w for w in df_all["week_label"].dropna().unique()])
         if target_week not in weeks:
             return weeks[-1] if weeks else None
         idx = weeks.index(target_week)
@@ -310,3 +443,73 @@ def text_is_critical(text: str) -> bool:
     # Heuristic for veto words in free text
     criticals = ["מושבת", "תקלת ירי", "תקלת הנעה"]
     return any(c in text for c in criticals)
+
+
+def _available_cpus() -> int:
+    """
+    CPUs this process may actually use: affinity mask, capped by a cgroup v2 quota
+    (containers often see the host's CPU count).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as fh:
+            quota, period = fh.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(int(int(quota) / int(period)), 1))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _scoring_pool(workers: int) -> ProcessPoolExecutor:
+    # Shared across requests so worker start-up (and their imports) is paid once.
+    # The API process is threaded: forking it could copy a lock held by another thread
+    # (logging, SQLite pools), so workers come from a forkserver, or spawn where absent.
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method)
+            )
+        return pool
+
+
+def shutdown_scoring_pools(wait: bool = True) -> None:
+    """
+    Stops the shared scoring pools; the API lifespan calls this on shutdown.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Fallback for CLI use outside the API lifespan.
+atexit.register(shutdown_scoring_pools, wait=False)
+
+
+_worker_scorers: Dict[str, IntelligenceService] = {}
+
+
+def _score_partition(
+    config_hash: str, config: ScoringConfig, standards: dict, rows: List[Dict[str, Any]]
+) -> List[TankScore]:
+    """
+    Process-pool entry point: scores one platoon/week partition with a scorer built
+    once per worker for the given scoring config.
+    """
+    scorer = _worker_scorers.get(config_hash)
+    if scorer is None:
+        engine = ScoringEngine(config)
+        engine.standards = standards
+        scorer = _worker_scorers[config_hash] = IntelligenceService(repository=None, scoring_engine=engine)
+    return scorer._score_records(rows)
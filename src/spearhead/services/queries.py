@@ -4,10 +4,9 @@ from datetime import datetime, timedelta, UTC
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
-from spearhead.config import settings
-from spearhead.config_fields import field_config
 from spearhead.data.repositories import TabularRepository
 from spearhead.data.storage import Database
+from spearhead.logic.tokens import status_classifier
 
 
 class QueryService:
@@ -26,10 +25,7 @@ class QueryService:
                 raise ValueError("TabularRepository or Database is required")
             repository = TabularRepository(db=db)
         self.repo = repository
-        gap_source = settings.status_tokens.gap_tokens + field_config.gap_tokens
-        ok_source = settings.status_tokens.ok_tokens + field_config.ok_tokens
-        self.gap_tokens = tuple(dict.fromkeys(gap_source))
-        self.ok_tokens = tuple(dict.fromkeys(ok_source))
+        self.tokens = status_classifier()
 
     @staticmethod
     def _week_label_from_datetime(ts: datetime) -> str:
@@ -78,14 +74,7 @@ class QueryService:
         if df.empty:
             return []
 
-        counts = Counter()
-        # Iterate efficiently? 
-        # For simplicity and robust token matching:
-        for item, text in zip(df["item"], df["value_text"]):
-            if not isinstance(text, str):
-                continue
-            if any(token in text for token in self.gap_tokens):
-                counts[item] += 1
+        counts = Counter(df.loc[self.tokens.gap_mask(df["value_text"]), "item"])
 
         return [{"item": item, "gaps": cnt} for item, cnt in counts.most_common(top_n)]
 
@@ -299,10 +288,7 @@ class QueryService:
             return []
 
         # Gap counts
-        gap_counts = Counter()
-        for item, text in zip(df["item"], df["value_text"]):
-            if isinstance(text, str) and any(tok in text for tok in self.gap_tokens):
-                gap_counts[item] += 1
+        gap_counts = Counter(df.loc[self.tokens.gap_mask(df["value_text"]), "item"])
 
         # Numeric totals
         df["value_num"] = pd.to_numeric(df["value_num"], errors="coerce").fillna(0)
@@ -334,11 +320,9 @@ class QueryService:
             return []
 
         gap_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        for platoon, item, text in zip(df["platoon"], df["item"], df["value_text"]):
-            if not isinstance(text, str):
-                continue
-            if any(tok in text for tok in self.gap_tokens):
-                gap_counts[platoon][item] += 1
+        gaps = df.loc[self.tokens.gap_mask(df["value_text"])]
+        for platoon, item in zip(gaps["platoon"], gaps["item"]):
+            gap_counts[platoon][item] += 1
 
         results = []
         for platoon, items in gap_counts.items():
@@ -384,7 +368,7 @@ class QueryService:
             for _, row in hits.head(max(limit - len(results), 0)).iterrows():
                 val = row.get("resolved_value")
                 value_text = row.get("value_text") or ""
-                is_gap = any(tok in value_text for tok in self.gap_tokens) or (row.get("value_num") == 0)
+                is_gap = self.tokens.is_gap(value_text) or (row.get("value_num") == 0)
                 results.append(
                     {
                         "section": sec,
@@ -1,13 +1,17 @@
+import os
 import shutil
+import threading
 import time
 from pathlib import Path
 from typing import Optional, Protocol, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from google.auth.transport.requests import AuthorizedSession
 from google.oauth2 import service_account
 from google.oauth2.credentials import Credentials
 
+from spearhead.config import settings
 from spearhead.exceptions import ConfigError, DataSourceError
 
 class SheetsProvider(Protocol):
@@ -22,12 +26,35 @@ class SheetsProvider(Protocol):
         ...
 
 
+def link_or_copy(src: Path, dest: Path) -> Path:
+    """
+    Atomically makes `dest` a hard link to `src` (no bytes copied), falling back to a
+    copy across filesystems. Readers of `dest` never see a partial file.
+    """
+    src, dest = Path(src), Path(dest)
+    if dest.exists() and os.path.samefile(src, dest):
+        return dest
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{threading.get_ident()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+    return dest
+
+
 class GoogleSheetsProvider:
     """
     Downloads Google Sheets as XLSX using either a service account or API key.
+    Sessions are long-lived and share one connection pool, so repeated syncs reuse
+    keep-alive connections instead of paying a TLS handshake per sheet; bodies are
+    streamed to disk rather than buffered.
     """
 
     EXPORT_URL = "https://docs.google.com/spreadsheets/d/{file_id}/export"
+    CHUNK_BYTES = 1 << 16
 
     def __init__(
         self,
@@ -35,8 +62,16 @@ class GoogleSheetsProvider:
         api_key: Optional[str] = None,
         max_retries: int = 3,
         backoff_seconds: float = 1.0,
+        pool_size: int = 10,
+        timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
     ):
         self.api_key = api_key
+        read = settings.google.download_timeout_seconds if timeout is None else timeout
+        connect = settings.google.connect_timeout_seconds if connect_timeout is None else connect_timeout
+        # (connect, read) per socket operation, so a stalled download raises and frees its
+        # worker thread; SyncService's abandon-and-use-cache path is only the backstop.
+        self.timeout = (connect or None, read or None)
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
         self.creds = None
@@ -45,6 +80,29 @@ class GoogleSheetsProvider:
                 service_account_file,
                 scopes=["https://www.googleapis.com/auth/drive.readonly"],
             )
+        self._adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _session(self, mode: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(mode)
+            if session is None:
+                session = AuthorizedSession(self.creds) if mode == "service_account" else requests.Session()
+                self._mount(session)
+                self._sessions[mode] = session
+            return session
+
+    def _mount(self, session: requests.Session) -> requests.Session:
+        session.mount("https://", self._adapter)
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            session.close()
+        self._adapter.close()
 
     def download_sheet(
         self,
@@ -65,20 +123,24 @@ class GoogleSheetsProvider:
         if etag:
             headers["If-None-Match"] = etag
 
+        def fetch(session: requests.Session) -> requests.Response:
+            return session.get(url, params=params, headers=headers, stream=True, timeout=self.timeout)
+
         requesters: list[tuple[str, callable]] = []
 
         if user_token:
-            user_creds = Credentials(token=user_token)
-            user_session = AuthorizedSession(user_creds)
-            requesters.append(("user", lambda: user_session.get(url, params=params, headers=headers)))
+            # Tokens are per user, but the connection pool is shared.
+            user_session = self._mount(AuthorizedSession(Credentials(token=user_token)))
+            requesters.append(("user", lambda: fetch(user_session)))
 
         if self.creds:
-            sa_session = AuthorizedSession(self.creds)
-            requesters.append(("service_account", lambda: sa_session.get(url, params=params, headers=headers)))
+            sa_session = self._session("service_account")
+            requesters.append(("service_account", lambda: fetch(sa_session)))
         else:
             if self.api_key:
                 params["key"] = self.api_key
-            requesters.append(("api_key", lambda: requests.get(url, params=params, headers=headers)))
+            key_session = self._session("api_key")
+            requesters.append(("api_key", lambda: fetch(key_session)))
 
         if not requesters:
             raise ConfigError("No credentials or API key configured for Google Sheets.")
@@ -97,17 +159,26 @@ class GoogleSheetsProvider:
                     break
 
                 if resp.status_code == 304 and cache_path and cache_path.exists():
-                    shutil.copyfile(cache_path, dest)
+                    resp.close()
+                    link_or_copy(cache_path, dest)
                     return dest, True, etag, requester_name
 
                 if resp.status_code == 200:
                     new_etag = resp.headers.get("ETag")
-                    dest.write_bytes(resp.content)
+                    try:
+                        self._stream_to(resp, dest)
+                    except Exception as exc:  # connection dropped mid-body
+                        last_error = exc
+                        if attempt < self.max_retries - 1:
+                            time.sleep(self.backoff_seconds * (2**attempt))
+                            continue
+                        break
                     if cache_path:
-                        cache_path.parent.mkdir(parents=True, exist_ok=True)
-                        cache_path.write_bytes(resp.content)
+                        link_or_copy(dest, cache_path)
                     return dest, False, new_etag, requester_name
 
+                resp.close()
+
                 is_retryable = resp.status_code in {429, 500, 502, 503, 504}
                 should_fallback = resp.status_code in {401, 403}
                 last_error = DataSourceError(f"Failed to download sheet {file_id}: {resp.status_code}")
@@ -120,7 +191,20 @@ class GoogleSheetsProvider:
 
         # Fallback to cache if available
         if cache_path and cache_path.exists():
-            shutil.copyfile(cache_path, dest)
+            link_or_copy(cache_path, dest)
             return dest, True, etag, "cache"
 
         raise last_error or DataSourceError(f"Failed to download sheet {file_id}")
+
+    def _stream_to(self, resp, dest: Path) -> None:
+        """
+        Writes the body in chunks to a temp file renamed over `dest` once complete.
+        """
+        part = dest.with_name(f".{dest.name}.{threading.get_ident()}.part")
+        try:
+            with resp, open(part, "wb") as fh:
+                for chunk in resp.iter_content(chunk_size=self.CHUNK_BYTES):
+                    fh.write(chunk)
+            os.replace(part, dest)
+        finally:
+            part.unlink(missing_ok=True)
@@ -1,19 +1,26 @@
+import os
 import time
-import shutil
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union
 
 from spearhead.config import settings
 from spearhead.data.import_service import ImportService
-from spearhead.exceptions import ConfigError
-from spearhead.sync.provider import SheetsProvider
+from spearhead.exceptions import ConfigError, DataSourceError
+from spearhead.sync.provider import SheetsProvider, link_or_copy
 
 # Re-export SheetsProvider for backward compatibility if needed, though better to import from provider.py.
 # But SyncService uses it.
 
+# _download result, or the exception it raised
+Downloaded = Union[tuple[Path, bool, Optional[str], Optional[str]], Exception]
+
+
 class SyncService:
     """
     Syncs configured Google Sheets into the local import pipeline.
+    Form-response sheets download concurrently (bounded by `max_workers`, each capped at
+    `download_timeout` seconds); imports run on the calling thread as downloads complete.
     """
 
     def __init__(
@@ -22,11 +29,18 @@ class SyncService:
         provider: SheetsProvider,
         file_ids: dict[str, str],
         cache_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        download_timeout: Optional[float] = None,
+        tmp_dir: Optional[Path] = None,
     ):
         self.import_service = import_service
         self.provider = provider
         self.file_ids = file_ids
-        self.tmp_dir = Path(settings.paths.input_dir) / "sync_tmp"
+        self.max_workers = max(max_workers or settings.google.sync_concurrency, 1)
+        self.download_timeout = (
+            download_timeout if download_timeout is not None else settings.google.download_timeout_seconds
+        )
+        self.tmp_dir = Path(tmp_dir) if tmp_dir else Path(settings.paths.input_dir) / "sync_tmp"
         self.cache_dir = Path(cache_dir) if cache_dir else Path(settings.google.cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.status: dict[str, dict] = {}
@@ -64,22 +78,26 @@ class SyncService:
         overall_status = "ok"
         errors = []
 
+        sources: dict[str, tuple[str, str]] = {}
         for platoon_alias, fid in targets.items():
             # Use platoon alias in key for status tracking
             key = f"form_responses_{platoon_alias}"
             # Ensure _download can find the ID
-            self.file_ids[key] = fid 
-            
+            self.file_ids[key] = fid
+            sources[key] = (platoon_alias, fid)
+
+        for key, downloaded in self._download_concurrently(sources, user_token=user_token):
+            platoon_alias, fid = sources[key]
             try:
                 # If alias looks like a real name (not unknown_X), assume it is the platoon name
                 platoon_override = platoon_alias if not platoon_alias.startswith("unknown") else None
-                
-                inserted, _ = self._sync(
+
+                inserted, _ = self._import(
                     key,
                     lambda path: self.import_service.import_form_responses(
                         path, source_id=fid, platoon=platoon_override
                     ),
-                    user_token=user_token,
+                    downloaded,
                 )
                 total_inserted += inserted
             except Exception as e:
@@ -123,7 +141,65 @@ class SyncService:
 
     def _sync(self, key: str, import_fn, user_token: Optional[str] = None) -> tuple[int, bool]:
         try:
-            path, used_cache, etag, auth_mode = self._download(key, user_token=user_token)
+            downloaded: Downloaded = self._download(key, user_token=user_token)
+        except Exception as exc:
+            downloaded = exc
+        return self._import(key, import_fn, downloaded)
+
+    def _download_concurrently(self, keys: Iterable[str], user_token: Optional[str] = None) -> Iterator[tuple[str, Downloaded]]:
+        """
+        Runs _download for every key on a bounded thread pool and yields (key, result)
+        in completion order. A download still running after `download_timeout` seconds
+        is abandoned: it falls back to the cached copy if there is one, else to an error.
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        timeout = self.download_timeout or None
+        started: dict[str, float] = {}
+
+        def run(key: str):
+            started[key] = time.monotonic()
+            return self._download(key, user_token=user_token)
+
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(keys)), thread_name_prefix="sheets-sync")
+        try:
+            pending: dict[Future, str] = {pool.submit(run, key): key for key in keys}
+            while pending:
+                wait_for = timeout
+                if timeout:
+                    deadlines = [started[k] + timeout for k in pending.values() if k in started]
+                    if deadlines:
+                        wait_for = max(min(deadlines) - time.monotonic(), 0)
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    try:
+                        yield key, future.result()
+                    except Exception as exc:
+                        yield key, exc
+                if timeout:
+                    now = time.monotonic()
+                    for future, key in list(pending.items()):
+                        if key in started and now - started[key] >= timeout:
+                            del pending[future]
+                            yield key, self._timed_out(key, timeout)
+        finally:
+            # Abandoned downloads end on the provider's socket timeout; don't block the sync on them.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _timed_out(self, key: str, timeout: float) -> Downloaded:
+        # Import straight from the cache: the abandoned thread may still write to the tmp file.
+        cache_path = self.cache_dir / f"{key}.xlsx"
+        if cache_path.exists():
+            return cache_path, True, self.status.get(key, {}).get("etag"), "cache"
+        return DataSourceError(f"Timed out after {timeout:g}s downloading '{key}'")
+
+    def _import(self, key: str, import_fn, downloaded: Downloaded) -> tuple[int, bool]:
+        try:
+            if isinstance(downloaded, Exception):
+                raise downloaded
+            path, used_cache, etag, auth_mode = downloaded
             import zipfile
             try:
                 inserted = import_fn(path)
@@ -170,20 +246,47 @@ class SyncService:
             raise ConfigError(f"Google Sheets file_id is not configured for '{key}'.")
         dest = self.tmp_dir / f"{key}.xlsx"
         cache_path = self.cache_dir / f"{key}.xlsx"
-        etag = self.status.get(key, {}).get("etag")
+        etag = self.status.get(key, {}).get("etag") or self._load_etag(key)
         try:
             path, used_cache, new_etag, auth_mode = self.provider.download_sheet(
                 file_id, dest, cache_path=cache_path, etag=etag, user_token=user_token
             )
             if new_etag:
                 self.status.setdefault(key, {})["etag"] = new_etag
+                if not used_cache:
+                    self._save_etag(key, new_etag)
             return path, used_cache, new_etag or etag, auth_mode
         except Exception:
             if cache_path.exists():
-                shutil.copyfile(cache_path, dest)
+                link_or_copy(cache_path, dest)
                 return dest, True, etag, "cache"
             raise
 
+    def _etag_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.etag"
+
+    def _load_etag(self, key: str) -> Optional[str]:
+        """
+        ETag persisted alongside the cached copy, so restarts still send If-None-Match.
+        Only trusted while the cached file it describes exists (a 304 needs it).
+        """
+        if not (self.cache_dir / f"{key}.xlsx").exists():
+            return None
+        try:
+            return self._etag_path(key).read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+
+    def _save_etag(self, key: str, etag: str) -> None:
+        path = self._etag_path(key)
+        tmp = path.with_suffix(".etag.tmp")
+        try:
+            tmp.write_text(etag, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to persist etag for {key}", exc_info=True)
+
     def _update_status(
         self,
         key: str,
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from openpyxl import load_workbook
+
+from spearhead.config import settings
+from spearhead.data.storage import Database
+from spearhead.v1.models import FormEventV2
+from spearhead.v1.parser import FormResponseParserV2
+from spearhead.v1.service import ResponseIngestionServiceV2, ResponseQueryServiceV2
+from spearhead.v1.store import ResponseStore
+from spearhead.v1.worker import reconcile_snapshots
+
+logger = logging.getLogger(__name__)
+
+
+def iter_xlsx_events(
+    path: Path, source_id: Optional[str] = None, after_row: int = 0
+) -> Iterator[tuple[int, FormEventV2]]:
+    """
+    Streams (sheet row number, event) from the active sheet of a Google Forms export.
+    The first row is headers. Read-only mode keeps memory flat regardless of file size.
+    Event ids are left to the ingestion service (deterministic over source_id + payload),
+    so re-running a file never duplicates responses.
+    """
+    source = source_id or path.stem  # the file name is what platoon inference keys on
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        for row_number, row in enumerate(rows, start=2):
+            if row_number <= after_row:
+                continue
+            if all(cell is None or str(cell).strip() == "" for cell in row):
+                continue
+            payload = {header: value for header, value in zip(headers, row) if header}
+            yield row_number, FormEventV2(
+                schema_version="v2",
+                source_id=source,
+                payload=FormResponseParserV2._normalize_payload(payload),
+            )
+    finally:
+        workbook.close()
+
+
+def _load_checkpoint(path: Path) -> dict[str, int]:
+    try:
+        return {str(k): int(v) for k, v in json.loads(path.read_text(encoding="utf-8")).items()}
+    except FileNotFoundError:
+        return {}
+    except (ValueError, AttributeError) as exc:
+        raise ValueError(f"Unreadable checkpoint {path}: {exc}") from exc
+
+
+def _save_checkpoint(path: Path, state: dict[str, int]) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def backfill_xlsx(
+    db: Database,
+    paths: Iterable[Path],
+    batch_size: Optional[int] = None,
+    checkpoint_path: Optional[Path] = None,
+    resume: bool = False,
+    source_id: Optional[str] = None,
+    progress: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> dict[str, Any]:
+    """
+    Bulk-loads historical XLSX exports through the v1 batch ingestion path.
+
+    Each batch is one write transaction; snapshots and the trends rollup are not touched
+    per batch but rebuilt once at the end by an incremental reconcile of the weeks that changed.
+    After every committed batch the last sheet row per file is checkpointed, so
+    `resume=True` continues where an interrupted run stopped.
+    """
+    batch_size = max(batch_size or settings.v1.max_batch_events, 1)
+    store = ResponseStore(db=db)
+    ingestion = ResponseIngestionServiceV2(
+        store=store,
+        parser=FormResponseParserV2(),
+        metrics=ResponseQueryServiceV2(store=store),
+        defer_snapshots=True,
+    )
+    checkpoint = _load_checkpoint(checkpoint_path) if checkpoint_path and resume else {}
+
+    totals = {"files": 0, "rows": 0, "created": 0, "duplicates": 0, "errors": 0}
+    started = time.perf_counter()
+    for path in paths:
+        path = Path(path)
+        key = str(path.resolve())
+        totals["files"] += 1
+        events = iter_xlsx_events(path, source_id=source_id, after_row=checkpoint.get(key, 0))
+        for batch in _batches(events, batch_size):
+            reports = ingestion.ingest_batch([event for _, event in batch])
+            totals["rows"] += len(reports)
+            totals["errors"] += sum(1 for r in reports if r.error)
+            totals["created"] += sum(1 for r in reports if r.created and not r.error)
+            totals["duplicates"] += sum(1 for r in reports if not r.created)
+
+            checkpoint[key] = batch[-1][0]
+            if checkpoint_path:
+                _save_checkpoint(checkpoint_path, checkpoint)
+            if progress:
+                rate = totals["rows"] / max(time.perf_counter() - started, 1e-9)
+                progress({**totals, "file": path.name, "row": checkpoint[key], "rows_per_sec": round(rate, 1)})
+
+    reconcile = reconcile_snapshots(db)
+    elapsed = time.perf_counter() - started
+    result = {
+        **totals,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round(totals["rows"] / elapsed, 1) if elapsed else 0.0,
+        "reconciled_weeks": reconcile["reconciled_weeks"],
+    }
+    logger.info("xlsx backfill complete", extra=result)
+    return result
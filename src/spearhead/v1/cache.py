@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+import numpy as np
+
+from spearhead.data.field_mapper import FieldMapper
+from spearhead.logic.tokens import TokenClassifier
+
+
+def _strings_nbytes(values: Iterable[Any]) -> int:
+    return sum(sys.getsizeof(v) for v in values)
+
+
+@dataclass(frozen=True)
+class ColumnarWeek:
+    """
+    One week of normalized responses, dictionary-encoded.
+
+    Rows keep the list_normalized order (received_at DESC). Each payload field is one
+    entry of the long fact arrays (`fact_row`, `fact_header`, `fact_value`), pointing
+    into per-week dictionaries of headers and distinct values. Everything derived from
+    a header (family/item) or a value (gap verdict, lowercase text) is computed once per
+    dictionary entry, so queries are bincounts and masks over integer codes.
+    """
+
+    week_id: str
+    stamp: Hashable
+    event_ids: np.ndarray
+    platoons: list[str]
+    platoon_codes: np.ndarray
+    tanks: list[str]
+    tank_codes: np.ndarray
+    fact_row: np.ndarray
+    fact_header: np.ndarray
+    fact_value: np.ndarray
+    headers: list[str]
+    header_family: np.ndarray
+    header_item: np.ndarray
+    families: list[str]
+    items: list[str]
+    values: list[Any]
+    value_text: list[str]
+    value_is_gap: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        week_id: str,
+        rows: list[dict[str, Any]],
+        mapper: FieldMapper,
+        tokens: TokenClassifier,
+        stamp: Hashable = None,
+    ) -> "ColumnarWeek":
+        platoon_index: dict[str, int] = {}
+        tank_index: dict[str, int] = {}
+        header_index: dict[str, int] = {}
+        value_index: dict[tuple[str, Any], int] = {}
+        values: list[Any] = []
+        platoon_codes = np.empty(len(rows), dtype=np.int32)
+        tank_codes = np.empty(len(rows), dtype=np.int32)
+        fact_row: list[int] = []
+        fact_header: list[int] = []
+        fact_value: list[int] = []
+
+        for i, row in enumerate(rows):
+            platoon = row.get("platoon_key") or "Unknown"
+            platoon_codes[i] = platoon_index.setdefault(platoon, len(platoon_index))
+            tank_codes[i] = tank_index.setdefault(row.get("tank_id") or "", len(tank_index))
+            for field_name, value in row.get("fields", {}).items():
+                # Type is part of the key: 0 and "0" are different stored values.
+                key = (type(value).__name__, value if isinstance(value, Hashable) else str(value))
+                code = value_index.get(key)
+                if code is None:
+                    code = len(values)
+                    value_index[key] = code
+                    values.append(value)
+                fact_row.append(i)
+                fact_header.append(header_index.setdefault(field_name, len(header_index)))
+                fact_value.append(code)
+
+        headers = list(header_index)
+        family_index: dict[str, int] = {}
+        item_index: dict[str, int] = {}
+        header_family = np.empty(len(headers), dtype=np.int32)
+        header_item = np.empty(len(headers), dtype=np.int32)
+        for h, header in enumerate(headers):
+            match = mapper.match_header(header)
+            family = match.family if match and match.family else "other"
+            item = match.item if match and match.item else header
+            header_family[h] = family_index.setdefault(family, len(family_index))
+            header_item[h] = item_index.setdefault(item, len(item_index))
+
+        return cls(
+            week_id=week_id,
+            stamp=stamp,
+            event_ids=np.array([row["event_id"] for row in rows], dtype=object),
+            platoons=list(platoon_index),
+            platoon_codes=platoon_codes,
+            tanks=list(tank_index),
+            tank_codes=tank_codes,
+            fact_row=np.array(fact_row, dtype=np.int32),
+            fact_header=np.array(fact_header, dtype=np.int32),
+            fact_value=np.array(fact_value, dtype=np.int32),
+            headers=headers,
+            header_family=header_family,
+            header_item=header_item,
+            families=list(family_index),
+            items=list(item_index),
+            values=values,
+            value_text=[str(v).lower() for v in values],
+            value_is_gap=np.fromiter((tokens.is_gap(v) for v in values), dtype=bool, count=len(values)),
+        )
+
+    @cached_property
+    def nbytes(self) -> int:
+        arrays = (
+            self.event_ids,
+            self.platoon_codes,
+            self.tank_codes,
+            self.fact_row,
+            self.fact_header,
+            self.fact_value,
+            self.header_family,
+            self.header_item,
+            self.value_is_gap,
+        )
+        strings = (
+            _strings_nbytes(self.event_ids)
+            + _strings_nbytes(self.platoons)
+            + _strings_nbytes(self.tanks)
+            + _strings_nbytes(self.headers)
+            + _strings_nbytes(self.families)
+            + _strings_nbytes(self.items)
+            + _strings_nbytes(self.values)
+            + _strings_nbytes(self.value_text)
+        )
+        return sum(a.nbytes for a in arrays) + strings
+
+    # ---- masks ----
+    def row_mask(self, platoon_key: Optional[str]) -> np.ndarray:
+        if not platoon_key:
+            return np.ones(len(self.platoon_codes), dtype=bool)
+        wanted = platoon_key.lower()
+        matching = np.array([p.lower() == wanted for p in self.platoons], dtype=bool)
+        if not len(matching):
+            return np.zeros(len(self.platoon_codes), dtype=bool)
+        return matching[self.platoon_codes]
+
+    def gap_facts(self, row_mask: np.ndarray) -> np.ndarray:
+        return self.value_is_gap[self.fact_value] & row_mask[self.fact_row]
+
+
+class WeekCache:
+    """
+    Process-local LRU of ColumnarWeek entries bounded by an approximate byte budget.
+
+    Entries are validated against a cheap per-week stamp from the store on every read,
+    so writes from other processes are picked up; in-process writes also invalidate
+    eagerly through the store's write listeners. A generation counter per week keeps a
+    load that raced with an invalidation from being cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(int(max_bytes), 0)
+        self._entries: "OrderedDict[str, ColumnarWeek]" = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        week_id: str,
+        stamp: Hashable,
+        loader: Callable[[], ColumnarWeek],
+    ) -> ColumnarWeek:
+        with self._lock:
+            entry = self._entries.get(week_id)
+            if entry is not None and entry.stamp == stamp:
+                self._entries.move_to_end(week_id)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            generation = self._generations.get(week_id, 0)
+
+        entry = loader()
+        with self._lock:
+            if self._generations.get(week_id, 0) == generation:
+                self._store(week_id, entry)
+        return entry
+
+    def _store(self, week_id: str, entry: ColumnarWeek) -> None:
+        size = entry.nbytes
+        if size > self.max_bytes:
+            self._drop(week_id)
+            return
+        self._drop(week_id)
+        self._entries[week_id] = entry
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+    def _drop(self, week_id: str) -> None:
+        entry = self._entries.pop(week_id, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def invalidate(self, week_ids: Iterable[str]) -> None:
+        with self._lock:
+            for week_id in week_ids:
+                self._generations[week_id] = self._generations.get(week_id, 0) + 1
+                self._drop(week_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            for week_id in list(self._entries):
+                self._generations[week_id] = self._generations.get(week_id, 0) + 1
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __contains__(self, week_id: str) -> bool:
+        return week_id in self._entries
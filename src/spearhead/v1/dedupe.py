@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+from typing import Iterable
+
+
+class EventIdFilter:
+    """
+    Bloom-style membership filter for recently seen event ids.
+    `might_contain` never returns False for an id that was added (while it is still
+    within the retained window), so a negative answer lets callers skip the
+    duplicate lookup. Positives may be false and must be confirmed against the store.
+
+    Two generations are kept: once the current one holds `capacity` ids it becomes
+    the previous one, so memory stays bounded and the window covers the most recent
+    `capacity`..`2 * capacity` ids.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01):
+        self.capacity = max(int(capacity), 1)
+        error_rate = min(max(float(error_rate), 1e-6), 0.5)
+        self._bits = max(int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self._hashes = max(int(round(self._bits / self.capacity * math.log(2))), 1)
+        self._lock = threading.Lock()
+        self._current = bytearray((self._bits + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._count = 0
+
+    def _positions(self, event_id: str) -> list[int]:
+        # Kirsch-Mitzenmacher: derive k positions from two 64-bit halves of one digest.
+        digest = hashlib.blake2b(event_id.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._bits for i in range(self._hashes)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: list[int]) -> bool:
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+    def add(self, event_id: str) -> None:
+        positions = self._positions(event_id)
+        with self._lock:
+            if self._count >= self.capacity:
+                self._previous = self._current
+                self._current = bytearray(len(self._previous))
+                self._count = 0
+            for pos in positions:
+                self._current[pos >> 3] |= 1 << (pos & 7)
+            self._count += 1
+
+    def update(self, event_ids: Iterable[str]) -> None:
+        for event_id in event_ids:
+            self.add(event_id)
+
+    def might_contain(self, event_id: str) -> bool:
+        positions = self._positions(event_id)
+        with self._lock:
+            return self._test(self._current, positions) or self._test(self._previous, positions)
+
+    def __contains__(self, event_id: str) -> bool:
+        return self.might_contain(event_id)
@@ -59,3 +59,4 @@ class IngestionReportV2(BaseModel):
     week_id: Optional[str] = None
     platoon_key: Optional[str] = None
     unmapped_fields: list[str] = Field(default_factory=list)
+    error: Optional[str] = None  # set for batch events that were rejected into the DLQ
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from typing import Any, Optional, Sequence
+
+
+class InvalidPageRequest(ValueError):
+    """
+    Unknown sort field, or a cursor that is malformed or belongs to another query.
+    """
+
+
+def parse_sort(sort: Optional[str], allowed: Sequence[str], default: str) -> tuple[str, bool]:
+    """
+    "gaps" / "-gaps" -> ("gaps", descending).
+    """
+    spec = (sort or default).strip()
+    descending = spec.startswith("-")
+    name = spec.lstrip("+-")
+    if name not in allowed:
+        raise InvalidPageRequest(f"Unsupported sort '{spec}'; expected one of {', '.join(allowed)}")
+    return name, descending
+
+
+def fingerprint(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(query: str, week_id: Optional[str], key: Sequence[Any]) -> str:
+    """
+    Opaque cursor: the sort key of the last row served, pinned to its query and week.
+    """
+    raw = json.dumps(
+        {"q": query, "w": week_id, "k": list(key)},
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=lambda v: v.item() if hasattr(v, "item") else str(v),  # numpy scalars from pandas rows
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, query: str) -> tuple[Optional[str], list[Any]]:
+    """
+    Returns (week_id, key) of a cursor produced by encode_cursor for the same query.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        week_id, key = payload["w"], payload["k"]
+        matches = payload["q"] == query
+    except (ValueError, TypeError, KeyError):
+        raise InvalidPageRequest("Malformed cursor")
+    if not matches or not isinstance(key, list):
+        raise InvalidPageRequest("Cursor does not belong to this query")
+    return week_id, key
+
+
+def keyset_predicate(columns: Sequence[tuple[str, bool]], key: Sequence[Any]) -> tuple[str, list[Any]]:
+    """
+    SQL for "row sorts strictly after `key`" under ORDER BY `columns` ((expr, descending), ...),
+    expanded lexicographically so mixed directions still use plain comparisons. The redundant
+    leading bound on the first column gives SQLite a range to seek an index with.
+    """
+    if len(key) != len(columns):
+        raise InvalidPageRequest("Cursor does not match the sort order")
+    lead, lead_descending = columns[0]
+    clauses: list[str] = []
+    params: list[Any] = [key[0]]
+    for i, (expr, descending) in enumerate(columns):
+        equal = [f"{prev} = ?" for prev, _ in columns[:i]]
+        clauses.append("(" + " AND ".join([*equal, f"{expr} {'<' if descending else '>'} ?"]) + ")")
+        params.extend([*key[:i], key[i]])
+    bound = f"{lead} {'<=' if lead_descending else '>='} ?"
+    return f"({bound} AND (" + " OR ".join(clauses) + "))", params
+
+
+def order_by(columns: Sequence[tuple[str, bool]]) -> str:
+    return ", ".join(f"{expr} {'DESC' if descending else 'ASC'}" for expr, descending in columns)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import argparse
 import json
 import logging
+from typing import Optional
 
 from spearhead.config import settings
 from spearhead.data.storage import Database
@@ -10,12 +12,16 @@ from spearhead.v1.worker import reconcile_snapshots
 logger = logging.getLogger(__name__)
 
 
-def main() -> int:
+def main(workers: Optional[int] = None, full: bool = False) -> int:
     db = Database(settings.paths.db_path)
-    result = reconcile_snapshots(db)
+    result = reconcile_snapshots(db, workers=workers, full=full)
     print(json.dumps(result, ensure_ascii=False))
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    parser = argparse.ArgumentParser(description="Rebuild v1 read-model snapshots.")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for per-week aggregation")
+    parser.add_argument("--full", action="store_true", help="Rebuild facts and every week, not just changed weeks")
+    args = parser.parse_args()
+    raise SystemExit(main(workers=args.workers, full=args.full))
@@ -2,32 +2,85 @@ from __future__ import annotations
 
 import hashlib
 import json
+import sqlite3
 from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+import numpy as np
 
 from spearhead.config import settings
-from spearhead.config_fields import field_config
 from spearhead.data.field_mapper import FieldMapper
+from spearhead.logic.tokens import status_classifier
+from spearhead.v1.cache import ColumnarWeek, WeekCache
+from spearhead.v1.dedupe import EventIdFilter
 from spearhead.v1.models import FormEventV2, IngestionReportV2, MetricSnapshotV2, NormalizedResponseV2
+from spearhead.v1.paging import decode_cursor, encode_cursor, fingerprint, parse_sort
 from spearhead.v1.parser import EventValidationError, FormResponseParserV2
+from spearhead.v1.snapshots import EXTRA_GAP_TOKENS
 from spearhead.v1.store import ResponseStore
 
 
+@dataclass
+class _RowDelta:
+    """Contribution of a single new response to the week snapshots."""
+
+    platoon_key: str
+    tank_id: str
+    gaps: int
+    families: Counter[str] = field(default_factory=Counter)
+    new_in_week: bool = False
+    new_in_platoon: bool = False
+
+
+class _StaleDedupeFilter(Exception):
+    """Raised inside a batch transaction when an id the filter called fresh already exists."""
+
+
 class ResponseIngestionServiceV2:
-    def __init__(self, store: ResponseStore, parser: FormResponseParserV2, metrics: "ResponseQueryServiceV2"):
+    def __init__(
+        self,
+        store: ResponseStore,
+        parser: FormResponseParserV2,
+        metrics: "ResponseQueryServiceV2",
+        incremental: Optional[bool] = None,
+        seen_filter: Optional[EventIdFilter] = None,
+        defer_snapshots: bool = False,
+    ):
         self.store = store
         self.parser = parser
         self.metrics = metrics
+        self.incremental = settings.v1.incremental_snapshots if incremental is None else incremental
+        # Bulk loaders leave snapshots and the trends rollup alone and reconcile the touched
+        # weeks once at the end.
+        self.defer_snapshots = defer_snapshots
+        if seen_filter is None:
+            seen_filter = EventIdFilter(
+                capacity=settings.v1.dedupe_filter_capacity,
+                error_rate=settings.v1.dedupe_filter_error_rate,
+            )
+            # Oldest first so the newest ids land in the current generation.
+            seen_filter.update(reversed(store.recent_event_ids(seen_filter.capacity)))
+        self.seen = seen_filter
 
-    def ingest_event(self, event: FormEventV2) -> IngestionReportV2:
+    @staticmethod
+    def _identify(event: FormEventV2) -> str:
+        """
+        Assigns the deterministic event_id (if the caller did not) and returns the payload hash.
+        """
         payload_hash = hashlib.sha256(
             json.dumps(event.payload, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
         ).hexdigest()
-        event_id = event.event_id or hashlib.sha256(
+        event.event_id = event.event_id or hashlib.sha256(
             f"{event.schema_version}|{event.source_id}|{payload_hash}".encode("utf-8")
         ).hexdigest()
-        event.event_id = event_id
+        return payload_hash
+
+    def ingest_event(self, event: FormEventV2) -> IngestionReportV2:
+        payload_hash = self._identify(event)
+        event_id = event.event_id
+        maybe_seen = self.seen.might_contain(event_id)
 
         created = self.store.upsert_raw_event(
             event_id=event_id,
@@ -37,29 +90,40 @@ class ResponseIngestionServiceV2:
             payload_hash=payload_hash,
             payload=event.payload,
         )
+        self.seen.add(event_id)
         if not created:
-            existing = self.store.list_normalized()
-            week_id = None
-            platoon_key = None
-            for item in existing:
-                if item["event_id"] == event_id:
-                    week_id = item["week_id"]
-                    platoon_key = item["platoon_key"]
-                    break
+            existing = self.store.get_normalized_by_event_id(event_id)
             return IngestionReportV2(
                 event_id=event_id,
                 created=False,
                 schema_version=event.schema_version,
                 source_id=event.source_id,
-                week_id=week_id,
-                platoon_key=platoon_key,
+                week_id=existing["week_id"] if existing else None,
+                platoon_key=existing["platoon_key"] if existing else None,
             )
 
         try:
             normalized = self.parser.parse(event)
-            self.store.upsert_normalized(normalized)
-            self.store.mark_event_status(event_id, status="processed")
-            self.metrics.refresh_snapshots(week_id=normalized.week_id, platoon_key=normalized.platoon_key)
+            with self.store.transaction() as conn:
+                # Replacing an existing row cannot be expressed as a delta; recompute instead.
+                # Ids the filter has never seen cannot have a normalized row, so skip the probe.
+                replacing = maybe_seen and self.store.has_rows(event_id=event_id, conn=conn)
+                fold = self.incremental and not replacing and not self.defer_snapshots
+                if fold:
+                    self.metrics.apply_responses([normalized], conn=conn)
+                facts = self.metrics.field_facts(normalized)
+                # Deferred writes leave the rollup to the reconcile that follows them.
+                stale: list[str] = []
+                if replacing and not self.defer_snapshots:
+                    stale = [normalized.week_id]
+                elif not self.defer_snapshots:
+                    stale = self.store.fold_rollup([normalized], facts, conn=conn)
+                self.store.upsert_normalized(normalized, conn=conn)
+                self.store.replace_field_facts([event_id], facts, conn=conn)
+                self.store.refresh_rollup(stale, conn=conn)
+                self.store.mark_event_status(event_id, status="processed", conn=conn)
+            if not fold and not self.defer_snapshots:
+                self.metrics.refresh_snapshots(week_id=normalized.week_id, platoon_key=normalized.platoon_key)
             return IngestionReportV2(
                 event_id=event_id,
                 created=True,
@@ -78,13 +142,220 @@ class ResponseIngestionServiceV2:
             self.store.insert_dlq(event_id=event_id, source_id=event.source_id, payload=event.payload, error_detail=str(exc))
             raise
 
+    def ingest_batch(self, events: list[FormEventV2]) -> list[IngestionReportV2]:
+        """
+        Ingests many events with one dedupe query and one write transaction.
+        Unlike ingest_event, invalid events do not raise: they go to the DLQ and
+        their report carries `error`. Snapshots are touched once per batch.
+        """
+        fresh: dict[str, tuple[FormEventV2, str]] = {}
+        for event in events:
+            payload_hash = self._identify(event)
+            fresh.setdefault(event.event_id, (event, payload_hash))
+        if not fresh:
+            return []
+
+        # Only ids the filter may have seen need the existence query. Another process can
+        # still have written an id we call fresh; the raw insert count catches that and
+        # the batch is replanned against the store for every id.
+        candidates = [event_id for event_id in fresh if self.seen.might_contain(event_id)]
+        try:
+            reports, normalized = self._write_batch(events, fresh, self.store.find_existing_events(candidates))
+        except _StaleDedupeFilter:
+            reports, normalized = self._write_batch(events, fresh, self.store.find_existing_events(fresh))
+        self.seen.update(fresh)
+
+        if not self.incremental and not self.defer_snapshots:
+            affected: dict[str, set[str]] = defaultdict(set)
+            for response in normalized:
+                affected[response.week_id].add(response.platoon_key)
+            for week_id, platoons in affected.items():
+                # One platoon: refresh just its tank snapshot; otherwise every platoon of the week.
+                only = next(iter(platoons)) if len(platoons) == 1 else None
+                self.metrics.refresh_snapshots(week_id=week_id, platoon_key=only)
+        return reports
+
+    def _write_batch(
+        self,
+        events: list[FormEventV2],
+        fresh: dict[str, tuple[FormEventV2, str]],
+        existing: dict[str, tuple[Optional[str], Optional[str]]],
+    ) -> tuple[list[IngestionReportV2], list[NormalizedResponseV2]]:
+        planned: dict[str, IngestionReportV2] = {}
+        raw_rows: list[dict[str, Any]] = []
+        dlq_rows: list[dict[str, Any]] = []
+        normalized: list[NormalizedResponseV2] = []
+        for event_id, (event, payload_hash) in fresh.items():
+            report = IngestionReportV2(
+                event_id=event_id,
+                created=event_id not in existing,
+                schema_version=event.schema_version,
+                source_id=event.source_id,
+            )
+            planned[event_id] = report
+            if not report.created:
+                report.week_id, report.platoon_key = existing[event_id]
+                continue
+
+            raw = {
+                "event_id": event_id,
+                "schema_version": event.schema_version,
+                "source_id": event.source_id,
+                "received_at": event.received_at,
+                "payload_hash": payload_hash,
+                "payload": event.payload,
+                "status": "processed",
+            }
+            try:
+                response = self.parser.parse(event)
+            except Exception as exc:
+                raw["status"] = "invalid" if isinstance(exc, EventValidationError) else "failed"
+                raw["error_detail"] = str(exc)
+                report.error = str(exc)
+                report.unmapped_fields = getattr(exc, "unmapped_fields", [])
+                dlq_rows.append(
+                    {
+                        "event_id": event_id,
+                        "source_id": event.source_id,
+                        "payload": event.payload,
+                        "error_detail": str(exc),
+                    }
+                )
+            else:
+                normalized.append(response)
+                report.week_id = response.week_id
+                report.platoon_key = response.platoon_key
+                report.unmapped_fields = response.unmapped_fields
+            raw_rows.append(raw)
+
+        if raw_rows:
+            with self.store.transaction() as conn:
+                if self.store.insert_raw_events(raw_rows, conn=conn) != len(raw_rows):
+                    raise _StaleDedupeFilter()  # rolls the transaction back
+                if self.incremental and not self.defer_snapshots and normalized:
+                    self.metrics.apply_responses(normalized, conn=conn)
+                facts = [fact for response in normalized for fact in self.metrics.field_facts(response)]
+                stale = [] if self.defer_snapshots else self.store.fold_rollup(normalized, facts, conn=conn)
+                self.store.upsert_normalized_many(normalized, conn=conn)
+                self.store.replace_field_facts([response.event_id for response in normalized], facts, conn=conn)
+                self.store.refresh_rollup(stale, conn=conn)
+                self.store.insert_dlq_many(dlq_rows, conn=conn)
+
+        # In-batch repeats of an id are reported as duplicates of its first occurrence.
+        reports: list[IngestionReportV2] = []
+        emitted: set[str] = set()
+        for event in events:
+            first = planned[event.event_id]
+            if event.event_id in emitted:
+                first = first.model_copy(update={"created": False, "error": None, "unmapped_fields": []})
+            emitted.add(event.event_id)
+            reports.append(first)
+        return reports, normalized
+
 
 class ResponseQueryServiceV2:
-    def __init__(self, store: ResponseStore):
+    def __init__(
+        self,
+        store: ResponseStore,
+        use_facts: Optional[bool] = None,
+        week_cache: Optional[WeekCache] = None,
+    ):
         self.store = store
         self._mapper = FieldMapper()
-        gap_source = settings.status_tokens.gap_tokens + field_config.gap_tokens + ["אין", "חסר", "בלאי", "0"]
-        self.gap_tokens = tuple(dict.fromkeys(gap_source))
+        self.tokens = status_classifier(EXTRA_GAP_TOKENS)
+        self.use_facts = settings.v1.facts_queries if use_facts is None else use_facts
+        # Facts feed both the facts aggregations and the trends rollup.
+        self.backfill_field_facts()
+        self.store.refresh_rollup(self.store.list_weeks_missing_rollup())
+        if week_cache is None and settings.v1.week_cache_mb > 0:
+            week_cache = WeekCache(settings.v1.week_cache_mb * 1024 * 1024)
+        self.week_cache = week_cache
+        if self.week_cache is not None:
+            self.store.add_write_listener(self.week_cache.invalidate)
+        # What shapes payloads besides the data; part of the v1 ETag, so a deploy or
+        # config change retires validators that data_generation() alone would keep.
+        self.config_fingerprint = fingerprint(
+            settings.app.version,
+            self._mapper.config.model_dump(mode="json"),
+            [self.tokens.gap_tokens, self.tokens.ok_tokens, sorted(self.tokens.exact_gap_tokens)],
+            self.use_facts,
+            self.week_cache is not None,
+        )
+
+    def _columnar(self, week_id: str) -> Optional[ColumnarWeek]:
+        if self.week_cache is None:
+            return None
+        # Read the stamp before the rows: a write landing in between only makes the entry look stale.
+        stamp = self.store.week_stamp(week_id)
+        return self.week_cache.get(
+            week_id,
+            stamp,
+            lambda: ColumnarWeek.build(
+                week_id,
+                self.store.list_normalized(week_id=week_id),
+                self._mapper,
+                self.tokens,
+                stamp=stamp,
+            ),
+        )
+
+    def field_facts(self, response: NormalizedResponseV2) -> list[tuple]:
+        """
+        Long-format rows for normalized_field_facts_v2: one per payload field, with the
+        same family/item/gap resolution the row-scanning aggregations use.
+        """
+        platoon = response.platoon_key or "Unknown"
+        rows = []
+        for field_name, value in response.fields.items():
+            match = self._mapper.match_header(field_name)
+            rows.append(
+                (
+                    response.event_id,
+                    response.week_id,
+                    platoon,
+                    response.tank_id,
+                    match.family if match and match.family else "other",
+                    match.item if match and match.item else field_name,
+                    field_name,
+                    int(self._is_gap(value)),
+                    self._numeric(value),
+                )
+            )
+        return rows
+
+    def backfill_field_facts(self, batch_size: int = 5000) -> int:
+        """
+        Writes facts for normalized rows that predate the facts table. Returns rows processed.
+        """
+        total = 0
+        while True:
+            pending = self.store.list_normalized_missing_facts(limit=batch_size)
+            if not pending:
+                return total
+            responses = [NormalizedResponseV2(**row) for row in pending]
+            self.store.replace_field_facts(
+                [r.event_id for r in responses],
+                (fact for r in responses for fact in self.field_facts(r)),
+            )
+            total += len(responses)
+
+    def rebuild_field_facts(self, batch_size: int = 5000) -> int:
+        """
+        Recomputes every fact, e.g. after status tokens or header aliases changed.
+        Works page by page so readers never see an emptied table.
+        """
+        total = 0
+        last_id = 0
+        while True:
+            page, last_id = self.store.list_normalized_page(after_id=last_id, limit=batch_size)
+            if not page:
+                return total
+            responses = [NormalizedResponseV2(**row) for row in page]
+            self.store.replace_field_facts(
+                [r.event_id for r in responses],
+                (fact for r in responses for fact in self.field_facts(r)),
+            )
+            total += len(responses)
 
     def refresh_snapshots(self, week_id: Optional[str], platoon_key: Optional[str]) -> None:
         target_week = week_id or self.latest_week()
@@ -113,6 +384,138 @@ class ResponseQueryServiceV2:
             for platoon in platoons.keys():
                 self._refresh_tank_snapshot(target_week, platoon)
 
+    def apply_responses(self, responses: list[NormalizedResponseV2], conn: sqlite3.Connection) -> None:
+        """
+        Folds new responses into the stored week snapshots as deltas.
+        Must run inside the ingest transaction *before* the responses are stored,
+        so the existence probes below still see the pre-ingest state.
+        Snapshots that cannot be folded are dropped and recomputed lazily on read.
+        """
+        by_week: dict[str, list[NormalizedResponseV2]] = defaultdict(list)
+        for response in responses:
+            by_week[response.week_id].append(response)
+
+        for week_id, week_responses in by_week.items():
+            deltas = self._row_deltas(week_id, week_responses, conn)
+            self._fold_overview(week_id, None, deltas, conn)
+
+            by_platoon: dict[str, list[_RowDelta]] = defaultdict(list)
+            for delta in deltas:
+                by_platoon[delta.platoon_key].append(delta)
+            for platoon, platoon_deltas in by_platoon.items():
+                self._fold_overview(week_id, platoon, platoon_deltas, conn)
+                self._fold_tanks(week_id, platoon, platoon_deltas, conn)
+
+    def _row_deltas(
+        self, week_id: str, responses: list[NormalizedResponseV2], conn: sqlite3.Connection
+    ) -> list[_RowDelta]:
+        seen_week: set[str] = set()
+        seen_platoon: set[tuple[str, str]] = set()
+        deltas: list[_RowDelta] = []
+        for response in responses:
+            platoon = response.platoon_key or "Unknown"
+            families: Counter[str] = Counter()
+            for field_name, value in response.fields.items():
+                if self._is_gap(value):
+                    families[self._family_for_field(field_name)] += 1
+
+            tank_id = response.tank_id
+            new_in_week = tank_id not in seen_week and not self.store.has_rows(
+                week_id=week_id, tank_id=tank_id, conn=conn
+            )
+            new_in_platoon = (platoon, tank_id) not in seen_platoon and not self.store.has_rows(
+                week_id=week_id, platoon_key=platoon, tank_id=tank_id, conn=conn
+            )
+            seen_week.add(tank_id)
+            seen_platoon.add((platoon, tank_id))
+            deltas.append(
+                _RowDelta(
+                    platoon_key=platoon,
+                    tank_id=tank_id,
+                    gaps=sum(families.values()),
+                    families=families,
+                    new_in_week=new_in_week,
+                    new_in_platoon=new_in_platoon,
+                )
+            )
+        return deltas
+
+    def _fold_overview(
+        self,
+        week_id: str,
+        platoon_key: Optional[str],
+        deltas: list[_RowDelta],
+        conn: sqlite3.Connection,
+    ) -> None:
+        scope = "platoon" if platoon_key else "overview"
+        dimensions = {"week_id": week_id, **({"platoon_key": platoon_key} if platoon_key else {})}
+        snapshot = self.store.get_metric_snapshot(scope, dimensions, conn=conn)
+        if snapshot:
+            values = snapshot["values"]
+        elif not self.store.has_rows(week_id=week_id, platoon_key=platoon_key, conn=conn):
+            values = {"reports": 0, "tanks": 0, "total_gaps": 0, "gap_rate": 0.0, "platoons": {}}
+        else:
+            return
+
+        platoons = values.setdefault("platoons", {})
+        for delta in deltas:
+            new_tank = delta.new_in_platoon if platoon_key else delta.new_in_week
+            values["reports"] += 1
+            values["tanks"] += int(new_tank)
+            values["total_gaps"] += delta.gaps
+            platoon = platoons.setdefault(delta.platoon_key, {"reports": 0, "tanks": 0, "gaps": 0})
+            platoon["reports"] += 1
+            platoon["tanks"] += int(delta.new_in_platoon)
+            platoon["gaps"] += delta.gaps
+
+        reports = values["reports"]
+        tanks = values["tanks"]
+        values["gap_rate"] = round((values["total_gaps"] / reports), 3) if reports else 0.0
+        values["avg_gaps_per_tank"] = round((values["total_gaps"] / tanks), 3) if tanks else 0.0
+        self.store.upsert_metric_snapshot(
+            MetricSnapshotV2(scope=scope, dimensions=dimensions, values=values),
+            conn=conn,
+        )
+
+    def _fold_tanks(
+        self,
+        week_id: str,
+        platoon_key: str,
+        deltas: list[_RowDelta],
+        conn: sqlite3.Connection,
+    ) -> None:
+        dimensions = {"week_id": week_id, "platoon_key": platoon_key}
+        snapshot = self.store.get_metric_snapshot("tank", dimensions, conn=conn)
+        if snapshot:
+            rows = snapshot["values"].get("rows", [])
+            if any("families" not in row for row in rows):
+                # Written before per-family counts were kept; dominant family cannot be folded.
+                self.store.delete_metric_snapshot("tank", dimensions, conn=conn)
+                return
+        elif not self.store.has_rows(week_id=week_id, platoon_key=platoon_key, conn=conn):
+            rows = []
+        else:
+            return
+
+        by_tank = {row["tank_id"]: row for row in rows}
+        for delta in deltas:
+            row = by_tank.get(delta.tank_id)
+            if row is None:
+                row = {"tank_id": delta.tank_id, "reports": 0, "gaps": 0, "dominant_family": "none", "families": {}}
+                by_tank[delta.tank_id] = row
+            row["reports"] += 1
+            row["gaps"] += delta.gaps
+            families = Counter(row["families"])
+            families.update(delta.families)
+            row["families"] = dict(families)
+            row["dominant_family"] = families.most_common(1)[0][0] if families else "none"
+
+        result = sorted(by_tank.values(), key=lambda x: (x["gaps"], x["reports"]), reverse=True)
+        self.store.upsert_metric_snapshot(
+            MetricSnapshotV2(scope="tank", dimensions=dimensions, values={"rows": result}),
+            conn=conn,
+        )
+
     def _refresh_tank_snapshot(self, week_id: str, platoon_key: str) -> None:
         tank_values = self._compute_tanks(week_id=week_id, platoon_key=platoon_key)
         self.store.upsert_metric_snapshot(
@@ -123,6 +526,14 @@ class ResponseQueryServiceV2:
             )
         )
 
+    def export_rows(
+        self, from_week: Optional[str], to_week: Optional[str], platoon_key: Optional[str]
+    ) -> Iterator[dict[str, Any]]:
+        return self.store.iter_normalized(from_week=from_week, to_week=to_week, platoon_key=platoon_key)
+
+    def data_generation(self) -> int:
+        return self.store.data_generation()
+
     def latest_week(self) -> Optional[str]:
         weeks = self.store.list_weeks()
         return weeks[0] if weeks else None
@@ -189,10 +600,27 @@ class ResponseQueryServiceV2:
         limit: int = 100,
     ) -> dict[str, Any]:
         target_week = week_id or self.latest_week()
-        rows = self.store.list_normalized(week_id=target_week, platoon_key=platoon_key)
         if not target_week:
             return {"week_id": None, "rows": []}
 
+        week = self._columnar(target_week)
+        if week is not None:
+            return {
+                "week_id": target_week,
+                "group_by": group_by,
+                "rows": self._gaps_columnar(week, platoon_key, group_by, limit),
+            }
+
+        if self.use_facts:
+            result_rows = []
+            for key, count, tank_id in self.store.top_fact_gaps(target_week, platoon_key, group_by, limit):
+                entry = {"key": key, "gaps": count}
+                if group_by != "tank":
+                    entry["tank_id"] = tank_id
+                result_rows.append(entry)
+            return {"week_id": target_week, "group_by": group_by, "rows": result_rows}
+
+        rows = self.store.list_normalized(week_id=target_week, platoon_key=platoon_key)
         counter: Counter[str] = Counter()
         extras: dict[str, dict[str, Any]] = defaultdict(dict)
 
@@ -225,33 +653,63 @@ class ResponseQueryServiceV2:
         metric: str,
         window_weeks: int,
         platoon_key: Optional[str],
+        family: Optional[str] = None,
     ) -> dict[str, Any]:
-        weeks = self.list_weeks(platoon_key=platoon_key)
-        if not weeks:
-            return {"metric": metric, "rows": []}
-        weeks = sorted(weeks)[-max(window_weeks, 1) :]
-
+        """
+        One rollup range query for the whole window. `platoon_key=None` is the battalion;
+        `family` drills down to one family's gaps (distinct_tanks = tanks with such a gap).
+        """
         rows = []
-        for week_id in weeks:
-            ov = self.overview(week_id=week_id, platoon_key=platoon_key)
+        for week_id, reports, tanks, gaps, gap_rate in self.store.rollup_series(
+            platoon_key, family, max(window_weeks, 1)
+        ):
             if metric == "reports":
-                val = ov.get("reports", 0)
+                val = reports
             elif metric == "distinct_tanks":
-                val = ov.get("tanks", 0)
+                val = tanks
             elif metric == "gap_rate":
-                val = ov.get("gap_rate", 0)
+                val = gap_rate
             else:
-                val = ov.get("total_gaps", 0)
+                val = gaps
             rows.append({"week_id": week_id, "value": val})
 
-        return {"metric": metric, "rows": rows}
+        result: dict[str, Any] = {"metric": metric, "rows": rows}
+        if family:
+            result["family"] = family
+        return result
 
-    def search(self, q: str, week_id: Optional[str], platoon_key: Optional[str], limit: int = 50) -> dict[str, Any]:
-        target_week = week_id or self.latest_week()
+    def search(
+        self,
+        q: str,
+        week_id: Optional[str],
+        platoon_key: Optional[str],
+        limit: int = 50,
+        all_weeks: bool = False,
+    ) -> dict[str, Any]:
+        target_week = None if all_weeks else (week_id or self.latest_week())
         if not q or len(q.strip()) < 2:
             return {"week_id": target_week, "rows": []}
         query_text = q.strip().lower()
 
+        # Trigram FTS needs 3+ characters; shorter queries keep the scan below.
+        if self.store.search_enabled and len(query_text) >= 3:
+            return {
+                "week_id": target_week,
+                "q": q,
+                "rows": [
+                    self._search_hit(row, query_text)
+                    for row in self.store.search_normalized(query_text, target_week, platoon_key, limit)
+                ],
+            }
+
+        week = self._columnar(target_week) if target_week else None
+        if week is not None:
+            return {
+                "week_id": target_week,
+                "q": q,
+                "rows": self._search_columnar(week, query_text, platoon_key, limit),
+            }
+
         rows = self.store.list_normalized(week_id=target_week, platoon_key=platoon_key)
         result = []
         for row in rows:
@@ -278,7 +736,167 @@ class ResponseQueryServiceV2:
 
         return {"week_id": target_week, "q": q, "rows": result}
 
+    # ---- keyset-paginated grids ----
+    # Cursors pin the week they were issued for, so paging is not thrown off when a
+    # newer week appears mid-way. Each order ends with a unique column as tie-breaker.
+    def _page_start(
+        self, cursor: Optional[str], query: str, week_id: Optional[str], resolve_week: bool = True
+    ) -> tuple[Optional[str], Optional[list[Any]]]:
+        if cursor:
+            return decode_cursor(cursor, query)
+        return (week_id or self.latest_week()) if resolve_week else week_id, None
+
+    @staticmethod
+    def _page(
+        query: str, week_id: Optional[str], rows: list[Any], page_size: int, sort: str, key_of
+    ) -> tuple[list[Any], dict[str, Any]]:
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(query, week_id, key_of(rows[-1])) if more and rows else None
+        return rows, {"week_id": week_id, "sort": sort, "page_size": page_size, "next_cursor": next_cursor}
+
+    def tank_page(
+        self,
+        platoon_key: Optional[str],
+        week_id: Optional[str],
+        sort: Optional[str] = None,
+        filter_text: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 50,
+    ) -> dict[str, Any]:
+        """
+        Tank grid page; platoon_key=None pages over the whole battalion.
+        Sort by tank_id, reports or gaps ("-" prefix: descending); filter matches tank ids.
+        """
+        name, descending = parse_sort(sort, ("gaps", "reports", "tank_id"), "-gaps")
+        sort = f"{'-' if descending else ''}{name}"
+        query = fingerprint("tanks", platoon_key, sort, filter_text)
+        target_week, after = self._page_start(cursor, query, week_id)
+        if not target_week:
+            return {"week_id": None, "rows": [], "sort": sort, "page_size": page_size, "next_cursor": None}
+
+        order = [(name, descending)]
+        if name == "gaps":
+            order.append(("reports", descending))
+        if name != "tank_id":
+            order.append(("tank_id", False))
+        page = self.store.page_tanks(target_week, platoon_key, order, after, filter_text, page_size + 1)
+        columns = {"tank_id": 0, "reports": 1, "gaps": 2}
+        page, meta = self._page(
+            query, target_week, page, page_size, sort, lambda r: [r[columns[c]] for c, _ in order]
+        )
+
+        families: dict[str, dict[str, int]] = defaultdict(dict)
+        for tank_id, family, count in self.store.count_fact_gaps_by_tank_family(
+            target_week, platoon_key, tank_ids=[r[0] for r in page]
+        ):
+            families[tank_id][family] = count  # first-seen order per tank
+        rows = [
+            {
+                "tank_id": tank_id,
+                "reports": reports,
+                "gaps": gaps,
+                "dominant_family": self._dominant_family(families.get(tank_id, {})),
+                "families": families.get(tank_id, {}),
+            }
+            for tank_id, reports, gaps in page
+        ]
+        return {**meta, "platoon_key": platoon_key, "rows": rows}
+
+    def gaps_page(
+        self,
+        week_id: Optional[str],
+        platoon_key: Optional[str],
+        group_by: str = "item",
+        sort: Optional[str] = None,
+        filter_text: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+    ) -> dict[str, Any]:
+        """
+        Gap grid page grouped by item/family/tank; sort by gaps or key, filter matches keys.
+        """
+        name, descending = parse_sort(sort, ("gaps", "key"), "-gaps")
+        sort = f"{'-' if descending else ''}{name}"
+        query = fingerprint("gaps", platoon_key, group_by, sort, filter_text)
+        target_week, after = self._page_start(cursor, query, week_id)
+        if not target_week:
+            empty = {"week_id": None, "rows": [], "sort": sort, "page_size": page_size, "next_cursor": None}
+            return {**empty, "group_by": group_by}
+
+        order = [(name, descending)] + ([("key", False)] if name != "key" else [])
+        page = self.store.page_fact_gaps(target_week, platoon_key, group_by, order, after, filter_text, page_size + 1)
+        columns = {"key": 0, "gaps": 1}
+        page, meta = self._page(
+            query, target_week, page, page_size, sort, lambda r: [r[columns[c]] for c, _ in order]
+        )
+        rows = []
+        for key, count, tank_id in page:
+            entry = {"key": key, "gaps": count}
+            if group_by != "tank":
+                entry["tank_id"] = tank_id
+            rows.append(entry)
+        return {**meta, "group_by": group_by, "rows": rows}
+
+    def search_page(
+        self,
+        q: str,
+        week_id: Optional[str],
+        platoon_key: Optional[str],
+        sort: Optional[str] = None,
+        filter_text: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 50,
+        all_weeks: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Search results page, by relevance ("-score", default) or received_at; filter matches tank ids.
+        Paging needs the FTS index and 3+ characters; otherwise one unpaged page is returned.
+        """
+        name, descending = parse_sort(sort, ("score", "received_at"), "-score")
+        sort = f"{'-' if descending else ''}{name}"
+        query_text = (q or "").strip().lower()
+        if not self.store.search_enabled or len(query_text) < 3:
+            result = self.search(q, week_id, platoon_key, limit=page_size, all_weeks=all_weeks)
+            if filter_text:
+                result["rows"] = [r for r in result["rows"] if filter_text.lower() in str(r["tank_id"]).lower()]
+            return {**result, "sort": sort, "page_size": page_size, "next_cursor": None}
+
+        query = fingerprint("search", query_text, platoon_key, sort, filter_text, all_weeks)
+        target_week, after = self._page_start(cursor, query, week_id, resolve_week=not all_weeks)
+        # bm25 is "lower is better"; the exposed score is its negation.
+        order = [("score", not descending)] if name == "score" else [("received_at", descending)]
+        order.append(("id", False))
+        page = self.store.search_normalized(
+            query_text, target_week, platoon_key, page_size + 1, order=order, after=after, tank_filter=filter_text
+        )
+        page, meta = self._page(query, target_week, page, page_size, sort, lambda r: [r[c] for c, _ in order])
+        return {**meta, "q": q, "rows": [self._search_hit(row, query_text) for row in page]}
+
+    @staticmethod
+    def _search_hit(row: dict[str, Any], query_text: str) -> dict[str, Any]:
+        field_hits = [
+            {"field": field_name, "value": value}
+            for field_name, value in row.get("fields", {}).items()
+            if query_text in field_name.lower() or query_text in str(value).lower()
+        ]
+        return {
+            "event_id": row["event_id"],
+            "week_id": row["week_id"],
+            "platoon_key": row["platoon_key"],
+            "tank_id": row["tank_id"],
+            "matches": field_hits[:5],
+            "match_count": len(field_hits),
+            "snippet": row.get("snippet"),
+            "score": round(-float(row.get("score") or 0.0), 4),
+        }
+
     def _compute_overview(self, week_id: str, platoon_key: Optional[str]) -> dict[str, Any]:
+        week = self._columnar(week_id)
+        if week is not None:
+            return self._overview_columnar(week, platoon_key)
+        if self.use_facts:
+            return self._compute_overview_from_facts(week_id, platoon_key)
         rows = self.store.list_normalized(week_id=week_id, platoon_key=platoon_key)
         if not rows:
             return {"reports": 0, "tanks": 0, "total_gaps": 0, "gap_rate": 0.0, "platoons": {}}
@@ -310,7 +928,59 @@ class ResponseQueryServiceV2:
             "platoons": dict(platoons),
         }
 
+    def _compute_overview_from_facts(self, week_id: str, platoon_key: Optional[str]) -> dict[str, Any]:
+        counts = self.store.count_responses_by_platoon(week_id, platoon_key)
+        if not counts:
+            return {"reports": 0, "tanks": 0, "total_gaps": 0, "gap_rate": 0.0, "platoons": {}}
+
+        gaps = self.store.count_fact_gaps_by_platoon(week_id, platoon_key)
+        platoons = {
+            platoon: {"reports": reports, "tanks": tanks, "gaps": gaps.get(platoon, 0)}
+            for platoon, reports, tanks in counts
+        }
+        reports = sum(p["reports"] for p in platoons.values())
+        tanks = self.store.count_distinct_tanks(week_id, platoon_key)
+        total_gaps = sum(p["gaps"] for p in platoons.values())
+        return {
+            "reports": reports,
+            "tanks": tanks,
+            "total_gaps": total_gaps,
+            "gap_rate": round((total_gaps / reports), 3) if reports else 0.0,
+            "avg_gaps_per_tank": round((total_gaps / tanks), 3) if tanks else 0.0,
+            "platoons": platoons,
+        }
+
+    @staticmethod
+    def _dominant_family(families: dict[str, int]) -> str:
+        # most_common keeps insertion order on ties: the family seen first wins, as in the row scan.
+        return Counter(families).most_common(1)[0][0] if families else "none"
+
+    def _compute_tanks_from_facts(self, week_id: str, platoon_key: str) -> list[dict[str, Any]]:
+        families: dict[str, dict[str, int]] = defaultdict(dict)
+        for tank_id, family, count in self.store.count_fact_gaps_by_tank_family(week_id, platoon_key):
+            families[tank_id][family] = count  # first-seen order per tank
+
+        result = []
+        for tank_id, reports in self.store.count_reports_by_tank(week_id, platoon_key):
+            tank_families = families.get(tank_id, {})
+            result.append(
+                {
+                    "tank_id": tank_id,
+                    "reports": reports,
+                    "gaps": sum(tank_families.values()),
+                    "dominant_family": self._dominant_family(tank_families),
+                    "families": tank_families,
+                }
+            )
+        result.sort(key=lambda x: (x["gaps"], x["reports"]), reverse=True)
+        return result
+
     def _compute_tanks(self, week_id: str, platoon_key: str) -> list[dict[str, Any]]:
+        week = self._columnar(week_id)
+        if week is not None:
+            return self._tanks_columnar(week, platoon_key)
+        if self.use_facts:
+            return self._compute_tanks_from_facts(week_id, platoon_key)
         rows = self.store.list_normalized(week_id=week_id, platoon_key=platoon_key)
         tanks: dict[str, dict[str, Any]] = defaultdict(lambda: {"gaps": 0, "reports": 0, "families": Counter()})
         for row in rows:
@@ -332,11 +1002,154 @@ class ResponseQueryServiceV2:
                     "reports": values["reports"],
                     "gaps": values["gaps"],
                     "dominant_family": dominant_family,
+                    "families": dict(values["families"]),
                 }
             )
         result.sort(key=lambda x: (x["gaps"], x["reports"]), reverse=True)
         return result
 
+    # ---- vectorized paths over the columnar week cache ----
+    # These mirror the row-scanning implementations, including their tie orders
+    # (first appearance in received_at DESC order).
+    @staticmethod
+    def _first_seen_order(codes: np.ndarray) -> np.ndarray:
+        unique, first = np.unique(codes, return_index=True)
+        return unique[np.argsort(first, kind="stable")]
+
+    def _overview_columnar(self, week: ColumnarWeek, platoon_key: Optional[str]) -> dict[str, Any]:
+        mask = week.row_mask(platoon_key)
+        reports = int(mask.sum())
+        if not reports:
+            return {"reports": 0, "tanks": 0, "total_gaps": 0, "gap_rate": 0.0, "platoons": {}}
+
+        n_platoons, n_tanks = len(week.platoons), len(week.tanks)
+        platoon_codes = week.platoon_codes[mask]
+        tank_codes = week.tank_codes[mask]
+        has_tank = np.array([bool(t) for t in week.tanks], dtype=bool)[tank_codes]
+
+        reports_by_platoon = np.bincount(platoon_codes, minlength=n_platoons)
+        pairs = np.unique(platoon_codes[has_tank].astype(np.int64) * n_tanks + tank_codes[has_tank])
+        tanks_by_platoon = np.bincount(pairs // max(n_tanks, 1), minlength=n_platoons)
+        gap = week.gap_facts(mask)
+        gaps_by_platoon = np.bincount(week.platoon_codes[week.fact_row[gap]], minlength=n_platoons)
+
+        platoons = {
+            week.platoons[code]: {
+                "reports": int(reports_by_platoon[code]),
+                "tanks": int(tanks_by_platoon[code]),
+                "gaps": int(gaps_by_platoon[code]),
+            }
+            for code in self._first_seen_order(platoon_codes)
+        }
+        tanks = len(np.unique(tank_codes[has_tank]))
+        total_gaps = int(gap.sum())
+        return {
+            "reports": reports,
+            "tanks": tanks,
+            "total_gaps": total_gaps,
+            "gap_rate": round((total_gaps / reports), 3) if reports else 0.0,
+            "avg_gaps_per_tank": round((total_gaps / tanks), 3) if tanks else 0.0,
+            "platoons": platoons,
+        }
+
+    def _tanks_columnar(self, week: ColumnarWeek, platoon_key: str) -> list[dict[str, Any]]:
+        mask = week.row_mask(platoon_key)
+        if not mask.any():
+            return []
+        n_tanks, n_families = len(week.tanks), len(week.families)
+        reports = np.bincount(week.tank_codes[mask], minlength=n_tanks)
+
+        gap_positions = np.nonzero(week.gap_facts(mask))[0]
+        gap_tanks = week.tank_codes[week.fact_row[gap_positions]]
+        gap_families = week.header_family[week.fact_header[gap_positions]]
+        counts = np.zeros((n_tanks, n_families), dtype=np.int64)
+        np.add.at(counts, (gap_tanks, gap_families), 1)
+        first = np.full((n_tanks, n_families), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first, (gap_tanks, gap_families), np.arange(len(gap_positions)))
+
+        result = []
+        for tank in self._first_seen_order(week.tank_codes[mask]):
+            present = np.nonzero(counts[tank])[0]
+            present = present[np.argsort(first[tank, present], kind="stable")]
+            families = {week.families[f]: int(counts[tank, f]) for f in present}
+            dominant = Counter(families).most_common(1)[0][0] if families else "none"
+            result.append(
+                {
+                    "tank_id": week.tanks[tank],
+                    "reports": int(reports[tank]),
+                    "gaps": int(counts[tank].sum()),
+                    "dominant_family": dominant,
+                    "families": families,
+                }
+            )
+        result.sort(key=lambda x: (x["gaps"], x["reports"]), reverse=True)
+        return result
+
+    def _gaps_columnar(
+        self, week: ColumnarWeek, platoon_key: Optional[str], group_by: str, limit: int
+    ) -> list[dict[str, Any]]:
+        gap_positions = np.nonzero(week.gap_facts(week.row_mask(platoon_key)))[0]
+        if not len(gap_positions):
+            return []
+        fact_tanks = week.tank_codes[week.fact_row[gap_positions]]
+        if group_by == "tank":
+            keys, labels = fact_tanks, week.tanks
+        elif group_by == "family":
+            keys, labels = week.header_family[week.fact_header[gap_positions]], week.families
+        else:
+            keys, labels = week.header_item[week.fact_header[gap_positions]], week.items
+
+        order = np.arange(len(gap_positions))
+        counts = np.bincount(keys, minlength=len(labels))
+        first = np.full(len(labels), len(order), dtype=np.int64)
+        np.minimum.at(first, keys, order)
+        last = np.full(len(labels), -1, dtype=np.int64)
+        np.maximum.at(last, keys, order)
+
+        present = np.nonzero(counts)[0]
+        ranked = present[np.lexsort((first[present], -counts[present]))][:limit]
+        rows = []
+        for code in ranked:
+            entry = {"key": labels[code], "gaps": int(counts[code])}
+            if group_by != "tank":
+                entry["tank_id"] = week.tanks[fact_tanks[last[code]]]
+            rows.append(entry)
+        return rows
+
+    def _search_columnar(
+        self, week: ColumnarWeek, query_text: str, platoon_key: Optional[str], limit: int
+    ) -> list[dict[str, Any]]:
+        mask = week.row_mask(platoon_key)
+        header_hit = np.array([query_text in h.lower() for h in week.headers], dtype=bool)
+        value_hit = np.array([query_text in text for text in week.value_text], dtype=bool)
+        fact_hit = np.zeros(len(week.fact_row), dtype=bool)
+        if len(fact_hit):
+            fact_hit = header_hit[week.fact_header] | value_hit[week.fact_value]
+        tank_hit = np.array([query_text in str(t).lower() for t in week.tanks], dtype=bool)[week.tank_codes]
+        platoon_hit = np.array([query_text in p.lower() for p in week.platoons], dtype=bool)[week.platoon_codes]
+        hits_per_row = np.bincount(week.fact_row[fact_hit], minlength=len(mask))
+        matched = mask & (tank_hit | platoon_hit | (hits_per_row > 0))
+
+        # fact_row is non-decreasing, so each row's facts are one contiguous slice.
+        starts = np.searchsorted(week.fact_row, np.arange(len(mask) + 1))
+        result = []
+        for row in np.nonzero(matched)[0][:limit]:
+            row_hits = np.nonzero(fact_hit[starts[row] : starts[row + 1]])[0] + starts[row]
+            result.append(
+                {
+                    "event_id": week.event_ids[row],
+                    "week_id": week.week_id,
+                    "platoon_key": week.platoons[week.platoon_codes[row]],
+                    "tank_id": week.tanks[week.tank_codes[row]],
+                    "matches": [
+                        {"field": week.headers[week.fact_header[f]], "value": week.values[week.fact_value[f]]}
+                        for f in row_hits[:5]
+                    ],
+                    "match_count": int(len(row_hits)),
+                }
+            )
+        return result
+
     def _count_row_gaps(self, fields: dict[str, Any]) -> int:
         count = 0
         for value in fields.values():
@@ -344,6 +1157,17 @@ class ResponseQueryServiceV2:
                 count += 1
         return count
 
+    @staticmethod
+    def _numeric(value: Any) -> Optional[float]:
+        if isinstance(value, bool) or value is None:
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return float(str(value).strip())
+        except ValueError:
+            return None
+
     def _item_for_field(self, field_name: str) -> str:
         match = self._mapper.match_header(field_name)
         return match.item if match and match.item else field_name
@@ -353,9 +1177,4 @@ class ResponseQueryServiceV2:
         return match.family if match and match.family else "other"
 
     def _is_gap(self, value: Any) -> bool:
-        if value is None:
-            return False
-        text = str(value).strip().lower()
-        if not text:
-            return False
-        return any(tok.lower() in text for tok in self.gap_tokens)
+        return self.tokens.is_gap(value)
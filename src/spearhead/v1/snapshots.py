@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from spearhead.data.field_mapper import FieldMapper
+from spearhead.logic.tokens import status_classifier
+from spearhead.v1.models import MetricSnapshotV2
+
+# Gap tokens the v1 read models add on top of settings/field_config tokens.
+EXTRA_GAP_TOKENS = ("אין", "חסר", "בלאי", "0")
+
+
+@dataclass
+class _Scope:
+    reports: int = 0
+    gaps: int = 0
+    tanks: set[str] = field(default_factory=set)
+
+
+@dataclass
+class _TankTotals:
+    reports: int = 0
+    gaps: int = 0
+    families: Counter = field(default_factory=Counter)
+
+
+class WeekSnapshotBuilder:
+    """
+    Folds one week's normalized rows, in list_normalized order (received_at DESC),
+    into every snapshot of that week: the overview, each platoon, and each platoon's
+    tanks. Each row is classified once. Results match the row-scanning
+    `_compute_overview` / `_compute_tanks`, including first-appearance ordering
+    and case-insensitive platoon scopes.
+    """
+
+    def __init__(self, week_id: str, is_gap: Callable[[Any], bool], family_for: Callable[[str], str]):
+        self.week_id = week_id
+        self._is_gap = is_gap
+        self._family_for = family_for
+        self._week = _Scope()
+        self._platoons: dict[str, _Scope] = {}
+        # lowercase platoon -> platoon spellings seen, and that scope's tanks
+        self._scope_platoons: dict[str, dict[str, None]] = defaultdict(dict)
+        self._scope_tanks: dict[str, dict[str, _TankTotals]] = defaultdict(dict)
+
+    def add(self, platoon_key: Optional[str], tank_id: str, fields: dict[str, Any]) -> None:
+        platoon = platoon_key or "Unknown"
+        families: Counter[str] = Counter()
+        for field_name, value in fields.items():
+            if self._is_gap(value):
+                families[self._family_for(field_name)] += 1
+        gaps = sum(families.values())
+
+        scope = self._platoons.setdefault(platoon, _Scope())
+        for totals in (self._week, scope):
+            totals.reports += 1
+            totals.gaps += gaps
+            if tank_id:
+                totals.tanks.add(tank_id)
+
+        key = platoon.lower()
+        self._scope_platoons[key].setdefault(platoon)
+        tank = self._scope_tanks[key].setdefault(tank_id, _TankTotals())
+        tank.reports += 1
+        tank.gaps += gaps
+        tank.families.update(families)
+
+    @staticmethod
+    def _overview(totals: _Scope, platoons: dict[str, _Scope]) -> dict[str, Any]:
+        reports, tanks, total_gaps = totals.reports, len(totals.tanks), totals.gaps
+        return {
+            "reports": reports,
+            "tanks": tanks,
+            "total_gaps": total_gaps,
+            "gap_rate": round((total_gaps / reports), 3) if reports else 0.0,
+            "avg_gaps_per_tank": round((total_gaps / tanks), 3) if tanks else 0.0,
+            "platoons": {
+                name: {"reports": p.reports, "tanks": len(p.tanks), "gaps": p.gaps} for name, p in platoons.items()
+            },
+        }
+
+    @staticmethod
+    def _tank_rows(tanks: dict[str, _TankTotals]) -> list[dict[str, Any]]:
+        rows = [
+            {
+                "tank_id": tank_id,
+                "reports": totals.reports,
+                "gaps": totals.gaps,
+                "dominant_family": totals.families.most_common(1)[0][0] if totals.families else "none",
+                "families": dict(totals.families),
+            }
+            for tank_id, totals in tanks.items()
+        ]
+        rows.sort(key=lambda x: (x["gaps"], x["reports"]), reverse=True)
+        return rows
+
+    def snapshots(self) -> list[MetricSnapshotV2]:
+        if not self._week.reports:
+            return []
+        result = [
+            MetricSnapshotV2(
+                scope="overview",
+                dimensions={"week_id": self.week_id},
+                values=self._overview(self._week, self._platoons),
+            )
+        ]
+        for platoon in self._platoons:
+            key = platoon.lower()
+            spellings = {name: self._platoons[name] for name in self._scope_platoons[key]}
+            merged = _Scope(
+                reports=sum(p.reports for p in spellings.values()),
+                gaps=sum(p.gaps for p in spellings.values()),
+                tanks=set().union(*(p.tanks for p in spellings.values())),
+            )
+            dimensions = {"week_id": self.week_id, "platoon_key": platoon}
+            result.append(
+                MetricSnapshotV2(scope="platoon", dimensions=dimensions, values=self._overview(merged, spellings))
+            )
+            result.append(
+                MetricSnapshotV2(
+                    scope="tank",
+                    dimensions=dimensions,
+                    values={"rows": self._tank_rows(self._scope_tanks[key])},
+                )
+            )
+        return result
+
+
+_classifiers: Optional[tuple[FieldMapper, Any]] = None
+
+
+def build_week_snapshots(week: tuple[str, list[tuple[str, str, str]]]) -> list[MetricSnapshotV2]:
+    """
+    (week_id, [(platoon_key, tank_id, fields_json), ...]) -> that week's snapshots.
+    Top-level and fed raw JSON so it can run in a worker process; the mapper and
+    token classifier are built once per process.
+    """
+    global _classifiers
+    if _classifiers is None:
+        _classifiers = (FieldMapper(), status_classifier(EXTRA_GAP_TOKENS))
+    mapper, tokens = _classifiers
+
+    def family_for(field_name: str) -> str:
+        match = mapper.match_header(field_name)
+        return match.family if match and match.family else "other"
+
+    week_id, rows = week
+    builder = WeekSnapshotBuilder(week_id, tokens.is_gap, family_for)
+    for platoon_key, tank_id, fields_json in rows:
+        try:
+            fields = json.loads(fields_json) if fields_json else {}
+        except (TypeError, ValueError):
+            fields = {}
+        builder.add(platoon_key, tank_id, fields if isinstance(fields, dict) else {})
+    return builder.snapshots()
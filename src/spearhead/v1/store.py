@@ -1,13 +1,27 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from datetime import UTC, datetime
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 import pandas as pd
 
 from spearhead.data.storage import Database
 from spearhead.v1.models import MetricSnapshotV2, NormalizedResponseV2
+from spearhead.v1.paging import keyset_predicate, order_by
+
+
+_IN_CHUNK = 500  # stays well under SQLITE_MAX_VARIABLE_NUMBER on old builds
+
+# "header: value" lines of one fields_json document; what the search index holds per response.
+_SEARCH_FIELDS_SQL = (
+    "(SELECT group_concat(key || ': ' || coalesce(value, ''), char(10)) "
+    "FROM json_each(CASE WHEN json_valid({col}) THEN {col} ELSE '{{}}' END))"
+)
 
 
 class ResponseStore:
@@ -18,6 +32,9 @@ class ResponseStore:
 
     def __init__(self, db: Database):
         self.db = db
+        self._write_listeners: list[Callable[[set[str]], None]] = []
+        self._tx = threading.local()
+        self.search_enabled = False
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
@@ -84,8 +101,285 @@ class ResponseStore:
             cur.execute(
                 "CREATE INDEX IF NOT EXISTS idx_norm_tank_week ON normalized_responses_v2 (tank_id, week_id);"
             )
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS normalized_field_facts_v2 (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id TEXT NOT NULL,
+                    week_id TEXT NOT NULL,
+                    platoon_key TEXT NOT NULL COLLATE NOCASE,
+                    tank_id TEXT NOT NULL,
+                    family TEXT NOT NULL,
+                    item TEXT NOT NULL,
+                    raw_header TEXT NOT NULL,
+                    is_gap INTEGER NOT NULL,
+                    numeric_value REAL
+                );
+                """
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_facts_week_platoon_family "
+                "ON normalized_field_facts_v2 (week_id, platoon_key, family);"
+            )
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_facts_week_item ON normalized_field_facts_v2 (week_id, item);")
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_facts_week_tank ON normalized_field_facts_v2 (week_id, tank_id);"
+            )
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_facts_event ON normalized_field_facts_v2 (event_id);")
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS metric_rollup_v2 (
+                    platoon_key TEXT NOT NULL COLLATE NOCASE,
+                    family TEXT NOT NULL,
+                    week_id TEXT NOT NULL,
+                    reports INTEGER NOT NULL,
+                    tanks INTEGER NOT NULL,
+                    gaps INTEGER NOT NULL,
+                    gap_rate REAL NOT NULL,
+                    PRIMARY KEY (platoon_key, family, week_id)
+                );
+                """
+            )
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_rollup_week ON metric_rollup_v2 (week_id);")
+            # Grid pages per week and scope ('*' = battalion): tank rows carry reports and gaps,
+            # item/family rows their gaps and the tank of the first gap fact. Kept beside
+            # metric_rollup_v2 so keyset pages seek these indexes instead of re-aggregating.
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS grid_rollup_v2 (
+                    week_id TEXT NOT NULL,
+                    platoon_key TEXT NOT NULL COLLATE NOCASE,
+                    dimension TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    reports INTEGER NOT NULL DEFAULT 0,
+                    gaps INTEGER NOT NULL DEFAULT 0,
+                    sample_tank_id TEXT,
+                    PRIMARY KEY (week_id, platoon_key, dimension, key)
+                );
+                """
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_grid_gaps "
+                "ON grid_rollup_v2 (week_id, platoon_key, dimension, gaps DESC, reports DESC, key);"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_grid_reports "
+                "ON grid_rollup_v2 (week_id, platoon_key, dimension, reports DESC, key);"
+            )
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS store_meta_v2 (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                """
+            )
+            # version counts committed changes to a week's normalized rows; the week is
+            # dirty while version > reconciled_version.
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS week_state_v2 (
+                    week_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    reconciled_version INTEGER NOT NULL DEFAULT 0,
+                    reconciled_at TEXT
+                );
+                """
+            )
+            self.search_enabled = self._ensure_search_index(cur)
             conn.commit()
 
+    def _ensure_search_index(self, cur: sqlite3.Cursor) -> bool:
+        """
+        FTS5 index over tank_id, platoon_key and the "header: value" lines of each response,
+        kept in sync with normalized_responses_v2 by triggers (rowid = normalized id).
+        The trigram tokenizer matches substrings, which suits Hebrew without stemming.
+        Returns False when this SQLite build lacks FTS5 or trigram; search then scans rows.
+        """
+        exists = cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'normalized_search_v2'"
+        ).fetchone()
+        try:
+            cur.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS normalized_search_v2
+                USING fts5(tank_id, platoon_key, fields, tokenize = 'trigram');
+                """
+            )
+        except sqlite3.OperationalError:
+            return False
+        fields_new = _SEARCH_FIELDS_SQL.format(col="new.fields_json")
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_norm_search_insert AFTER INSERT ON normalized_responses_v2 BEGIN
+                INSERT INTO normalized_search_v2 (rowid, tank_id, platoon_key, fields)
+                VALUES (new.id, new.tank_id, new.platoon_key, {fields_new});
+            END;
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_norm_search_delete AFTER DELETE ON normalized_responses_v2 BEGIN
+                DELETE FROM normalized_search_v2 WHERE rowid = old.id;
+            END;
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_norm_search_update AFTER UPDATE ON normalized_responses_v2 BEGIN
+                DELETE FROM normalized_search_v2 WHERE rowid = old.id;
+                INSERT INTO normalized_search_v2 (rowid, tank_id, platoon_key, fields)
+                VALUES (new.id, new.tank_id, new.platoon_key, {fields_new});
+            END;
+            """
+        )
+        if not exists:
+            # First run against an existing database: index the rows written before the table existed.
+            cur.execute(
+                f"""
+                INSERT INTO normalized_search_v2 (rowid, tank_id, platoon_key, fields)
+                SELECT id, tank_id, platoon_key, {_SEARCH_FIELDS_SQL.format(col="fields_json")}
+                FROM normalized_responses_v2
+                """
+            )
+        return True
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Single write transaction spanning several store calls.
+        Pass the yielded connection as `conn=` to keep those calls atomic.
+        Write listeners hear about touched weeks only after the commit. A transaction
+        that touched normalized rows also bumps the data generation in the same commit.
+        Reentrant: a nested call (e.g. a store call made without `conn=`) joins the
+        active transaction, and only the outermost block commits and notifies.
+        """
+        active = getattr(self._tx, "conn", None)
+        if active is not None:
+            yield active
+            return
+        self._tx.touched = set()
+        try:
+            with self.db.transaction() as conn:
+                self._tx.conn = conn
+                yield conn
+                if self._tx.touched:
+                    self._mark_weeks_changed(self._tx.touched, conn)
+                    self.bump_generation(conn=conn)
+            touched = self._tx.touched
+        finally:
+            self._tx.touched = None
+            self._tx.conn = None
+        if touched:
+            for listener in list(self._write_listeners):
+                listener(touched)
+
+    def data_generation(self) -> int:
+        """
+        Store-wide counter that changes whenever the data behind the read models does.
+        Persisted, so every process sharing the database agrees on it.
+        """
+        with self.db._connect() as conn:
+            row = conn.execute("SELECT value FROM store_meta_v2 WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _mark_weeks_changed(self, week_ids: Iterable[str], conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            """
+            INSERT INTO week_state_v2 (week_id, version) VALUES (?, 1)
+            ON CONFLICT(week_id) DO UPDATE SET version = version + 1
+            """,
+            [(week_id,) for week_id in week_ids],
+        )
+
+    def get_meta(self, key: str, default: int = 0, conn: Optional[sqlite3.Connection] = None) -> int:
+        with self._session(conn) as session:
+            row = session.execute("SELECT value FROM store_meta_v2 WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else default
+
+    def set_meta(self, key: str, value: int, conn: Optional[sqlite3.Connection] = None) -> None:
+        with self._session(conn) as session:
+            session.execute(
+                "INSERT INTO store_meta_v2 (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, int(value)),
+            )
+
+    def max_normalized_id(self) -> int:
+        with self.db._connect() as conn:
+            return int(conn.execute("SELECT COALESCE(MAX(id), 0) FROM normalized_responses_v2").fetchone()[0])
+
+    def weeks_to_reconcile(self, after_id: int) -> dict[str, int]:
+        """
+        {week_id: version} of weeks that changed since their last reconcile, plus weeks
+        holding normalized rows above the `after_id` watermark (rows written by paths
+        that did not record week state).
+        """
+        with self.db._connect() as conn:
+            dirty = {
+                str(r[0]): int(r[1])
+                for r in conn.execute(
+                    "SELECT week_id, version FROM week_state_v2 WHERE version > reconciled_version"
+                )
+            }
+            for (week_id,) in conn.execute(
+                "SELECT DISTINCT week_id FROM normalized_responses_v2 WHERE id > ? AND week_id IS NOT NULL",
+                (int(after_id),),
+            ):
+                dirty.setdefault(str(week_id), self._week_version(conn, week_id))
+        return dirty
+
+    @staticmethod
+    def _week_version(conn: sqlite3.Connection, week_id: str) -> int:
+        row = conn.execute("SELECT version FROM week_state_v2 WHERE week_id = ?", (week_id,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def mark_weeks_reconciled(self, versions: dict[str, int], conn: Optional[sqlite3.Connection] = None) -> None:
+        """
+        Records the week versions a reconcile was computed from. A week changed again
+        meanwhile keeps a higher version and stays dirty.
+        """
+        now = datetime.now(UTC).isoformat()
+        with self._session(conn) as session:
+            session.executemany(
+                """
+                INSERT INTO week_state_v2 (week_id, version, reconciled_version, reconciled_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(week_id) DO UPDATE SET
+                    reconciled_version = MAX(reconciled_version, excluded.reconciled_version),
+                    reconciled_at = excluded.reconciled_at
+                """,
+                [(week_id, version, version, now) for week_id, version in versions.items()],
+            )
+
+    def bump_generation(self, conn: Optional[sqlite3.Connection] = None) -> None:
+        with self._session(conn) as session:
+            session.execute(
+                """
+                INSERT INTO store_meta_v2 (key, value) VALUES ('generation', 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1
+                """
+            )
+
+    def add_write_listener(self, listener: Callable[[set[str]], None]) -> None:
+        """
+        Registers a callback receiving the week ids whose normalized rows a committed write changed.
+        """
+        self._write_listeners.append(listener)
+
+    def _touch_weeks(self, week_ids: Iterable[str]) -> None:
+        touched = getattr(self._tx, "touched", None)
+        if touched is not None:
+            touched.update(week_ids)
+
+    @contextmanager
+    def _session(self, conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+        if conn is not None:
+            yield conn
+            return
+        with self.transaction() as own:
+            yield own
+
     def upsert_raw_event(
         self,
         event_id: str,
@@ -99,15 +393,10 @@ class ResponseStore:
         now = datetime.now(UTC).isoformat()
         with self.db._connect() as conn:
             cur = conn.cursor()
-            cur.execute(
-                "SELECT event_id FROM raw_form_events_v2 WHERE event_id = ?",
-                (event_id,),
-            )
-            if cur.fetchone():
-                return False
+            # The primary key is the duplicate guard; no separate existence SELECT.
             cur.execute(
                 """
-                INSERT INTO raw_form_events_v2
+                INSERT OR IGNORE INTO raw_form_events_v2
                     (event_id, schema_version, source_id, received_at, payload_hash, payload_json, status, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, 'ingested', ?)
                 """,
@@ -121,17 +410,22 @@ class ResponseStore:
                     now,
                 ),
             )
+            created = cur.rowcount == 1
             conn.commit()
-        return True
+        return created
 
-    def mark_event_status(self, event_id: str, status: str, error_detail: Optional[str] = None) -> None:
-        with self.db._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
+    def mark_event_status(
+        self,
+        event_id: str,
+        status: str,
+        error_detail: Optional[str] = None,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> None:
+        with self._session(conn) as session:
+            session.execute(
                 "UPDATE raw_form_events_v2 SET status = ?, error_detail = ? WHERE event_id = ?",
                 (status, error_detail, event_id),
             )
-            conn.commit()
 
     def insert_dlq(self, event_id: Optional[str], source_id: Optional[str], payload: dict[str, Any], error_detail: str) -> None:
         with self.db._connect() as conn:
@@ -152,28 +446,717 @@ class ResponseStore:
             )
             conn.commit()
 
-    def upsert_normalized(self, response: NormalizedResponseV2) -> None:
-        with self.db._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
+    def upsert_normalized(self, response: NormalizedResponseV2, conn: Optional[sqlite3.Connection] = None) -> None:
+        self.upsert_normalized_many([response], conn=conn)
+
+    def upsert_normalized_many(
+        self, responses: Iterable[NormalizedResponseV2], conn: Optional[sqlite3.Connection] = None
+    ) -> None:
+        responses = list(responses)
+        now = datetime.now(UTC).isoformat()
+        rows = [
+            (
+                response.event_id,
+                response.source_id,
+                response.platoon_key,
+                response.tank_id,
+                response.week_id,
+                response.received_at.isoformat(),
+                json.dumps(response.fields, ensure_ascii=False, default=str),
+                json.dumps(response.unmapped_fields, ensure_ascii=False),
+                now,
+            )
+            for response in responses
+        ]
+        with self._session(conn) as session:
+            # A replaced row may have lived in another week; that week changes too.
+            event_ids = [row[0] for row in rows]
+            for start in range(0, len(event_ids), _IN_CHUNK):
+                chunk = event_ids[start : start + _IN_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                self._touch_weeks(
+                    r[0]
+                    for r in session.execute(
+                        f"SELECT DISTINCT week_id FROM normalized_responses_v2 WHERE event_id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+            # Delete-then-insert instead of INSERT OR REPLACE: REPLACE's implicit delete
+            # does not fire the search-index delete trigger.
+            session.executemany(
+                "DELETE FROM normalized_responses_v2 WHERE event_id = ?", [(event_id,) for event_id in event_ids]
+            )
+            session.executemany(
                 """
-                INSERT OR REPLACE INTO normalized_responses_v2
+                INSERT INTO normalized_responses_v2
                     (event_id, source_id, platoon_key, tank_id, week_id, received_at, fields_json, unmapped_json, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    response.event_id,
-                    response.source_id,
-                    response.platoon_key,
-                    response.tank_id,
-                    response.week_id,
-                    response.received_at.isoformat(),
-                    json.dumps(response.fields, ensure_ascii=False, default=str),
-                    json.dumps(response.unmapped_fields, ensure_ascii=False),
-                    datetime.now(UTC).isoformat(),
-                ),
+                rows,
             )
-            conn.commit()
+            self._touch_weeks(response.week_id for response in responses)
+
+    def insert_raw_events(self, rows: Iterable[dict[str, Any]], conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Bulk insert of raw events with their final status already resolved.
+        Each row carries the upsert_raw_event arguments plus `status` and `error_detail`.
+        Existing event ids are ignored; returns the number of rows actually inserted.
+        """
+        now = datetime.now(UTC).isoformat()
+        params = [
+            (
+                row["event_id"],
+                row["schema_version"],
+                row.get("source_id"),
+                row["received_at"].isoformat(),
+                row["payload_hash"],
+                json.dumps(row["payload"], ensure_ascii=False, default=str),
+                row["status"],
+                row.get("error_detail"),
+                now,
+            )
+            for row in rows
+        ]
+        with self._session(conn) as session:
+            cur = session.executemany(
+                """
+                INSERT OR IGNORE INTO raw_form_events_v2
+                    (event_id, schema_version, source_id, received_at, payload_hash, payload_json, status, error_detail, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                params,
+            )
+            return cur.rowcount
+
+    def insert_dlq_many(self, rows: Iterable[dict[str, Any]], conn: Optional[sqlite3.Connection] = None) -> None:
+        now = datetime.now(UTC).isoformat()
+        params = [
+            (
+                row.get("event_id"),
+                row.get("source_id"),
+                json.dumps(row.get("payload", {}), ensure_ascii=False, default=str),
+                row["error_detail"],
+                now,
+            )
+            for row in rows
+        ]
+        with self._session(conn) as session:
+            session.executemany(
+                """
+                INSERT INTO ingestion_dlq_v2
+                    (event_id, source_id, payload_json, error_detail, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                params,
+            )
+
+    def find_existing_events(
+        self, event_ids: Iterable[str], conn: Optional[sqlite3.Connection] = None
+    ) -> dict[str, tuple[Optional[str], Optional[str]]]:
+        """
+        Returns {event_id: (week_id, platoon_key)} for ids already stored as raw events.
+        Week/platoon are None when the event never normalized (invalid/failed).
+        """
+        ids = list(dict.fromkeys(event_ids))
+        found: dict[str, tuple[Optional[str], Optional[str]]] = {}
+        with self._session(conn) as session:
+            for start in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[start : start + _IN_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = session.execute(
+                    f"""
+                    SELECT r.event_id, n.week_id, n.platoon_key
+                    FROM raw_form_events_v2 r
+                    LEFT JOIN normalized_responses_v2 n ON n.event_id = r.event_id
+                    WHERE r.event_id IN ({placeholders})
+                    """,
+                    chunk,
+                ).fetchall()
+                for event_id, week_id, platoon_key in rows:
+                    found[event_id] = (week_id, platoon_key)
+        return found
+
+    def replace_field_facts(
+        self,
+        event_ids: Iterable[str],
+        rows: Iterable[tuple],
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> None:
+        """
+        Replaces the long-format facts of the given events.
+        Rows are (event_id, week_id, platoon_key, tank_id, family, item, raw_header, is_gap, numeric_value).
+        """
+        ids = list(dict.fromkeys(event_ids))
+        with self._session(conn) as session:
+            for start in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[start : start + _IN_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                session.execute(f"DELETE FROM normalized_field_facts_v2 WHERE event_id IN ({placeholders})", chunk)
+            session.executemany(
+                """
+                INSERT INTO normalized_field_facts_v2
+                    (event_id, week_id, platoon_key, tank_id, family, item, raw_header, is_gap, numeric_value)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def list_normalized_page(self, after_id: int = 0, limit: int = 5000) -> tuple[list[dict[str, Any]], int]:
+        """
+        Keyset page over all normalized rows in insertion order; returns (rows, last id seen).
+        """
+        with self.db._connect() as conn:
+            df = pd.read_sql_query(
+                """
+                SELECT id, event_id, source_id, platoon_key, tank_id, week_id, received_at, fields_json, unmapped_json
+                FROM normalized_responses_v2 WHERE id > ? ORDER BY id LIMIT ?
+                """,
+                conn,
+                params=[int(after_id), int(limit)],
+            )
+        last_id = int(df["id"].iloc[-1]) if not df.empty else after_id
+        return self._decode_rows(df.drop(columns=["id"])), last_id
+
+    def list_normalized_missing_facts(self, limit: int = 5000) -> list[dict[str, Any]]:
+        """
+        Normalized rows written before the facts table existed (every payload yields at least one fact).
+        """
+        with self.db._connect() as conn:
+            df = pd.read_sql_query(
+                """
+                SELECT n.event_id, n.source_id, n.platoon_key, n.tank_id, n.week_id, n.received_at,
+                       n.fields_json, n.unmapped_json
+                FROM normalized_responses_v2 n
+                WHERE NOT EXISTS (SELECT 1 FROM normalized_field_facts_v2 f WHERE f.event_id = n.event_id)
+                LIMIT ?
+                """,
+                conn,
+                params=[int(limit)],
+            )
+        return self._decode_rows(df)
+
+    # ---- week x platoon x family rollup (trends) ----
+    def refresh_rollup(self, week_ids: Iterable[str], conn: Optional[sqlite3.Connection] = None) -> None:
+        """
+        Recomputes the metric_rollup_v2 and grid_rollup_v2 rows of the given weeks from normalized
+        rows and facts (reconcile and backfill; ingestion folds deltas with fold_rollup).
+        '*' as platoon_key is the battalion roll-up, '*' as family covers all families.
+        Family rows hold that family's gaps and the tanks having one; their `reports` is the
+        scope's report count, so gap_rate stays comparable with the '*' row.
+        """
+        weeks = list(dict.fromkeys(w for w in week_ids if w))
+        with self._session(conn) as session:
+            for week_id in weeks:
+                session.execute("DELETE FROM metric_rollup_v2 WHERE week_id = ?", (week_id,))
+                session.execute("DELETE FROM grid_rollup_v2 WHERE week_id = ?", (week_id,))
+                scopes: dict[str, tuple[str, int, int]] = {}
+                for platoon, reports, tanks in session.execute(
+                    """
+                    SELECT COALESCE(NULLIF(platoon_key, ''), 'Unknown') AS platoon, COUNT(*),
+                           COUNT(DISTINCT NULLIF(tank_id, ''))
+                    FROM normalized_responses_v2 WHERE week_id = ? GROUP BY platoon COLLATE NOCASE
+                    """,
+                    (week_id,),
+                ):
+                    scopes[platoon.lower()] = (platoon, int(reports), int(tanks))
+                reports, tanks = session.execute(
+                    "SELECT COUNT(*), COUNT(DISTINCT NULLIF(tank_id, '')) FROM normalized_responses_v2 WHERE week_id = ?",
+                    (week_id,),
+                ).fetchone()
+                if not reports:
+                    continue
+                scopes["*"] = ("*", int(reports), int(tanks))
+
+                gaps = session.execute(
+                    """
+                    SELECT platoon_key, family, COUNT(*), COUNT(DISTINCT NULLIF(tank_id, ''))
+                    FROM normalized_field_facts_v2 WHERE week_id = ? AND is_gap = 1
+                    GROUP BY platoon_key, family
+                    UNION ALL
+                    SELECT '*', family, COUNT(*), COUNT(DISTINCT NULLIF(tank_id, ''))
+                    FROM normalized_field_facts_v2 WHERE week_id = ? AND is_gap = 1
+                    GROUP BY family
+                    """,
+                    (week_id, week_id),
+                ).fetchall()
+                totals: Counter[str] = Counter()
+                rows = []
+                for platoon, family, count, gap_tanks in gaps:
+                    scope = scopes.get(platoon.lower())
+                    if scope is None:
+                        continue
+                    totals[scope[0]] += int(count)
+                    rows.append((scope[0], family, week_id, scope[1], int(gap_tanks), int(count)))
+                rows.extend(
+                    (platoon, "*", week_id, scope_reports, scope_tanks, totals[platoon])
+                    for platoon, scope_reports, scope_tanks in scopes.values()
+                )
+                session.executemany(
+                    """
+                    INSERT INTO metric_rollup_v2 (platoon_key, family, week_id, reports, tanks, gaps, gap_rate)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [(*row, round(row[5] / row[3], 3) if row[3] else 0.0) for row in rows],
+                )
+                self._refresh_grid(session, week_id)
+
+    @staticmethod
+    def _refresh_grid(session: sqlite3.Connection, week_id: str) -> None:
+        session.execute(
+            """
+            INSERT INTO grid_rollup_v2 (week_id, platoon_key, dimension, key, reports)
+            SELECT ?, COALESCE(NULLIF(platoon_key, ''), 'Unknown') AS platoon, 'tank', tank_id, COUNT(*)
+            FROM normalized_responses_v2 WHERE week_id = ? GROUP BY platoon COLLATE NOCASE, tank_id
+            UNION ALL
+            SELECT ?, '*', 'tank', tank_id, COUNT(*)
+            FROM normalized_responses_v2 WHERE week_id = ? GROUP BY tank_id
+            """,
+            (week_id,) * 4,
+        )
+        session.execute(
+            """
+            INSERT INTO grid_rollup_v2 (week_id, platoon_key, dimension, key, gaps)
+            SELECT ?, platoon_key, 'tank', tank_id, COUNT(*)
+            FROM normalized_field_facts_v2 WHERE week_id = ? AND is_gap = 1 GROUP BY platoon_key, tank_id
+            UNION ALL
+            SELECT ?, '*', 'tank', tank_id, COUNT(*)
+            FROM normalized_field_facts_v2 WHERE week_id = ? AND is_gap = 1 GROUP BY tank_id
+            ON CONFLICT(week_id, platoon_key, dimension, key) DO UPDATE SET gaps = excluded.gaps
+            """,
+            (week_id,) * 4,
+        )
+        for dimension in ("item", "family"):
+            # Bare tank_id beside MIN(id): the tank of each key's first gap fact.
+            session.execute(
+                f"""
+                INSERT INTO grid_rollup_v2 (week_id, platoon_key, dimension, key, gaps, sample_tank_id)
+                SELECT ?, scope, ?, key, gaps, tank_id FROM (
+                    SELECT platoon_key AS scope, {dimension} AS key, COUNT(*) AS gaps, tank_id, MIN(id)
+                    FROM normalized_field_facts_v2 WHERE week_id = ? AND is_gap = 1 GROUP BY platoon_key, {dimension}
+                    UNION ALL
+                    SELECT '*', {dimension}, COUNT(*), tank_id, MIN(id)
+                    FROM normalized_field_facts_v2 WHERE week_id = ? AND is_gap = 1 GROUP BY {dimension}
+                )
+                """,
+                (week_id, dimension, week_id, week_id),
+            )
+
+    def fold_rollup(
+        self,
+        responses: Iterable[NormalizedResponseV2],
+        facts: Iterable[tuple],
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> list[str]:
+        """
+        Applies new responses and their facts to metric_rollup_v2 and grid_rollup_v2 as deltas, the way
+        apply_responses folds week snapshots: call before the rows are written. Reads only
+        the week's rollup rows plus index probes for the tanks involved, so the cost does
+        not grow with the week. Responses must be new (not replacements).
+        Returns weeks that hold rows but no rollup yet; refresh_rollup them once the rows land.
+        """
+        by_week: dict[str, list[NormalizedResponseV2]] = {}
+        for response in responses:
+            if response.week_id:
+                by_week.setdefault(response.week_id, []).append(response)
+        gap_facts: dict[str, list[tuple]] = {}
+        for fact in facts:
+            if fact[7] and fact[1]:
+                gap_facts.setdefault(fact[1], []).append(fact)
+
+        stale: list[str] = []
+        with self._session(conn) as session:
+            for week_id, week_responses in by_week.items():
+                rows = {
+                    (str(platoon).lower(), family): [platoon, family, int(reports), int(tanks), int(gaps)]
+                    for platoon, family, reports, tanks, gaps in session.execute(
+                        "SELECT platoon_key, family, reports, tanks, gaps FROM metric_rollup_v2 WHERE week_id = ?",
+                        (week_id,),
+                    )
+                }
+                if ("*", "*") not in rows and session.execute(
+                    "SELECT 1 FROM normalized_responses_v2 WHERE week_id = ? LIMIT 1", (week_id,)
+                ).fetchone():
+                    stale.append(week_id)
+                    continue
+
+                # Tanks already counted per scope, and per (scope, family) among gap facts.
+                seen: set[tuple[str, str]] = set()
+                seen_gaps: set[tuple[str, str, str]] = set()
+                tank_ids = sorted({r.tank_id for r in week_responses if r.tank_id})
+                for start in range(0, len(tank_ids), _IN_CHUNK):
+                    chunk = tank_ids[start : start + _IN_CHUNK]
+                    placeholders = ",".join("?" for _ in chunk)
+                    for platoon, tank_id in session.execute(
+                        f"""
+                        SELECT DISTINCT COALESCE(NULLIF(platoon_key, ''), 'Unknown'), tank_id
+                        FROM normalized_responses_v2 WHERE week_id = ? AND tank_id IN ({placeholders})
+                        """,
+                        [week_id, *chunk],
+                    ):
+                        seen.update({(platoon.lower(), tank_id), ("*", tank_id)})
+                    for platoon, family, tank_id in session.execute(
+                        f"""
+                        SELECT DISTINCT platoon_key, family, tank_id FROM normalized_field_facts_v2
+                        WHERE week_id = ? AND is_gap = 1 AND tank_id IN ({placeholders})
+                        """,
+                        [week_id, *chunk],
+                    ):
+                        seen_gaps.update({(platoon.lower(), family, tank_id), ("*", family, tank_id)})
+
+                def bump(scope: str, family: str, reports: int = 0, tanks: int = 0, gaps: int = 0) -> None:
+                    row = rows.setdefault((scope, family), [rows[(scope, "*")][0], family, 0, 0, 0])
+                    row[2] += reports
+                    row[3] += tanks
+                    row[4] += gaps
+
+                grid: dict[tuple[str, str, str], list[Any]] = {}
+
+                def bump_grid(
+                    scope: str, label: str, dimension: str, key: str,
+                    reports: int = 0, gaps: int = 0, sample: Optional[str] = None,
+                ) -> None:
+                    row = grid.setdefault((scope, dimension, key), [label, 0, 0, sample])
+                    row[1] += reports
+                    row[2] += gaps
+
+                scopes_touched: set[str] = set()
+                for response in week_responses:
+                    platoon = response.platoon_key or "Unknown"
+                    for scope in (platoon.lower(), "*"):
+                        bump_grid(scope, platoon if scope != "*" else "*", "tank", response.tank_id, reports=1)
+                        if (scope, "*") not in rows:
+                            rows[(scope, "*")] = [platoon if scope != "*" else "*", "*", 0, 0, 0]
+                        new_tank = bool(response.tank_id) and (scope, response.tank_id) not in seen
+                        seen.add((scope, response.tank_id))
+                        bump(scope, "*", reports=1, tanks=int(new_tank))
+                        scopes_touched.add(scope)
+                for fact in gap_facts.get(week_id, []):
+                    platoon, tank_id, family = fact[2], fact[3], fact[4]
+                    for scope in (platoon.lower(), "*"):
+                        new_tank = bool(tank_id) and (scope, family, tank_id) not in seen_gaps
+                        seen_gaps.add((scope, family, tank_id))
+                        bump(scope, family, tanks=int(new_tank), gaps=1)
+                        bump(scope, "*", gaps=1)
+                        label = platoon if scope != "*" else "*"
+                        bump_grid(scope, label, "tank", tank_id, gaps=1)
+                        bump_grid(scope, label, "item", fact[5], gaps=1, sample=tank_id)
+                        bump_grid(scope, label, "family", family, gaps=1, sample=tank_id)
+
+                # Family rows carry their scope's report count, so a scope's rows move together.
+                updates = []
+                for (scope, family), (label, _, _, tanks, gaps) in rows.items():
+                    if scope not in scopes_touched:
+                        continue
+                    reports = rows[(scope, "*")][2]
+                    updates.append((label, family, week_id, reports, tanks, gaps, round(gaps / reports, 3) if reports else 0.0))
+                session.executemany(
+                    """
+                    INSERT INTO metric_rollup_v2 (platoon_key, family, week_id, reports, tanks, gaps, gap_rate)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(platoon_key, family, week_id) DO UPDATE SET
+                        reports = excluded.reports, tanks = excluded.tanks,
+                        gaps = excluded.gaps, gap_rate = excluded.gap_rate
+                    """,
+                    updates,
+                )
+                # Existing keys keep their sample tank: its fact is older than any new one.
+                session.executemany(
+                    """
+                    INSERT INTO grid_rollup_v2 (week_id, platoon_key, dimension, key, reports, gaps, sample_tank_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(week_id, platoon_key, dimension, key) DO UPDATE SET
+                        reports = reports + excluded.reports, gaps = gaps + excluded.gaps
+                    """,
+                    [
+                        (week_id, label, dimension, key, reports, gaps, sample)
+                        for (_, dimension, key), (label, reports, gaps, sample) in grid.items()
+                    ],
+                )
+        return stale
+
+    def list_weeks_missing_rollup(self) -> list[str]:
+        with self.db._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT DISTINCT week_id FROM normalized_responses_v2
+                WHERE week_id NOT IN (SELECT week_id FROM metric_rollup_v2 WHERE platoon_key = '*' AND family = '*')
+                   OR week_id NOT IN (SELECT week_id FROM grid_rollup_v2 WHERE platoon_key = '*' AND dimension = 'tank')
+                """
+            ).fetchall()
+        return [str(r[0]) for r in rows if r[0]]
+
+    def rollup_series(
+        self, platoon_key: Optional[str], family: Optional[str], window_weeks: int
+    ) -> list[tuple[str, int, int, int, float]]:
+        """
+        [(week_id, reports, tanks, gaps, gap_rate)] for the latest `window_weeks` weeks of a
+        platoon (None = battalion), oldest first, in one range scan of the rollup primary key.
+        With `family`, tanks/gaps/gap_rate are that family's; weeks without its gaps read 0.
+        """
+        with self.db._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT w.week_id, w.reports, COALESCE(f.tanks, 0), COALESCE(f.gaps, 0), COALESCE(f.gap_rate, 0.0)
+                FROM metric_rollup_v2 w
+                LEFT JOIN metric_rollup_v2 f
+                    ON f.platoon_key = w.platoon_key AND f.family = ? AND f.week_id = w.week_id
+                WHERE w.platoon_key = ? AND w.family = '*'
+                ORDER BY w.week_id DESC LIMIT ?
+                """,
+                (family or "*", platoon_key or "*", int(window_weeks)),
+            ).fetchall()
+        return [(r[0], int(r[1]), int(r[2]), int(r[3]), float(r[4])) for r in reversed(rows)]
+
+    # ---- facts/normalized aggregates (SQL GROUP BY instead of decoding fields_json) ----
+    def count_responses_by_platoon(
+        self, week_id: str, platoon_key: Optional[str] = None
+    ) -> list[tuple[str, int, int]]:
+        """
+        [(platoon, reports, distinct non-empty tanks)] for a week.
+        """
+        query = (
+            "SELECT COALESCE(NULLIF(platoon_key, ''), 'Unknown') AS platoon, COUNT(*), "
+            "COUNT(DISTINCT NULLIF(tank_id, '')) FROM normalized_responses_v2 WHERE week_id = ?"
+        )
+        params: list[Any] = [week_id]
+        if platoon_key:
+            query += " AND lower(platoon_key) = lower(?)"
+            params.append(platoon_key)
+        query += " GROUP BY platoon ORDER BY MAX(received_at) DESC"
+        with self.db._connect() as conn:
+            return [(r[0], int(r[1]), int(r[2])) for r in conn.execute(query, params).fetchall()]
+
+    def count_distinct_tanks(self, week_id: str, platoon_key: Optional[str] = None) -> int:
+        query = "SELECT COUNT(DISTINCT NULLIF(tank_id, '')) FROM normalized_responses_v2 WHERE week_id = ?"
+        params: list[Any] = [week_id]
+        if platoon_key:
+            query += " AND lower(platoon_key) = lower(?)"
+            params.append(platoon_key)
+        with self.db._connect() as conn:
+            return int(conn.execute(query, params).fetchone()[0])
+
+    def count_reports_by_tank(self, week_id: str, platoon_key: str) -> list[tuple[str, int]]:
+        """
+        [(tank_id, reports)], most recently reporting tank first.
+        """
+        with self.db._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT tank_id, COUNT(*) FROM normalized_responses_v2
+                WHERE week_id = ? AND lower(platoon_key) = lower(?)
+                GROUP BY tank_id ORDER BY MAX(received_at) DESC
+                """,
+                (week_id, platoon_key),
+            ).fetchall()
+        return [(r[0], int(r[1])) for r in rows]
+
+    def count_fact_gaps_by_platoon(self, week_id: str, platoon_key: Optional[str] = None) -> dict[str, int]:
+        query = (
+            "SELECT COALESCE(NULLIF(platoon_key, ''), 'Unknown') COLLATE BINARY AS platoon, COUNT(*) "
+            "FROM normalized_field_facts_v2 WHERE week_id = ? AND is_gap = 1"
+        )
+        params: list[Any] = [week_id]
+        if platoon_key:
+            query += " AND platoon_key = ?"
+            params.append(platoon_key)
+        query += " GROUP BY platoon"
+        with self.db._connect() as conn:
+            return {r[0]: int(r[1]) for r in conn.execute(query, params).fetchall()}
+
+    def count_fact_gaps_by_tank_family(
+        self, week_id: str, platoon_key: Optional[str], tank_ids: Optional[Iterable[str]] = None
+    ) -> list[tuple[str, str, int]]:
+        """
+        [(tank_id, family, gaps)], each tank's families in the order the row scan first meets
+        them (responses by received_at DESC, then field order), so ties resolve the same way.
+        """
+        query = (
+            "SELECT tank_id, family, COUNT(*), MIN(seen) FROM ("
+            "SELECT f.tank_id, f.family, ROW_NUMBER() OVER (ORDER BY n.received_at DESC, n.id, f.id) AS seen "
+            "FROM normalized_field_facts_v2 f JOIN normalized_responses_v2 n ON n.event_id = f.event_id "
+            "WHERE f.week_id = ? AND f.is_gap = 1"
+        )
+        params: list[Any] = [week_id]
+        if platoon_key:
+            query += " AND f.platoon_key = ?"
+            params.append(platoon_key)
+        if tank_ids is not None:
+            ids = list(tank_ids)[:_IN_CHUNK]
+            query += f" AND f.tank_id IN ({','.join('?' for _ in ids) or 'NULL'})"
+            params.extend(ids)
+        query += ") GROUP BY tank_id, family ORDER BY tank_id, MIN(seen)"
+        with self.db._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [(r[0], r[1], int(r[2])) for r in rows]
+
+    def page_tanks(
+        self,
+        week_id: str,
+        platoon_key: Optional[str],
+        order: list[tuple[str, bool]],
+        after: Optional[list[Any]] = None,
+        tank_filter: Optional[str] = None,
+        limit: int = 50,
+    ) -> list[tuple[str, int, int]]:
+        """
+        One page of [(tank_id, reports, gaps)] for a week (platoon_key=None: battalion-wide).
+        `order` is ((column, descending), ...) over tank_id/reports/gaps and must end with
+        a unique column; `after` is the sort key of the previous page's last row.
+        """
+        order = [("key" if column == "tank_id" else column, descending) for column, descending in order]
+        return [
+            (key, reports, gaps)
+            for key, reports, gaps, _ in self._page_grid(week_id, platoon_key, "tank", order, after, tank_filter, limit)
+        ]
+
+    def page_fact_gaps(
+        self,
+        week_id: str,
+        platoon_key: Optional[str],
+        group_by: str,
+        order: list[tuple[str, bool]],
+        after: Optional[list[Any]] = None,
+        key_filter: Optional[str] = None,
+        limit: int = 100,
+    ) -> list[tuple[str, int, Optional[str]]]:
+        """
+        One page of [(key, gaps, sample tank_id)] (see top_fact_gaps); `order` is over key/gaps.
+        """
+        rows = self._page_grid(week_id, platoon_key, group_by, order, after, key_filter, limit, gaps_only=True)
+        return [(key, gaps, key if group_by == "tank" else sample) for key, _, gaps, sample in rows]
+
+    def _page_grid(
+        self,
+        week_id: str,
+        platoon_key: Optional[str],
+        dimension: str,
+        order: list[tuple[str, bool]],
+        after: Optional[list[Any]],
+        key_filter: Optional[str],
+        limit: int,
+        gaps_only: bool = False,
+    ) -> list[tuple[str, int, int, Optional[str]]]:
+        # Equality on the index prefix plus keyset_predicate's leading bound lets each page
+        # seek idx_grid_* (or the primary key) rather than scan the week.
+        query = (
+            "SELECT key, reports, gaps, sample_tank_id FROM grid_rollup_v2 "
+            "WHERE week_id = ? AND platoon_key = ? AND dimension = ?"
+        )
+        params: list[Any] = [week_id, platoon_key or "*", dimension]
+        if gaps_only:
+            query += " AND gaps > 0"
+        if key_filter:
+            query += " AND instr(lower(key), lower(?)) > 0"
+            params.append(key_filter)
+        if after is not None:
+            predicate, key_params = keyset_predicate(order, after)
+            query += f" AND {predicate}"
+            params.extend(key_params)
+        query += f" ORDER BY {order_by(order)} LIMIT ?"
+        params.append(int(limit))
+        with self.db._connect() as conn:
+            return [(r[0], int(r[1]), int(r[2]), r[3]) for r in conn.execute(query, params).fetchall()]
+
+    def top_fact_gaps(
+        self, week_id: str, platoon_key: Optional[str], group_by: str, limit: int
+    ) -> list[tuple[str, int, Optional[str]]]:
+        """
+        [(key, gaps, sample tank_id)] for group_by in item|family|tank, largest first.
+        Facts are ranked in row-scan order (responses by received_at DESC, then field order):
+        ties keep first appearance and the sample is the key's last gap in that order.
+        """
+        column = {"item": "f.item", "family": "f.family", "tank": "f.tank_id"}[group_by]
+        query = f"""
+            WITH ranked AS (
+                SELECT {column} AS key, f.tank_id AS tank_id,
+                       ROW_NUMBER() OVER (ORDER BY n.received_at DESC, n.id, f.id) AS seen
+                FROM normalized_field_facts_v2 f JOIN normalized_responses_v2 n ON n.event_id = f.event_id
+                WHERE f.week_id = ? AND f.is_gap = 1{" AND f.platoon_key = ?" if platoon_key else ""}
+            ),
+            grouped AS (
+                SELECT key, COUNT(*) AS gaps, MIN(seen) AS first_seen, MAX(seen) AS last_seen
+                FROM ranked GROUP BY key
+            )
+            SELECT g.key, g.gaps, r.tank_id FROM grouped g JOIN ranked r ON r.seen = g.last_seen
+            ORDER BY g.gaps DESC, g.first_seen LIMIT ?
+        """
+        params: list[Any] = [week_id, *([platoon_key] if platoon_key else []), int(limit)]
+        with self.db._connect() as conn:
+            return [(r[0], int(r[1]), r[2]) for r in conn.execute(query, params).fetchall()]
+
+    def week_stamp(self, week_id: str) -> tuple[int, int]:
+        """
+        (row count, max row id) of a week; changes on every insert or replace into that week.
+        Served from the (week_id, ...) index, so it is cheap enough to check per request.
+        """
+        with self.db._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM normalized_responses_v2 WHERE week_id = ?",
+                (week_id,),
+            ).fetchone()
+        return int(row[0]), int(row[1])
+
+    def has_rows(
+        self,
+        week_id: Optional[str] = None,
+        platoon_key: Optional[str] = None,
+        tank_id: Optional[str] = None,
+        event_id: Optional[str] = None,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> bool:
+        """
+        Indexed existence probe over normalized rows (no JSON decoding).
+        """
+        query = "SELECT 1 FROM normalized_responses_v2 WHERE 1=1"
+        params: list[Any] = []
+        if week_id:
+            query += " AND week_id = ?"
+            params.append(week_id)
+        if platoon_key:
+            query += " AND lower(platoon_key) = lower(?)"
+            params.append(platoon_key)
+        if tank_id:
+            query += " AND tank_id = ?"
+            params.append(tank_id)
+        if event_id:
+            query += " AND event_id = ?"
+            params.append(event_id)
+        query += " LIMIT 1"
+        with self._session(conn) as session:
+            return session.execute(query, params).fetchone() is not None
+
+    def recent_event_ids(self, limit: int) -> list[str]:
+        """
+        Most recently stored raw event ids (newest first), for warming in-process dedupe filters.
+        """
+        with self.db._connect() as conn:
+            rows = conn.execute(
+                "SELECT event_id FROM raw_form_events_v2 ORDER BY rowid DESC LIMIT ?",
+                (int(limit),),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def get_normalized_by_event_id(
+        self, event_id: str, conn: Optional[sqlite3.Connection] = None
+    ) -> Optional[dict[str, Any]]:
+        with self._session(conn) as session:
+            row = session.execute(
+                "SELECT event_id, source_id, platoon_key, tank_id, week_id, received_at, fields_json, unmapped_json "
+                "FROM normalized_responses_v2 WHERE event_id = ?",
+                (event_id,),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "event_id": row[0],
+            "source_id": row[1],
+            "platoon_key": row[2],
+            "tank_id": row[3],
+            "week_id": row[4],
+            "received_at": row[5],
+            "fields": self._safe_json(row[6], {}),
+            "unmapped_fields": self._safe_json(row[7], []),
+        }
 
     def list_normalized(self, week_id: Optional[str] = None, platoon_key: Optional[str] = None) -> list[dict[str, Any]]:
         query = (
@@ -191,7 +1174,147 @@ class ResponseStore:
 
         with self.db._connect() as conn:
             df = pd.read_sql_query(query, conn, params=params)
+        return self._decode_rows(df)
+
+    def search_normalized(
+        self,
+        text: str,
+        week_id: Optional[str] = None,
+        platoon_key: Optional[str] = None,
+        limit: int = 50,
+        order: Optional[list[tuple[str, bool]]] = None,
+        after: Optional[list[Any]] = None,
+        tank_filter: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Ranked full-text lookup (bm25, best first) through normalized_search_v2.
+        `text` is matched as one literal substring; it needs at least 3 characters
+        for the trigram tokenizer. Rows carry a highlighted `snippet`, `score` and `id`.
+        For keyset paging, `order` is over score/received_at/id (ending with id) and
+        `after` the previous page's last sort key.
+        """
+        phrase = '"' + text.replace('"', '""') + '"'
+        query = (
+            "SELECT * FROM (SELECT n.id, n.event_id, n.source_id, n.platoon_key, n.tank_id, n.week_id, "
+            "n.received_at, n.fields_json, n.unmapped_json, "
+            "snippet(normalized_search_v2, -1, '[', ']', '…', 12) AS snippet, "
+            "bm25(normalized_search_v2) AS score "
+            "FROM normalized_search_v2 s JOIN normalized_responses_v2 n ON n.id = s.rowid "
+            "WHERE normalized_search_v2 MATCH ?"
+        )
+        params: list[Any] = [phrase]
+        if week_id:
+            query += " AND n.week_id = ?"
+            params.append(week_id)
+        if platoon_key:
+            query += " AND lower(n.platoon_key) = lower(?)"
+            params.append(platoon_key)
+        if tank_filter:
+            query += " AND instr(lower(n.tank_id), lower(?)) > 0"
+            params.append(tank_filter)
+        query += ")"
+        order = order or [("score", False), ("received_at", True), ("id", False)]
+        if after is not None:
+            predicate, key_params = keyset_predicate(order, after)
+            query += f" WHERE {predicate}"
+            params.extend(key_params)
+        query += f" ORDER BY {order_by(order)} LIMIT ?"
+        params.append(int(limit))
+
+        with self.db._connect() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        return self._decode_rows(df)
+
+    def iter_week_rows(
+        self, week_ids: Optional[Iterable[str]] = None
+    ) -> Iterator[tuple[str, list[tuple[str, str, str]]]]:
+        """
+        Yields (week_id, [(platoon_key, tank_id, fields_json), ...]) per week, rows in
+        list_normalized order. fields_json is left encoded; only one week is held at a
+        time. Without `week_ids` this is one ordered pass over the whole table; with them,
+        one indexed query per week (weeks without rows yield an empty list).
+        Uses a dedicated connection so the cursor can stay open while callers write.
+        """
+        select = "SELECT week_id, platoon_key, tank_id, fields_json FROM normalized_responses_v2 "
+        conn = self.db.open_connection()
+        try:
+            if week_ids is not None:
+                for week_id in sorted(set(week_ids)):
+                    cursor = conn.execute(select + "WHERE week_id = ? ORDER BY received_at DESC", (week_id,))
+                    yield week_id, [row[1:] for row in cursor]
+                return
+            cursor = conn.execute(select + "WHERE week_id IS NOT NULL ORDER BY week_id, received_at DESC")
+            week_id: Optional[str] = None
+            rows: list[tuple[str, str, str]] = []
+            for row_week, platoon_key, tank_id, fields_json in cursor:
+                if row_week != week_id:
+                    if rows:
+                        yield week_id, rows
+                    week_id, rows = row_week, []
+                rows.append((platoon_key, tank_id, fields_json))
+            if rows:
+                yield week_id, rows
+        finally:
+            conn.close()
+
+    def iter_normalized(
+        self,
+        from_week: Optional[str] = None,
+        to_week: Optional[str] = None,
+        platoon_key: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Streams normalized rows of an inclusive week range, decoded one at a time.
+        Ordered by (week_id, platoon_key, id), i.e. the week/platoon index order, so
+        SQLite needs no sort and memory stays constant. Runs on a dedicated connection
+        that is closed when the iterator is exhausted or closed.
+        """
+        query = (
+            "SELECT event_id, source_id, platoon_key, tank_id, week_id, received_at, fields_json, unmapped_json "
+            "FROM normalized_responses_v2 WHERE week_id IS NOT NULL"
+        )
+        params: list[Any] = []
+        if from_week:
+            query += " AND week_id >= ?"
+            params.append(from_week)
+        if to_week:
+            query += " AND week_id <= ?"
+            params.append(to_week)
+        if platoon_key:
+            query += " AND lower(platoon_key) = lower(?)"
+            params.append(platoon_key)
+        query += " ORDER BY week_id, platoon_key, id"
+
+        conn = self.db.open_connection()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                for row in batch:
+                    yield {
+                        "event_id": row[0],
+                        "source_id": row[1],
+                        "platoon_key": row[2],
+                        "tank_id": row[3],
+                        "week_id": row[4],
+                        "received_at": row[5],
+                        "fields": self._safe_json(row[6], {}),
+                        "unmapped_fields": self._safe_json(row[7], []),
+                    }
+        finally:
+            conn.close()
+
+    def delete_week_snapshots(self, week_ids: Iterable[str], conn: Optional[sqlite3.Connection] = None) -> None:
+        with self._session(conn) as session:
+            session.executemany(
+                "DELETE FROM metric_snapshots_v2 WHERE json_extract(dimensions_json, '$.week_id') = ?",
+                [(week_id,) for week_id in week_ids],
+            )
 
+    def _decode_rows(self, df: pd.DataFrame) -> list[dict[str, Any]]:
         if df.empty:
             return []
 
@@ -213,11 +1336,10 @@ class ResponseStore:
             rows = conn.execute(query, params).fetchall()
         return [str(r[0]) for r in rows if r and r[0]]
 
-    def upsert_metric_snapshot(self, snapshot: MetricSnapshotV2) -> None:
+    def upsert_metric_snapshot(self, snapshot: MetricSnapshotV2, conn: Optional[sqlite3.Connection] = None) -> None:
         snapshot_key = self._snapshot_key(snapshot.scope, snapshot.dimensions)
-        with self.db._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
+        with self._session(conn) as session:
+            session.execute(
                 """
                 INSERT OR REPLACE INTO metric_snapshots_v2
                     (snapshot_key, scope, dimensions_json, values_json, computed_at)
@@ -231,12 +1353,44 @@ class ResponseStore:
                     snapshot.computed_at.isoformat(),
                 ),
             )
-            conn.commit()
 
-    def get_metric_snapshot(self, scope: str, dimensions: dict[str, str]) -> Optional[dict[str, Any]]:
+    def upsert_metric_snapshots(
+        self, snapshots: Iterable[MetricSnapshotV2], conn: Optional[sqlite3.Connection] = None
+    ) -> int:
+        rows = [
+            (
+                self._snapshot_key(snapshot.scope, snapshot.dimensions),
+                snapshot.scope,
+                json.dumps(snapshot.dimensions, ensure_ascii=False, sort_keys=True),
+                json.dumps(snapshot.values, ensure_ascii=False, default=str),
+                snapshot.computed_at.isoformat(),
+            )
+            for snapshot in snapshots
+        ]
+        with self._session(conn) as session:
+            session.executemany(
+                """
+                INSERT OR REPLACE INTO metric_snapshots_v2
+                    (snapshot_key, scope, dimensions_json, values_json, computed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def delete_metric_snapshot(
+        self, scope: str, dimensions: dict[str, str], conn: Optional[sqlite3.Connection] = None
+    ) -> None:
         snapshot_key = self._snapshot_key(scope, dimensions)
-        with self.db._connect() as conn:
-            row = conn.execute(
+        with self._session(conn) as session:
+            session.execute("DELETE FROM metric_snapshots_v2 WHERE snapshot_key = ?", (snapshot_key,))
+
+    def get_metric_snapshot(
+        self, scope: str, dimensions: dict[str, str], conn: Optional[sqlite3.Connection] = None
+    ) -> Optional[dict[str, Any]]:
+        snapshot_key = self._snapshot_key(scope, dimensions)
+        with self._session(conn) as session:
+            row = session.execute(
                 "SELECT scope, dimensions_json, values_json, computed_at FROM metric_snapshots_v2 WHERE snapshot_key = ?",
                 (snapshot_key,),
             ).fetchone()
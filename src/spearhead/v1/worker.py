@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import UTC, datetime
+from typing import Iterable, Iterator, Optional
 
+from spearhead.config import settings
 from spearhead.data.storage import Database
+from spearhead.v1.models import MetricSnapshotV2
 from spearhead.v1.parser import FormResponseParserV2
 from spearhead.v1.service import ResponseIngestionServiceV2, ResponseQueryServiceV2
+from spearhead.v1.snapshots import build_week_snapshots
 from spearhead.v1.store import ResponseStore
 
 logger = logging.getLogger(__name__)
@@ -18,19 +24,66 @@ def build_worker(db: Database) -> ResponseIngestionServiceV2:
     return ResponseIngestionServiceV2(store=store, parser=parser, metrics=query)
 
 
-def reconcile_snapshots(db: Database) -> dict:
+_WATERMARK = "reconcile_watermark"
+
+
+def _pooled(weeks: Iterable[tuple], workers: int) -> Iterator[list[MetricSnapshotV2]]:
+    # Bounded in-flight window: the reader stays at most a few weeks ahead of the pool.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future] = deque()
+        for week in weeks:
+            pending.append(pool.submit(build_week_snapshots, week))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def reconcile_snapshots(db: Database, workers: Optional[int] = None, full: bool = False) -> dict:
     """
     Rebuilds read-model snapshots from normalized rows.
     Intended for scheduled worker execution.
+
+    By default only weeks that changed since the last run are recomputed: weeks whose
+    recorded version moved, plus weeks with normalized rows above the persisted id
+    watermark. `full=True` also rebuilds the field facts (token/alias config changes)
+    and recomputes every week in one ordered pass. Weeks can be aggregated across
+    `workers` processes; all results are written in a single transaction.
     """
+    workers = max(settings.v1.reconcile_workers if workers is None else workers, 1)
     store = ResponseStore(db=db)
     query = ResponseQueryServiceV2(store=store)
-    weeks = store.list_weeks()
-    for week in weeks:
-        query.refresh_snapshots(week_id=week, platoon_key=None)
+    # Read before anything else: rows written while we run stay above it for the next run.
+    watermark = store.max_normalized_id()
+    if full:
+        # Token/alias config may have changed since ingest; facts (and the rollup built
+        # from them) must agree with the snapshots.
+        query.rebuild_field_facts()
+        versions = store.weeks_to_reconcile(after_id=0)
+        weeks = store.iter_week_rows()
+    else:
+        versions = store.weeks_to_reconcile(after_id=store.get_meta(_WATERMARK))
+        weeks = store.iter_week_rows(versions)
+
+    per_week = _pooled(weeks, workers) if workers > 1 else map(build_week_snapshots, weeks)
+    snapshots: list[MetricSnapshotV2] = [snapshot for week_snapshots in per_week for snapshot in week_snapshots]
+
+    with store.transaction() as conn:
+        # Dropping first also removes snapshots of platoons that left the week.
+        store.delete_week_snapshots(versions, conn=conn)
+        store.upsert_metric_snapshots(snapshots, conn=conn)
+        store.refresh_rollup(versions, conn=conn)
+        store.mark_weeks_reconciled(versions, conn=conn)
+        store.set_meta(_WATERMARK, watermark, conn=conn)
+        if versions:
+            store.bump_generation(conn=conn)
 
     result = {
-        "reconciled_weeks": len(weeks),
+        "mode": "full" if full else "incremental",
+        "reconciled_weeks": len(versions),
+        "snapshots": len(snapshots),
+        "workers": workers,
+        "watermark": watermark,
         "at": datetime.now(UTC).isoformat(),
     }
     logger.info("snapshot reconciliation complete", extra=result)
@@ -79,3 +79,18 @@ def test_form_responses_aliases_and_unmapped(tmp_path):
     assert responses, "Expected responses parsed with normalized headers"
     assert any(m.family == "zivud" and "חבל פריסה" in m.item for m in snapshot.mapped)
     assert "עמודה חדשה !" in snapshot.unmapped
+
+
+def test_streaming_adapters_match_eager_load():
+    loadout = BASE / "docs/archive/samples/דוחות פלוגת כפיר.xlsx"
+    assert list(PlatoonLoadoutAdapter.iter_records(loadout)) == PlatoonLoadoutAdapter.load(loadout)
+
+    summary = BASE / "docs/archive/samples/מסמך דוחות גדודי.xlsx"
+    assert list(BattalionSummaryAdapter.iter_records(summary)) == BattalionSummaryAdapter.load(summary)
+
+    form = BASE / "docs/archive/samples/טופס דוחות סמפ כפיר. (תגובות).xlsx"
+    responses, snapshot = FormResponsesAdapter.iter_with_schema(form)
+    first = next(responses)
+    assert first.row_index == 2
+    assert [first, *responses] == FormResponsesAdapter.load(form)
+    assert snapshot.mapped
@@ -1,8 +1,24 @@
+import importlib.util
+import json
+import math
+from datetime import datetime
 from pathlib import Path
+
+import pandas as pd
+
+from spearhead.config import settings
+from spearhead.data.dto import FormResponseRow
 from spearhead.services.exporter import ExcelExporter
-from spearhead.services.intelligence import IntelligenceService
+from spearhead.services.intelligence import IntelligenceService, _pools, shutdown_scoring_pools
 from spearhead.logic.scoring import ScoringEngine
 
+# The row loop _aggregate_forms replaced lives with its benchmark; it is the parity reference.
+_bench_spec = importlib.util.spec_from_file_location(
+    "bench_summarize", Path(__file__).resolve().parents[1] / "scripts" / "bench_summarize.py"
+)
+bench_summarize = importlib.util.module_from_spec(_bench_spec)
+_bench_spec.loader.exec_module(bench_summarize)
+
 def test_form_analytics_counts(analytics):
     week = analytics.latest_week()
     assert week, "Expected week label derived from timestamps"
@@ -68,3 +84,118 @@ def test_form_analytics_coverage_platoon_filter(analytics):
     # Test filtered (other platoon)
     coverage_sufa = analytics.coverage(platoon="סופה")
     assert "כפיר" not in coverage_sufa["platoons"]
+
+
+def test_form_repository_sql_filters_match_pandas_scope(form_repo):
+    everything = form_repo.db.read_table("form_responses")
+    week = form_repo.get_latest_week()
+    assert week == everything["week_label"].dropna().max()
+    assert form_repo.get_unique_values("week_label") == sorted(everything["week_label"].dropna().unique())
+
+    for scope in ("Kfir", "כפיר", " KFIR ", "sufa", "battalion", None):
+        expected = form_repo.apply_scope(everything[everything["week_label"] == week], scope=scope, column="platoon")
+        got = form_repo.get_forms(week=week, platoon=scope)
+        assert got["id"].tolist() == expected["id"].tolist()
+    assert not form_repo.get_forms(platoon="Kfir").empty
+    assert form_repo.get_unique_values("no_such_column") == []
+
+
+def test_intelligence_reuses_cached_week_scores(form_repo, monkeypatch):
+    weeks = list(form_repo.get_week_stamps("כפיר"))
+    assert len(weeks) >= 2
+    intel = IntelligenceService(form_repo, ScoringEngine())
+    first = intel.get_platoon_intelligence("כפיר", week=weeks[-1])
+
+    scored = []
+    original = intel._score_dataframe
+    monkeypatch.setattr(intel, "_score_dataframe", lambda df: scored.append(len(df)) or original(df))
+    again = intel.get_platoon_intelligence("Kfir", week=weeks[-1])
+    assert again == first
+    assert len(scored) == 1  # only the requested week is re-scored
+
+    # New responses landing in a past week drop its cached scores.
+    db = form_repo.db
+    cached = db.read_table("tank_score_cache")
+    assert (cached["week_label"] == weeks[0]).sum() == 1
+    row = form_repo.get_forms(week=weeks[0], platoon="כפיר").iloc[0]
+    db.insert_form_responses(
+        row["import_id"],
+        [FormResponseRow(None, row["platoon"], 999, row["tank_id"], None, weeks[0], {})],
+    )
+    cached = db.read_table("tank_score_cache")
+    assert (cached["week_label"] == weeks[0]).sum() == 0
+    intel.get_platoon_intelligence("כפיר", week=weeks[-1])
+    assert len(scored) == 3
+
+
+def test_battalion_intelligence_single_pass_matches_per_platoon(form_repo, monkeypatch):
+
+    monkeypatch.setattr(settings.intelligence, "parallel_min_rows", 0)
+    intel = IntelligenceService(form_repo, ScoringEngine())
+    week = form_repo.get_latest_week()
+    platoons = form_repo.get_unique_values("platoon", week=week)
+
+    pooled = intel.get_battalion_intelligence(week=week, workers=2)
+    assert _pools and all(pool._mp_context.get_start_method() != "fork" for pool in _pools.values())
+    shutdown_scoring_pools()
+    assert not _pools
+    form_repo.db.invalidate_tank_scores()  # history weeks are scored again, in-process this time
+    serial = intel.get_battalion_intelligence(week=week, workers=1)
+    assert pooled == serial
+    for p in platoons:
+        single = intel.get_platoon_intelligence(p, week=week)
+        assert serial.platoons[single.platoon] == single
+
+
+def test_vectorized_summary_matches_row_loop(analytics, form_repo):
+
+    def ordered(data):
+        # key order matters: summaries are serialized in first-seen order
+        return json.dumps(data, default=sorted, ensure_ascii=False)
+
+    df = form_repo.get_forms()
+    for override in (None, "kfir"):
+        assert ordered(analytics._aggregate_forms(df, override)) == ordered(bench_summarize.aggregate_rows(analytics, df, override))
+
+    edge = pd.DataFrame(
+        {
+            "platoon": ["sufa", None, "sufa", "Mahatz", "Mahatz"],
+            "tank_id": [" 101 ", None, "102", "201", "202"],
+            "week_label": ["2026-W01"] * 5,
+            "fields_json": [
+                json.dumps({"חלול": True, "חץ": "3", "דוח זיווד [נונל]": "חוסר", "תקלות": "", "פערי צלמים": " "}),
+                "not json",
+                json.dumps({"חלול": 1, "חץ": 2.5, "לא ממופה": "אין", "תקלות": "שבור", "פערי צלמים": 0}),
+                json.dumps({"סטטוס ציוד קשר [משיב]": "אין", "חלול": "", "תקלות": 7}),
+                json.dumps({"חלול": float("nan"), "חץ": "NaN"}),  # NaN cells sum to NaN, as in the row loop
+            ],
+        }
+    )
+    aggregated = analytics._aggregate_forms(edge)
+    assert ordered(aggregated) == ordered(bench_summarize.aggregate_rows(analytics, edge))
+    mahatz_ammo = aggregated["מחץ"]["ammo_totals"]
+    assert set(mahatz_ammo) == {"חלול", "חץ"} and all(math.isnan(total) for total in mahatz_ammo.values())
+
+
+def test_coverage_rollup_aggregates_in_sql(analytics, form_repo):
+
+    rows = [
+        ("Mahatz", "3", datetime(2024, 4, 1), "2026-W03"),
+        ("Mahatz", "3", datetime(2024, 4, 2), "2026-W03"),
+        ("Mahatz", "", datetime(2024, 4, 3), "2026-W03"),
+        ("Mahatz", "4", datetime(2024, 5, 1), None),  # no week: only moves last_seen
+        ("", "5", None, "2026-W03"),
+    ]
+    form_repo.db.insert_form_responses(
+        1, [FormResponseRow(None, p, i, t, ts, w, {}) for i, (p, t, ts, w) in enumerate(rows)]
+    )
+
+    rollup = form_repo.get_coverage_rollup(platoon="מחץ")
+    assert [(r["week_label"], r["forms"], r["distinct_tanks"]) for r in rollup] == [("2026-W03", 3, 1), (None, 1, 1)]
+    assert rollup[0]["last_timestamp"] == "2024-04-03T00:00:00"
+
+    coverage = analytics.coverage(week="2026-W03")
+    assert coverage["platoons"]["מחץ"]["forms"] == 3
+    assert coverage["platoons"]["מחץ"]["distinct_tanks"] == 1
+    assert coverage["platoons"]["מחץ"]["last_seen"] == "2024-05-01T00:00:00+00:00"
+    assert coverage["platoons"]["unknown"]["forms"] == 1
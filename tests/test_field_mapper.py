@@ -38,3 +38,20 @@ def test_infer_platoon_by_id(mapper):
     
     # Check that unknown ID falls back to filename
     assert mapper.infer_platoon(Path("/tmp/Kfir.xlsx"), source_id="unknown_id") == "Kfir"
+
+
+def test_match_header_is_memoized_across_instances():
+    """
+    Header resolution is shared per config version, so a fresh mapper reuses earlier lookups.
+    """
+    header = "דוח זיווד [חבל פריסה]"
+    first = FieldMapper().match_header(header)
+    mapper = FieldMapper()
+    before = mapper.cache_info()
+    again = mapper.match_header(header)
+    after = mapper.cache_info()
+
+    assert again == first
+    assert again.family == "zivud"
+    assert after.hits == before.hits + 1
+    assert after.misses == before.misses
@@ -1,6 +1,8 @@
 import sqlite3
 from pathlib import Path
 
+import pytest
+
 from spearhead.data.import_service import ImportService
 
 
@@ -41,3 +43,75 @@ def test_import_service_tabular(tmp_path):
     with sqlite3.connect(db_path) as conn:
         count_records = conn.execute("SELECT COUNT(*) FROM tabular_records").fetchone()[0]
     assert count_records == inserted
+
+
+def test_import_service_streams_in_chunks(tmp_path, monkeypatch):
+    from spearhead.config import settings
+
+    monkeypatch.setattr(settings.storage, "insert_chunk_rows", 3)
+    svc = ImportService(db_path=tmp_path / "spearhead.db")
+
+    form_path = BASE / "docs/archive/samples/טופס דוחות סמפ כפיר. (תגובות).xlsx"
+    inserted = svc.import_form_responses(form_path)
+    assert inserted > 3
+
+    with sqlite3.connect(svc.db.db_path) as conn:
+        rows = conn.execute("SELECT row_index FROM form_responses ORDER BY id").fetchall()
+    assert len(rows) == inserted
+    assert [r[0] for r in rows] == sorted(r[0] for r in rows)
+
+
+def test_import_service_hashes_before_parsing(tmp_path, monkeypatch):
+    from spearhead.data.adapters import FormResponsesAdapter
+
+    form_path = BASE / "docs/archive/samples/טופס דוחות סמפ כפיר. (תגובות).xlsx"
+    svc = ImportService(db_path=tmp_path / "spearhead.db")
+    assert svc.import_form_responses(form_path) > 0
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("workbook should not be parsed")
+
+    monkeypatch.setattr(FormResponsesAdapter, "iter_with_schema", no_parse)
+    # Already imported: only the hash is computed.
+    assert svc.import_form_responses(form_path) == 0
+
+
+def test_import_service_failed_stream_leaves_no_import(tmp_path, monkeypatch):
+    from spearhead.config import settings
+    from spearhead.data.adapters import FormResponsesAdapter
+
+    monkeypatch.setattr(settings.storage, "insert_chunk_rows", 2)
+    form_path = BASE / "docs/archive/samples/טופס דוחות סמפ כפיר. (תגובות).xlsx"
+    svc = ImportService(db_path=tmp_path / "spearhead.db")
+    original = FormResponsesAdapter.iter_with_schema
+
+    def truncated(*args, **kwargs):
+        rows, schema = original(*args, **kwargs)
+
+        def broken():
+            for i, row in enumerate(rows):
+                if i == 5:  # a few chunks are already inserted
+                    raise ValueError("truncated workbook")
+                yield row
+
+        return broken(), schema
+
+    monkeypatch.setattr(FormResponsesAdapter, "iter_with_schema", truncated)
+    with pytest.raises(ValueError):
+        svc.import_form_responses(form_path)
+    with sqlite3.connect(svc.db.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM imports").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM form_responses").fetchone()[0] == 0
+
+    monkeypatch.setattr(FormResponsesAdapter, "iter_with_schema", original)
+    assert svc.import_form_responses(form_path) > 5
+
+
+def test_import_service_corrupt_tabular_file_leaves_no_import(tmp_path):
+    svc = ImportService(db_path=tmp_path / "spearhead.db")
+    corrupt = tmp_path / "loadout.xlsx"
+    corrupt.write_bytes(b"not a workbook")
+    with pytest.raises(Exception):
+        svc.import_platoon_loadout(corrupt)
+    with sqlite3.connect(svc.db.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM imports").fetchone()[0] == 0
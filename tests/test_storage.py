@@ -0,0 +1,45 @@
+import threading
+
+from spearhead.data.storage import Database, close_all_connections
+
+
+def test_connections_are_reused_per_thread_and_tuned(tmp_path):
+    db = Database(tmp_path / "pool.db")
+    conn = db._connect()
+    assert db._connect() is conn
+    assert Database(tmp_path / "pool.db")._connect() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    other: list = []
+    worker = threading.Thread(target=lambda: other.append(db._connect()))
+    worker.start()
+    worker.join()
+    assert other[0] is not conn
+
+    close_all_connections()
+    fresh = Database(tmp_path / "pool.db")._connect()
+    assert fresh is not conn
+    assert fresh.execute("SELECT COUNT(*) FROM imports").fetchone()[0] == 0
+
+
+def test_reads_inside_a_transaction_do_not_commit_it(tmp_path):
+    db = Database(tmp_path / "tx.db")
+
+    class Boom(Exception):
+        pass
+
+    try:
+        with db.transaction() as conn:
+            db.upsert_import("k1", tmp_path / "a.xlsx", "form_responses", conn=conn)
+            assert db.find_import("other") is None  # shared connection, `with` block of its own
+            db.upsert_import("k2", tmp_path / "b.xlsx", "form_responses")  # nested transaction joins
+            raise Boom
+    except Boom:
+        pass
+    assert db.find_import("k1") is None
+    assert db.find_import("k2") is None
+
+    with db.transaction():
+        db.upsert_import("k1", tmp_path / "a.xlsx", "form_responses")
+    assert db.find_import("k1") is not None
@@ -1,4 +1,5 @@
 import shutil
+import threading
 from pathlib import Path
 
 from spearhead.data.import_service import ImportService
@@ -38,7 +39,13 @@ def test_sync_service(tmp_path):
         "form_responses": "טופס דוחות סמפ כפיר. (תגובות).xlsx",
     }
 
-    sync_service = SyncService(import_service=import_service, provider=provider, file_ids=file_ids)
+    sync_service = SyncService(
+        import_service=import_service,
+        provider=provider,
+        file_ids=file_ids,
+        cache_dir=tmp_path / "cache",
+        tmp_dir=tmp_path / "downloads",
+    )
     result = sync_service.sync_all()
 
     assert result["platoon_loadout"] > 0
@@ -106,6 +113,7 @@ def test_sync_status_and_cache_fallback(tmp_path, monkeypatch):
         provider=provider,
         file_ids=file_ids,
         cache_dir=cache_dir,
+        tmp_dir=tmp_path / "downloads",
     )
 
     inserted = sync_service.sync_platoon_loadout()
@@ -117,6 +125,28 @@ def test_sync_status_and_cache_fallback(tmp_path, monkeypatch):
     assert "etag" not in status["files"]["platoon_loadout"]  # no etag in fallback scenario
 
 
+class FakeResp:
+    def __init__(self, status_code: int, content: bytes = b"", etag: str | None = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+        if etag:
+            self.headers["ETag"] = etag
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def test_google_provider_retries_and_uses_cache(tmp_path, monkeypatch):
     """
     Validate retry/backoff path and cache fallback inside GoogleSheetsProvider.
@@ -124,15 +154,7 @@ def test_google_provider_retries_and_uses_cache(tmp_path, monkeypatch):
     from spearhead.sync.provider import GoogleSheetsProvider
     calls = {"count": 0}
 
-    class FakeResp:
-        def __init__(self, status_code: int, content: bytes = b"", etag: str | None = None):
-            self.status_code = status_code
-            self.content = content
-            self.headers = {}
-            if etag:
-                self.headers["ETag"] = etag
-
-    def fake_get(url, params=None, headers=None):
+    def fake_get(session, url, params=None, headers=None, stream=False, timeout=None):
         calls["count"] += 1
         if calls["count"] == 1:
             return FakeResp(500)
@@ -140,7 +162,7 @@ def test_google_provider_retries_and_uses_cache(tmp_path, monkeypatch):
             return FakeResp(200, b"data", etag="etag1")
         return FakeResp(200, b"data2", etag="etag2")
 
-    monkeypatch.setattr("spearhead.sync.provider.requests.get", fake_get)
+    monkeypatch.setattr("spearhead.sync.provider.requests.Session.get", fake_get)
     provider = GoogleSheetsProvider(api_key="fake", max_retries=3, backoff_seconds=0)
     dest = tmp_path / "out.xlsx"
     cache_path = tmp_path / "cache.xlsx"
@@ -182,7 +204,132 @@ def test_sync_service_etag_tracked(tmp_path):
         "form_responses": "טופס דוחות סמפ כפיר. (תגובות).xlsx",
     }
 
-    sync_service = SyncService(import_service=import_service, provider=provider, file_ids=file_ids)
+    sync_service = SyncService(
+        import_service=import_service,
+        provider=provider,
+        file_ids=file_ids,
+        cache_dir=tmp_path / "cache",
+        tmp_dir=tmp_path / "downloads",
+    )
     sync_service.sync_platoon_loadout()
     status = sync_service.get_status()
     assert status["files"]["platoon_loadout"]["etag"] == "etag-value"
+
+
+class BlockingProvider:
+    """
+    Copies fixtures like FakeSheetsProvider, but waits on a barrier so downloads only
+    complete when they overlap; sheets listed in `hang` never finish until released.
+    """
+
+    def __init__(self, fixture_dir: Path, parties: int, hang: tuple[str, ...] = ()):
+        self.fixture_dir = fixture_dir
+        self.barrier = threading.Barrier(parties, timeout=5)
+        self.hang = hang
+        self.release = threading.Event()
+
+    def download_sheet(
+        self, file_id: str, dest: Path, cache_path: Path | None = None, etag: str | None = None, user_token: str | None = None
+    ):
+        if file_id in self.hang:
+            self.release.wait(5)
+            raise DataSourceError("released")
+        self.barrier.wait()
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.fixture_dir / file_id, dest)
+        return dest, False, f"etag-{dest.stem}", "fake"
+
+
+def test_sync_form_responses_downloads_concurrently(tmp_path):
+    import_service = ImportService(db_path=tmp_path / "spearhead.db")
+    form = "טופס דוחות סמפ כפיר. (תגובות).xlsx"
+    provider = BlockingProvider(BASE / "docs/archive/samples", parties=3)
+    sync_service = SyncService(
+        import_service=import_service,
+        provider=provider,
+        file_ids={"form_responses": {"Kfir": form, "Sufa": form, "Mahatz": form}},
+        cache_dir=tmp_path / "cache",
+        tmp_dir=tmp_path / "downloads",
+        max_workers=3,
+    )
+
+    # Serial downloads would break the 3-party barrier.
+    assert sync_service.sync_form_responses() > 0
+    files = sync_service.get_status()["files"]
+    assert files["form_responses"]["status"] == "ok"
+    for alias in ("Kfir", "Sufa", "Mahatz"):
+        assert files[f"form_responses_{alias}"]["etag"] == f"etag-form_responses_{alias}"
+
+
+def test_sync_form_responses_times_out_slow_source(tmp_path):
+    import_service = ImportService(db_path=tmp_path / "spearhead.db")
+    form = "טופס דוחות סמפ כפיר. (תגובות).xlsx"
+    provider = BlockingProvider(BASE / "docs/archive/samples", parties=1, hang=("slow-sheet",))
+    sync_service = SyncService(
+        import_service=import_service,
+        provider=provider,
+        file_ids={"form_responses": {"Kfir": form, "Sufa": "slow-sheet"}},
+        cache_dir=tmp_path / "cache",
+        tmp_dir=tmp_path / "downloads",
+        max_workers=2,
+        download_timeout=0.2,
+    )
+
+    try:
+        assert sync_service.sync_form_responses() > 0
+    finally:
+        provider.release.set()
+    files = sync_service.get_status()["files"]
+    assert files["form_responses_Kfir"]["status"] == "ok"
+    assert "Timed out" in files["form_responses_Sufa"]["error"]
+    assert files["form_responses"]["status"] == "partial_error"
+
+
+def test_google_provider_streams_links_cache_and_reuses_session(tmp_path, monkeypatch):
+    from spearhead.sync.provider import GoogleSheetsProvider
+
+    sessions = []
+
+    def fake_get(session, url, params=None, headers=None, stream=False, timeout=None):
+        sessions.append(session)
+        assert stream is True
+        assert timeout == (2.0, 30.0)  # stalled sockets must end the worker, not just the wait
+        if headers.get("If-None-Match") == "etag1":
+            return FakeResp(304)
+        return FakeResp(200, b"x" * 200_000, etag="etag1")
+
+    monkeypatch.setattr("spearhead.sync.provider.requests.Session.get", fake_get)
+    provider = GoogleSheetsProvider(api_key="fake", backoff_seconds=0, timeout=30.0, connect_timeout=2.0)
+    dest = tmp_path / "tmp" / "out.xlsx"
+    cache_path = tmp_path / "cache" / "out.xlsx"
+
+    path, used_cache, etag, _ = provider.download_sheet("file123", dest, cache_path=cache_path)
+    assert (used_cache, etag) == (False, "etag1")
+    assert path.read_bytes() == cache_path.read_bytes() == b"x" * 200_000
+    assert dest.stat().st_ino == cache_path.stat().st_ino  # linked, not written twice
+    assert not list(dest.parent.glob(".*"))  # no leftover temp files
+
+    _, used_cache, etag, _ = provider.download_sheet("file123", dest, cache_path=cache_path, etag="etag1")
+    assert (used_cache, etag) == (True, "etag1")
+    assert dest.read_bytes() == b"x" * 200_000
+    assert sessions[0] is sessions[1]
+
+
+def test_sync_service_persists_etag_across_restarts(tmp_path):
+    import_service = ImportService(db_path=tmp_path / "spearhead.db")
+    fixture_dir = BASE / "docs/archive/samples"
+    file_ids = {"platoon_loadout": "דוחות פלוגת כפיר.xlsx"}
+
+    class RecordingProvider(FakeSheetsProvider):
+        seen_etags: list = []
+
+        def download_sheet(self, file_id, dest, cache_path=None, etag=None, user_token=None):
+            self.seen_etags.append(etag)
+            return super().download_sheet(file_id, dest, cache_path=cache_path, etag=etag, user_token=user_token)
+
+    provider = RecordingProvider(fixture_dir)
+    cache_dir = tmp_path / "cache"
+    SyncService(import_service, provider, dict(file_ids), cache_dir=cache_dir, tmp_dir=tmp_path / "downloads").sync_platoon_loadout()
+    # A fresh service (process restart) has no in-memory status but still sends the etag.
+    SyncService(import_service, provider, dict(file_ids), cache_dir=cache_dir, tmp_dir=tmp_path / "downloads").sync_platoon_loadout()
+    assert provider.seen_etags == [None, "fake-etag"]
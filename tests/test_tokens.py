@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from spearhead.logic.tokens import TokenClassifier, status_classifier
+
+
+def test_scalar_and_batch_classification_agree():
+    clf = TokenClassifier(["חוסר", "בלאי"], ["קיים", "תקין"], classify_numbers=False)
+    values = ["קיים", "חוסר", " בלאי ", "", None, 3, np.nan, "Missing", "חוסר"]
+    assert [clf.is_gap(v) for v in values] == [False, True, True, False, False, False, False, False, True]
+    assert [clf.is_issue(v) for v in values] == [False, True, True, True, False, False, False, True, True]
+    assert clf.gap_mask(pd.Series(values, dtype=object)).tolist() == [clf.is_gap(v) for v in values]
+    assert clf.issue_mask(values).tolist() == [clf.is_issue(v) for v in values]
+
+
+def test_case_insensitive_and_exact_tokens():
+    clf = TokenClassifier(["missing"], exact_gap_tokens=["0"])
+    assert clf.is_gap("MISSING item")
+    assert clf.is_gap(" 0 ")
+    assert not clf.is_gap("10")
+
+
+def test_status_classifier_is_shared_per_token_set():
+    assert status_classifier(["אין"]) is status_classifier(["אין"])
+    assert status_classifier().is_gap("חוסר")
+    assert status_classifier().is_ok("קיים")
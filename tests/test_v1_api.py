@@ -1,3 +1,5 @@
+import gzip
+import json
 from pathlib import Path
 
 from fastapi.testclient import TestClient
@@ -64,6 +66,89 @@ def test_v1_ingestion_and_queries(tmp_path, monkeypatch):
     assert search.json()["rows"]
 
 
+def test_v1_batch_ingestion(tmp_path):
+    settings.security.api_token = None
+    app = create_app(db_path=tmp_path / "v1_batch.db")
+    client = TestClient(app)
+
+    client.post("/v1/ingestion/forms/events", json=_sample_event(tank="צ'653"))
+    invalid = {"schema_version": "v2", "source_id": "manual-test", "payload": {"שדה": "x"}}
+    batch = [_sample_event(tank="צ'653"), _sample_event(tank="צ'654"), _sample_event(tank="צ'654"), invalid]
+    body = gzip.compress(json.dumps(batch, ensure_ascii=False).encode("utf-8"))
+
+    resp = client.post(
+        "/v1/ingestion/forms/events:batch",
+        content=body,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert resp.status_code == 200
+    reports = resp.json()
+    assert [r["created"] for r in reports] == [False, True, False, True]
+    assert reports[0]["week_id"] and reports[0]["platoon_key"] == "Kfir"
+    assert reports[3]["error"]
+
+    overview = client.get("/v1/metrics/overview").json()
+    assert overview["reports"] == 2
+    assert overview["tanks"] == 2
+
+    bad = client.post("/v1/ingestion/forms/events:batch", json=[{"payload": "not-a-dict"}])
+    assert bad.status_code == 422
+
+
+def test_v1_etag_not_modified_until_ingest(tmp_path, monkeypatch):
+    settings.security.api_token = None
+    app = create_app(db_path=tmp_path / "v1_etag.db")
+    client = TestClient(app)
+    client.post("/v1/ingestion/forms/events", json=_sample_event(tank="צ'653"))
+
+    first = client.get("/v1/metrics/overview")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    cached = client.get("/v1/metrics/overview", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    # Same generation, different selection: a different validator.
+    assert client.get("/v1/metadata/weeks").headers["ETag"] != etag
+
+    client.post("/v1/ingestion/forms/events", json=_sample_event(tank="צ'654"))
+    changed = client.get("/v1/metrics/overview", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["reports"] == 2
+
+    # Same data, different query configuration (e.g. after a deploy): a different validator.
+    current = changed.headers["ETag"]
+    monkeypatch.setattr(settings.v1, "facts_queries", not settings.v1.facts_queries)
+    restarted = TestClient(create_app(db_path=tmp_path / "v1_etag.db"))
+    stale = restarted.get("/v1/metrics/overview", headers={"If-None-Match": current})
+    assert stale.status_code == 200
+    assert stale.headers["ETag"] != current
+
+
+def test_v1_ndjson_export_streams_scoped_rows(tmp_path):
+    settings.security.api_token = None
+    app = create_app(db_path=tmp_path / "v1_export.db")
+    client = TestClient(app)
+    client.post("/v1/ingestion/forms/events", json=_sample_event(tank="צ'653"))
+    client.post("/v1/ingestion/forms/events", json=_sample_event(platoon="סופה", tank="צ'701"))
+
+    compressed = client.get("/v1/exports/responses.ndjson", headers={"Accept-Encoding": "gzip"})
+    assert compressed.status_code == 200
+    assert compressed.headers["content-encoding"] == "gzip"
+    rows = [json.loads(line) for line in compressed.text.splitlines()]
+    assert sorted(r["tank_id"] for r in rows) == ["צ'653", "צ'701"]
+    assert all(r["fields"] for r in rows)
+
+    plain = client.get(
+        "/v1/exports/responses.ndjson",
+        params={"platoon": "Kfir", "from_week": rows[0]["week_id"], "to_week": rows[0]["week_id"]},
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "content-encoding" not in plain.headers
+    assert [json.loads(line)["tank_id"] for line in plain.text.splitlines()] == ["צ'653"]
+
+
 def test_deprecated_endpoints_return_410(tmp_path):
     db_path = tmp_path / "deprecated.db"
     settings.security.api_token = None
@@ -0,0 +1,42 @@
+from openpyxl import Workbook
+
+from spearhead.data.storage import Database
+from spearhead.v1.backfill import backfill_xlsx
+from spearhead.v1.store import ResponseStore
+
+
+def _export(path, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["חותמת זמן", "צ טנק", "פלוגה", "דוח זיווד [חבל פריסה]"])
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def test_backfill_xlsx_is_idempotent_and_resumable(tmp_path):
+    xlsx = _export(
+        tmp_path / "export.xlsx",
+        [
+            ["2026-02-08T10:00:00", "צ'653", "כפיר", "חוסר"],
+            [None, None, None, None],
+            ["2026-02-09T10:00:00", "צ'654", "כפיר", "קיים"],
+            ["2026-02-16T10:00:00", "צ'701", "סופה", "חוסר"],
+        ],
+    )
+    db = Database(tmp_path / "backfill.db")
+    checkpoint = tmp_path / "checkpoint.json"
+
+    first = backfill_xlsx(db, [xlsx], batch_size=2, checkpoint_path=checkpoint)
+    assert (first["rows"], first["created"], first["errors"]) == (3, 3, 0)
+
+    store = ResponseStore(db)
+    weeks = store.list_weeks()
+    assert first["reconciled_weeks"] == len(weeks)
+    overviews = [store.get_metric_snapshot("overview", {"week_id": week}) for week in weeks]
+    assert sum(o["values"]["reports"] for o in overviews) == 3
+
+    assert backfill_xlsx(db, [xlsx], checkpoint_path=checkpoint, resume=True)["rows"] == 0
+    rerun = backfill_xlsx(db, [xlsx], checkpoint_path=checkpoint)
+    assert (rerun["rows"], rerun["duplicates"]) == (3, 3)
@@ -0,0 +1,360 @@
+import pytest
+
+from spearhead.data.storage import Database
+from spearhead.v1.cache import WeekCache
+from spearhead.v1.dedupe import EventIdFilter
+from spearhead.v1.models import FormEventV2, NormalizedResponseV2
+from spearhead.v1.paging import InvalidPageRequest
+from spearhead.v1.parser import FormResponseParserV2
+from spearhead.v1.service import ResponseIngestionServiceV2, ResponseQueryServiceV2
+from spearhead.v1.store import ResponseStore
+from spearhead.v1.worker import reconcile_snapshots
+
+
+def _event(platoon: str, tank: str, rope: str, mag: str = "קיים") -> FormEventV2:
+    return FormEventV2(
+        schema_version="v2",
+        source_id="service-test",
+        payload={
+            "צ טנק": tank,
+            "חותמת זמן": "2026-02-08T10:00:00Z",
+            "פלוגה": platoon,
+            "דוח זיווד [חבל פריסה]": rope,
+            "ברוסי מאג": mag,
+        },
+    )
+
+
+def _ingest_all(db_path, incremental: bool) -> ResponseQueryServiceV2:
+    store = ResponseStore(Database(db_path))
+    metrics = ResponseQueryServiceV2(store)
+    ingestion = ResponseIngestionServiceV2(store, FormResponseParserV2(), metrics, incremental=incremental)
+    for event in (
+        _event("כפיר", "צ'653", "חוסר"),
+        _event("כפיר", "צ'653", "חוסר", mag="חסר"),
+        _event("כפיר", "צ'654", "קיים"),
+        _event("סופה", "צ'701", "חוסר"),
+    ):
+        ingestion.ingest_event(event)
+    return metrics
+
+
+def test_incremental_snapshots_match_full_recompute(tmp_path):
+    incremental = _ingest_all(tmp_path / "incremental.db", incremental=True)
+    full = _ingest_all(tmp_path / "full.db", incremental=False)
+
+    week = full.latest_week()
+    assert incremental.latest_week() == week
+    assert incremental.overview(week) == full.overview(week)
+    for platoon in full.overview(week)["platoons"]:
+        assert incremental.platoon_metrics(platoon, week) == full.platoon_metrics(platoon, week)
+        assert incremental.tank_metrics(platoon, week) == full.tank_metrics(platoon, week)
+
+    overview = incremental.overview(week)
+    assert overview["reports"] == 4
+    assert overview["tanks"] == 3
+
+
+def test_event_id_filter_has_no_false_negatives():
+    seen = EventIdFilter(capacity=50, error_rate=0.01)
+    ids = [f"event-{i}" for i in range(80)]
+    seen.update(ids)
+    # The last `capacity` ids always survive a generation rotation.
+    assert all(seen.might_contain(event_id) for event_id in ids[-50:])
+    assert sum(seen.might_contain(f"other-{i}") for i in range(1000)) < 100
+
+
+def test_batch_dedupe_survives_cold_filter(tmp_path):
+    store = ResponseStore(Database(tmp_path / "cold.db"))
+    metrics = ResponseQueryServiceV2(store)
+    warm = ResponseIngestionServiceV2(store, FormResponseParserV2(), metrics)
+    first = warm.ingest_event(_event("כפיר", "צ'653", "חוסר"))
+
+    # A second process with an empty filter must still detect the duplicate.
+    cold = ResponseIngestionServiceV2(store, FormResponseParserV2(), metrics, seen_filter=EventIdFilter(capacity=10))
+    reports = cold.ingest_batch([_event("כפיר", "צ'653", "חוסר"), _event("כפיר", "צ'654", "חוסר")])
+    assert [r.created for r in reports] == [False, True]
+    assert reports[0].event_id == first.event_id
+    assert reports[0].week_id == first.week_id
+    assert metrics.overview(first.week_id)["reports"] == 2
+
+
+def test_facts_aggregates_match_row_scan(tmp_path):
+    metrics = _ingest_all(tmp_path / "facts.db", incremental=False)
+    store = metrics.store
+    week = metrics.latest_week()
+    scan = ResponseQueryServiceV2(store, use_facts=False)
+    facts = ResponseQueryServiceV2(store, use_facts=True)
+
+    assert facts._compute_overview(week, None) == scan._compute_overview(week, None)
+    assert facts._compute_overview(week, "kfir") == scan._compute_overview(week, "kfir")
+    assert facts._compute_tanks(week, "Kfir") == scan._compute_tanks(week, "Kfir")
+    for group_by in ("item", "family", "tank"):
+        by_facts = {r["key"]: r["gaps"] for r in facts.gaps(week, None, group_by=group_by)["rows"]}
+        by_scan = {r["key"]: r["gaps"] for r in scan.gaps(week, None, group_by=group_by)["rows"]}
+        assert by_facts == by_scan
+
+    # Rows written before the facts table existed are backfilled on startup.
+    with store.transaction() as conn:
+        conn.execute("DELETE FROM normalized_field_facts_v2")
+    assert ResponseQueryServiceV2(store, use_facts=True)._compute_overview(week, None) == scan._compute_overview(week, None)
+
+
+def test_facts_gaps_ties_and_samples_follow_row_scan(tmp_path):
+    store = ResponseStore(Database(tmp_path / "gap_ties.db"))
+    metrics = ResponseQueryServiceV2(store)
+    ingestion = ResponseIngestionServiceV2(store, FormResponseParserV2(), metrics)
+    for hour, (tank, rope, mag) in enumerate([("צ'601", "חוסר", "קיים"), ("צ'602", "חוסר", "חסר"), ("צ'603", "קיים", "חסר")]):
+        event = _event("כפיר", tank, rope, mag=mag)
+        event.payload["חותמת זמן"] = f"2026-02-08T1{hour}:00:00Z"
+        ingestion.ingest_event(event)
+    week = metrics.latest_week()
+    scan = ResponseQueryServiceV2(store, use_facts=False)
+    facts = ResponseQueryServiceV2(store, use_facts=True)
+
+    for group_by in ("item", "family", "tank"):
+        for platoon in (None, "Kfir"):
+            assert facts.gaps(week, platoon, group_by=group_by) == scan.gaps(week, platoon, group_by=group_by)
+    rows = {r["key"]: r["tank_id"] for r in facts.gaps(week, None, group_by="item")["rows"]}
+    assert rows["חבל פריסה"] == "צ'601"
+
+
+def test_facts_dominant_family_ties_follow_row_scan(tmp_path):
+    store = ResponseStore(Database(tmp_path / "ties.db"))
+    metrics = ResponseQueryServiceV2(store)
+    ingestion = ResponseIngestionServiceV2(store, FormResponseParserV2(), metrics)
+    event = _event("סופה", "צ'702", "חוסר", mag="חסר")
+    # A leading zivud gap: zivud is met first and ties "other" (alphabetically first) for the top count.
+    event.payload = {"דוח זיווד [נונל]": "חוסר", **event.payload}
+    ingestion.ingest_event(event)
+    week = metrics.latest_week()
+    scan = ResponseQueryServiceV2(store, use_facts=False)._compute_tanks(week, "Sufa")
+    facts = ResponseQueryServiceV2(store, use_facts=True)._compute_tanks(week, "Sufa")
+
+    assert scan[0]["families"]["zivud"] == scan[0]["families"]["other"] == 2
+    assert scan[0]["dominant_family"] == "zivud"
+    assert facts == scan
+    assert [list(t["families"]) for t in facts] == [list(t["families"]) for t in scan]
+    assert metrics.tank_page("Sufa", week)["rows"][0]["dominant_family"] == "zivud"
+
+
+def test_week_cache_matches_row_scan_and_invalidates(tmp_path):
+    metrics = _ingest_all(tmp_path / "cache.db", incremental=False)
+    store = metrics.store
+    week = metrics.latest_week()
+    scan = ResponseQueryServiceV2(store, use_facts=False)
+    cached = ResponseQueryServiceV2(store, use_facts=False, week_cache=WeekCache(8 * 1024 * 1024))
+
+    assert cached._compute_overview(week, None) == scan._compute_overview(week, None)
+    assert cached._compute_overview(week, "kfir") == scan._compute_overview(week, "kfir")
+    assert cached._compute_tanks(week, "Kfir") == scan._compute_tanks(week, "Kfir")
+    for group_by in ("item", "family", "tank"):
+        assert cached.gaps(week, None, group_by=group_by) == scan.gaps(week, None, group_by=group_by)
+    store.search_enabled = False  # compare against the row scan, not the FTS index
+    for q in ("חוסר", "653", "מאג"):
+        assert cached.search(q, week, None) == scan.search(q, week, None)
+    store.search_enabled = True
+    assert week in cached.week_cache and cached.week_cache.hits > 0
+
+    ingestion = ResponseIngestionServiceV2(store, FormResponseParserV2(), cached, incremental=False)
+    ingestion.ingest_event(_event("סופה", "צ'702", "חוסר"))
+    assert cached.gaps(week, None, group_by="tank") == scan.gaps(week, None, group_by="tank")
+    assert cached._compute_overview(week, None)["reports"] == 5
+
+
+def test_fts_search_matches_scan_and_follows_replacements(tmp_path):
+    metrics = _ingest_all(tmp_path / "fts.db", incremental=False)
+    store = metrics.store
+    week = metrics.latest_week()
+    assert store.search_enabled
+
+    indexed = metrics.search("חוסר", week, None)["rows"]
+    store.search_enabled = False
+    scanned = metrics.search("חוסר", week, None)["rows"]
+    store.search_enabled = True
+    assert sorted(r["event_id"] for r in indexed) == sorted(r["event_id"] for r in scanned)
+    assert all("[" in r["snippet"] for r in indexed)
+    assert {r["event_id"]: r["matches"] for r in indexed} == {r["event_id"]: r["matches"] for r in scanned}
+    assert [r["tank_id"] for r in metrics.search("653", week, "kfir")["rows"]] == ["צ'653", "צ'653"]
+
+    # Re-normalizing a response replaces its index entry instead of adding a second one.
+    row = store.list_normalized(week_id=week)[0]
+    response = NormalizedResponseV2(
+        event_id=row["event_id"],
+        source_id=row["source_id"],
+        platoon_key=row["platoon_key"],
+        tank_id=row["tank_id"],
+        week_id=row["week_id"],
+        received_at=row["received_at"],
+        fields={"הערות": "מנוע תקול"},
+        unmapped_fields=[],
+    )
+    store.upsert_normalized(response)
+    hits = metrics.search("תקול", None, None, all_weeks=True)
+    assert hits["week_id"] is None
+    assert [r["event_id"] for r in hits["rows"]] == [row["event_id"]]
+    with store.db._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM normalized_search_v2").fetchone()[0] == 4
+
+
+def test_rollup_trends_match_overviews(tmp_path):
+    metrics = _ingest_all(tmp_path / "rollup.db", incremental=True)
+    week = metrics.latest_week()
+    overview = metrics._compute_overview(week, None)
+    kfir = metrics._compute_overview(week, "kfir")
+
+    def values(metric, platoon=None, family=None):
+        return [r["value"] for r in metrics.trends(metric, 8, platoon, family=family)["rows"]]
+
+    assert values("reports") == [overview["reports"]]
+    assert values("distinct_tanks") == [overview["tanks"]]
+    assert values("total_gaps") == [overview["total_gaps"]]
+    assert values("gap_rate", "KFIR") == [kfir["gap_rate"]]
+
+    tanks = metrics._compute_tanks(week, "Kfir")
+    family = tanks[0]["dominant_family"]
+    assert values("total_gaps", "Kfir", family) == [sum(t["families"].get(family, 0) for t in tanks)]
+    assert values("distinct_tanks", "Kfir", family) == [sum(1 for t in tanks if t["families"].get(family))]
+    assert values("total_gaps", None, "no-such-family") == [0]
+
+    # A store opened on a database without the rollup rebuilds it on startup.
+    with metrics.store.transaction() as conn:
+        conn.execute("DELETE FROM metric_rollup_v2")
+    assert ResponseQueryServiceV2(metrics.store).trends("reports", 8, None)["rows"] == [
+        {"week_id": week, "value": overview["reports"]}
+    ]
+
+
+def test_single_pass_reconcile_matches_row_scan(tmp_path):
+    metrics = _ingest_all(tmp_path / "reconcile.db", incremental=True)
+    store = metrics.store
+    week = metrics.latest_week()
+    scan = ResponseQueryServiceV2(store, use_facts=False)
+
+    for workers in (1, 2):
+        with store.transaction() as conn:
+            conn.execute("DELETE FROM metric_snapshots_v2")
+        result = reconcile_snapshots(store.db, workers=workers, full=True)
+        assert result["reconciled_weeks"] == 1
+
+        overview = store.get_metric_snapshot("overview", {"week_id": week})
+        assert overview["values"] == scan._compute_overview(week, None)
+        for platoon in overview["values"]["platoons"]:
+            dims = {"week_id": week, "platoon_key": platoon}
+            assert store.get_metric_snapshot("platoon", dims)["values"] == scan._compute_overview(week, platoon)
+            assert store.get_metric_snapshot("tank", dims)["values"] == {"rows": scan._compute_tanks(week, platoon)}
+
+
+def test_incremental_reconcile_only_touches_changed_weeks(tmp_path):
+    metrics = _ingest_all(tmp_path / "watermark.db", incremental=True)
+    store = metrics.store
+    assert reconcile_snapshots(store.db)["reconciled_weeks"] == 1
+    assert reconcile_snapshots(store.db)["reconciled_weeks"] == 0
+
+    event = _event("סופה", "צ'702", "חוסר")
+    event.payload["חותמת זמן"] = "2026-03-10T10:00:00Z"
+    report = ResponseIngestionServiceV2(store, FormResponseParserV2(), metrics).ingest_event(event)
+    result = reconcile_snapshots(store.db)
+    assert result["reconciled_weeks"] == 1
+    assert store.get_metric_snapshot("overview", {"week_id": report.week_id})["values"]["reports"] == 1
+    assert reconcile_snapshots(store.db, full=True)["reconciled_weeks"] == 2
+
+
+def test_keyset_pages_cover_grid_without_overlap(tmp_path):
+    metrics = _ingest_all(tmp_path / "paging.db", incremental=False)
+    week = metrics.latest_week()
+
+    def walk(fetch):
+        rows, cursor = [], None
+        while True:
+            page = fetch(cursor)
+            rows.extend(page["rows"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                return rows
+
+    tanks = walk(lambda c: metrics.tank_page(None, None, cursor=c, page_size=1))
+    expected = [t for platoon in ("Kfir", "Sufa") for t in metrics._compute_tanks(week, platoon)]
+    expected.sort(key=lambda t: (-t["gaps"], -t["reports"], t["tank_id"]))
+    assert tanks == expected
+    by_id = walk(lambda c: metrics.tank_page(None, week, sort="-tank_id", cursor=c, page_size=2))
+    assert [t["tank_id"] for t in by_id] == ["צ'701", "צ'654", "צ'653"]
+    assert [t["tank_id"] for t in metrics.tank_page("kfir", week, filter_text="65")["rows"]] == ["צ'653", "צ'654"]
+
+    gaps = walk(lambda c: metrics.gaps_page(week, None, group_by="tank", cursor=c, page_size=1))
+    assert [(g["key"], g["gaps"]) for g in gaps] == [(r["key"], r["gaps"]) for r in metrics.gaps(week, None, "tank")["rows"]]
+
+    hits = walk(lambda c: metrics.search_page("חוסר", week, None, sort="received_at", cursor=c, page_size=1))
+    assert len(hits) == len({h["event_id"] for h in hits}) == 3
+
+    cursor = metrics.tank_page(None, week, page_size=1)["next_cursor"]
+    with pytest.raises(InvalidPageRequest):
+        metrics.tank_page(None, week, sort="reports", cursor=cursor, page_size=1)
+    with pytest.raises(InvalidPageRequest):
+        metrics.gaps_page(week, None, sort="bogus")
+
+
+def test_nested_store_calls_join_the_outer_transaction(tmp_path):
+    metrics = _ingest_all(tmp_path / "nested.db", incremental=False)
+    store = metrics.store
+    week = metrics.latest_week()
+    heard: list = []
+    store.add_write_listener(heard.append)
+    generation = store.data_generation()
+    row = store.list_normalized(week_id=week)[0]
+    response = NormalizedResponseV2(
+        event_id=row["event_id"],
+        source_id=row["source_id"],
+        platoon_key=row["platoon_key"],
+        tank_id=row["tank_id"],
+        week_id=row["week_id"],
+        received_at=row["received_at"],
+        fields={"הערות": "מנוע תקול"},
+        unmapped_fields=[],
+    )
+
+    # Conn-less calls inside the block must not commit on their own.
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.upsert_normalized(response)
+            store.set_meta("probe", 1)
+            raise RuntimeError("abort")
+    assert store.get_meta("probe") == 0
+    assert store.data_generation() == generation
+    assert heard == []
+
+    with store.transaction():
+        store.upsert_normalized(response)
+        store.set_meta("probe", 1)
+    assert store.get_meta("probe") == 1
+    assert store.data_generation() == generation + 1
+    assert heard == [{week}]
+
+
+def test_rollup_deltas_match_full_recompute(tmp_path):
+    metrics = _ingest_all(tmp_path / "deltas.db", incremental=True)
+    store = metrics.store
+    ingestion = ResponseIngestionServiceV2(store, FormResponseParserV2(), metrics)
+    later = _event("מחץ", "צ'801", "חוסר", mag="חסר")
+    later.payload["חותמת זמן"] = "2026-03-10T10:00:00Z"
+    ingestion.ingest_batch(
+        [
+            _event("כפיר", "צ'653", "קיים", mag="חסר"),  # known tank, new gap family
+            _event("סופה", "צ'702", "חוסר"),
+            _event("סופה", "צ'702", "חוסר", mag="חסר"),  # same new tank twice in one batch
+            _event("מחץ", "צ'801", "קיים"),
+            later,
+        ]
+    )
+
+    def rollup(table):
+        with store.db._connect() as conn:
+            return sorted(conn.execute(f"SELECT * FROM {table}").fetchall(), key=repr)
+
+    folded = rollup("metric_rollup_v2")
+    folded_grid = rollup("grid_rollup_v2")
+    assert len({row[2] for row in folded}) == 2
+    assert {row[2] for row in folded_grid} == {"tank", "item", "family"}
+    store.refresh_rollup(store.list_weeks())
+    assert rollup("metric_rollup_v2") == folded
+    assert rollup("grid_rollup_v2") == folded_grid